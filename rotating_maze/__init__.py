@@ -1,8 +1,17 @@
 """Rotating Maze evaluation for Inspect AI.
 
 Tests agent ability to navigate mazes with view transformations (rotations/flips).
-"""
 
-from .task import rotating_maze
+The core modules (maze, sampling, scoring) only use the standard library.
+The Inspect task is loaded on first access, so importing the core from
+worker processes and short-lived scripts does not pay the Inspect import cost.
+"""
 
 __all__ = ["rotating_maze"]
+
+
+def __getattr__(name):
+    if name == "rotating_maze":
+        from .task import rotating_maze
+        return rotating_maze
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,162 @@
+"""Columnar per-step analytics of adaptation behaviour.
+
+Replayed trajectories (see rotating_maze.replay) are flattened into one
+row per tool call and analysed with vectorized NumPy/pandas operations,
+so tables with millions of steps can be processed in seconds.
+"""
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+
+STEP_COLUMNS = [
+    "call_index", "direction", "valid", "x", "y",
+    "orientation", "move_count", "distance_to_goal",
+]
+
+
+def build_step_table(results: List[dict]) -> pd.DataFrame:
+    """Flatten replayed trajectories into a per-step table.
+
+    Args:
+        results: Replay results with trajectories (replay_logs with
+            include_trajectory=True); samples that failed to replay are skipped
+
+    Returns:
+        DataFrame with one row per tool call: model, variant, sample_id, epoch,
+        optimal_steps, the STEP_COLUMNS, plus transform (the view changed on
+        this step) and steps_since_transform (calls since the latest
+        transform, or since the start of the sample)
+    """
+    results = [r for r in results if not r.get("error") and r.get("trajectory")]
+    lengths = np.array([len(r["trajectory"]) for r in results], dtype=np.int64)
+
+    # Transpose the step tuples into columns in one pass
+    steps = [step for r in results for step in r["trajectory"]]
+    columns = list(zip(*steps)) if steps else [()] * len(STEP_COLUMNS)
+    table = pd.DataFrame({name: np.asarray(col) for name, col in zip(STEP_COLUMNS, columns)})
+
+    sample_index = np.repeat(np.arange(len(results)), lengths)
+    table.insert(0, "sample", sample_index)
+    for position, key in enumerate(("model", "variant"), start=1):
+        values = pd.Categorical([r[key] for r in results])
+        table.insert(position, key, values.take(sample_index))
+    table["sample_id"] = np.array([str(r["sample_id"]) for r in results], dtype=object)[sample_index]
+    table["epoch"] = np.array([r["epoch"] for r in results])[sample_index]
+    table["optimal_steps"] = np.array([r["optimal_steps"] for r in results],
+                                      dtype=np.int32)[sample_index]
+    table["direction"] = table["direction"].astype("category")
+
+    first = np.zeros(len(table), dtype=bool)
+    first[np.cumsum(lengths) - lengths] = True
+    orientation = table["orientation"].to_numpy()
+    previous = np.concatenate([[0], orientation[:-1]])
+    table["transform"] = ~first & (orientation != previous)
+    table["steps_since_transform"] = _steps_since(table["transform"].to_numpy() | first)
+
+    return table.astype({"valid": bool, "x": np.int32, "y": np.int32,
+                         "orientation": np.int8, "move_count": np.int32,
+                         "distance_to_goal": np.int32})
+
+
+def _steps_since(events: np.ndarray) -> np.ndarray:
+    """Number of rows since the latest True in events (0 on the event row)."""
+    positions = np.arange(len(events))
+    latest = np.maximum.accumulate(np.where(events, positions, 0))
+    return positions - latest
+
+
+def write_step_table(table: pd.DataFrame, path: str):
+    """Store a step table as Parquet."""
+    table.to_parquet(path, index=False)
+
+
+def read_step_table(path: str) -> pd.DataFrame:
+    """Load a step table from Parquet."""
+    return pd.read_parquet(path)
+
+
+def recovery_times(table: pd.DataFrame) -> pd.DataFrame:
+    """Measure how long the agent takes to make progress after each transform.
+
+    Recovery time is the number of tool calls after a transform until the
+    first move that reduces the distance to the goal. Transforms followed by
+    no progress at all before the sample ends get NaN.
+
+    Args:
+        table: Step table from build_step_table
+
+    Returns:
+        One row per transform: model, variant, sample, move_count,
+        recovery_calls
+    """
+    sample = table["sample"].to_numpy()
+    distance = table["distance_to_goal"].to_numpy()
+    progress = np.zeros(len(table), dtype=bool)
+    progress[1:] = (distance[1:] < distance[:-1]) & (sample[1:] == sample[:-1])
+
+    transforms = np.flatnonzero(table["transform"].to_numpy())
+    progress_rows = np.flatnonzero(progress)
+    nxt = np.searchsorted(progress_rows, transforms, side="right")
+    found = nxt < len(progress_rows)
+    target = progress_rows[np.minimum(nxt, len(progress_rows) - 1)] if len(progress_rows) else transforms
+    same_sample = found & (sample[target] == sample[transforms])
+
+    recovery = np.where(same_sample, target - transforms, np.nan)
+    rows = table.iloc[transforms]
+    return pd.DataFrame({
+        "model": rows["model"].to_numpy(),
+        "variant": rows["variant"].to_numpy(),
+        "sample": rows["sample"].to_numpy(),
+        "move_count": rows["move_count"].to_numpy(),
+        "recovery_calls": recovery,
+    })
+
+
+def invalid_move_profile(table: pd.DataFrame, max_offset: int = 10) -> pd.DataFrame:
+    """Invalid-move rate as a function of calls since the latest transform.
+
+    A spike right after offset 0 means the agent keeps walking into walls
+    using the old orientation.
+
+    Args:
+        table: Step table from build_step_table
+        max_offset: Largest steps_since_transform to report
+
+    Returns:
+        DataFrame indexed by (model, variant, steps_since_transform) with
+        invalid_rate and calls
+    """
+    window = table[table["steps_since_transform"] <= max_offset]
+    invalid = ~window["valid"]
+    grouped = invalid.groupby(
+        [window["model"], window["variant"], window["steps_since_transform"]],
+        observed=True,
+    )
+    return pd.DataFrame({"invalid_rate": grouped.mean(), "calls": grouped.size()})
+
+
+def regret_curves(table: pd.DataFrame) -> pd.DataFrame:
+    """Mean regret as a function of tool calls made.
+
+    Regret after a call is the number of moves made so far minus the progress
+    they bought: move_count - (optimal_steps - distance_to_goal). An
+    optimal agent has zero regret throughout.
+
+    Args:
+        table: Step table from build_step_table
+
+    Returns:
+        DataFrame indexed by (model, variant, call_index) with mean_regret
+        and samples (samples still running at that call)
+    """
+    # Every sample starts at the optimal distance from the goal
+    progress = table["optimal_steps"].to_numpy() - table["distance_to_goal"].to_numpy()
+    regret = table["move_count"].to_numpy() - progress
+
+    grouped = pd.Series(regret).groupby(
+        [table["model"], table["variant"], table["call_index"]], observed=True
+    )
+    return pd.DataFrame({"mean_regret": grouped.mean(), "samples": grouped.size()})
@@ -0,0 +1,156 @@
+"""Bitboard grid engine for fast movement checks and BFS on large mazes.
+
+A grid is flattened row-major with one guard cell after every row. One byte
+per cell is then read as a Python big int ("byte lanes"), so shifting the
+whole grid by 8 * stride bits lines every cell up with the cell above or
+below it, and shifting by 8 bits with its horizontal neighbour. Whole-grid
+neighbour tests are then single big-int ANDs evaluated in C:
+
+    up    = open & (open << 8 * stride)
+    right = open & (open >> 8)
+
+These combine into a per-cell 4-bit adjacency mask (bit set = open
+neighbour in that direction). Movement checks become one byte lookup. BFS
+follows precomputed neighbour offsets per mask value, with no bounds checks
+and no tuple allocation.
+
+The guard column is always closed, so horizontal shifts never wrap into the
+next row, and neighbours that would fall outside the grid are never set.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+
+# Adjacency mask bits
+UP, DOWN, LEFT, RIGHT = 1, 2, 4, 8
+
+# (dx, dy) -> mask bit
+DIRECTION_BITS: Dict[Tuple[int, int], int] = {
+    (0, -1): UP,
+    (0, 1): DOWN,
+    (-1, 0): LEFT,
+    (1, 0): RIGHT,
+}
+
+# Mask value -> number of open neighbours
+DEGREES = [bin(mask).count("1") for mask in range(16)]
+
+# Translates grid characters to 1 (open) / 0 (wall or guard) bytes
+_OPEN_TABLE = bytes(0 if ch == ord('#') else 1 for ch in range(256))
+
+
+class BitGrid:
+    """Flattened maze grid with per-cell adjacency masks."""
+
+    def __init__(self, grid: Sequence[Sequence[str]]):
+        """Build the engine for a grid.
+
+        Args:
+            grid: 2D array (or list of row strings) representing the maze
+        """
+        self.height = len(grid)
+        self.width = len(grid[0])
+        self.stride = self.width + 1
+
+        # One byte per cell, plus a closed guard cell after each row
+        flat = "#".join("".join(row) for row in grid) + "#"
+        self.cells = flat.encode("latin-1").translate(_OPEN_TABLE)
+
+        lanes = int.from_bytes(self.cells, "little")
+        row_shift = 8 * self.stride
+        masks = ((lanes & (lanes << row_shift)) * UP |
+                 (lanes & (lanes >> row_shift)) * DOWN |
+                 (lanes & (lanes << 8)) * LEFT |
+                 (lanes & (lanes >> 8)) * RIGHT)
+        self.masks = masks.to_bytes(len(self.cells), "little")
+
+        # Neighbour index offsets for every mask value
+        offsets = {UP: -self.stride, DOWN: self.stride, LEFT: -1, RIGHT: 1}
+        self._neighbours = [
+            tuple(offset for bit, offset in offsets.items() if mask & bit)
+            for mask in range(16)
+        ]
+
+    def index(self, x: int, y: int) -> int:
+        """Get the flat index of a cell."""
+        return y * self.stride + x
+
+    def position(self, index: int) -> Tuple[int, int]:
+        """Get the (x, y) position of a flat index."""
+        y, x = divmod(index, self.stride)
+        return x, y
+
+    def can_move(self, position: Tuple[int, int], direction: Tuple[int, int]) -> bool:
+        """Check whether a unit move leads to an open cell.
+
+        Args:
+            position: Current position (x, y), which must be open
+            direction: (dx, dy) unit move
+
+        Returns:
+            True if the neighbouring cell in that direction is open
+        """
+        x, y = position
+        return bool(self.masks[y * self.stride + x] & DIRECTION_BITS[direction])
+
+    def degree(self, x: int, y: int) -> int:
+        """Count the open neighbours of a cell."""
+        return DEGREES[self.masks[y * self.stride + x]]
+
+    def open_cells(self) -> int:
+        """Count the open cells."""
+        return self.cells.count(1)
+
+    def dead_ends(self) -> int:
+        """Count open cells with exactly one open neighbour."""
+        return sum(self.masks.count(bit) for bit in (UP, DOWN, LEFT, RIGHT))
+
+    def _bfs(self, source: int, target: int = -1) -> List[int]:
+        """Layered BFS from a flat index, stopping early at target."""
+        distances = [-1] * len(self.cells)
+        distances[source] = 0
+        masks = self.masks
+        neighbours = self._neighbours
+        frontier = [source]
+        depth = 0
+
+        while frontier:
+            if target >= 0 and distances[target] >= 0:
+                break
+            depth += 1
+            next_frontier = []
+            for i in frontier:
+                for offset in neighbours[masks[i]]:
+                    j = i + offset
+                    if distances[j] < 0:
+                        distances[j] = depth
+                        next_frontier.append(j)
+            frontier = next_frontier
+
+        return distances
+
+    def distance(self, start: Tuple[int, int], goal: Tuple[int, int]) -> int:
+        """Shortest-path length between two open cells.
+
+        Args:
+            start: Start position (x, y)
+            goal: Goal position (x, y)
+
+        Returns:
+            Number of moves (-1 if the goal is unreachable)
+        """
+        target = self.index(*goal)
+        return self._bfs(self.index(*start), target)[target]
+
+    def distance_field(self, goal: Tuple[int, int]) -> List[List[int]]:
+        """Shortest-path distance from every cell to the goal.
+
+        Args:
+            goal: Goal position (x, y)
+
+        Returns:
+            Grid-shaped distances (-1 for walls and unreachable cells)
+        """
+        distances = self._bfs(self.index(*goal))
+        return [distances[y * self.stride:y * self.stride + self.width]
+                for y in range(self.height)]
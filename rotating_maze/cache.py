@@ -0,0 +1,82 @@
+"""Model response cache for repeat runs of seeded maze sets.
+
+With seeded mazes and transform schedules a conversation is fully
+determined by the model's earlier responses, so re-running the same maze
+set against the same model (after a scorer or graph change, say) asks for
+exactly the same completions. The solver can route every turn through
+Inspect's content-addressed response cache, which keys entries on the
+model, generate config, tools and full message history. Repeat turns are
+then served from disk.
+
+Entries never expire on their own. prune_response_cache keeps the cache
+within a size budget by evicting the least recently used entries.
+"""
+
+import os
+from pathlib import Path
+from typing import List, Tuple
+
+from inspect_ai.model import CachePolicy, cache_path, cache_prune
+
+
+def response_cache_policy() -> CachePolicy:
+    """Get the cache policy the solver uses when caching is enabled.
+
+    Returns:
+        Policy that caches responses per epoch without expiry
+    """
+    return CachePolicy(expiry=None, per_epoch=True)
+
+
+def _cache_entries(model: str = "") -> List[Tuple[float, int, Path]]:
+    """List cache entries as (last use, size, path), oldest first.
+
+    Last use is the later of access and modification time. Most filesystems
+    update access times lazily (relatime), so recency is approximate, which
+    is fine for size-based eviction.
+    """
+    root = cache_path(model)
+    entries = []
+    if not root.exists():
+        return entries
+
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = Path(dirpath) / filename
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((max(stat.st_atime, stat.st_mtime), stat.st_size, path))
+    entries.sort()
+    return entries
+
+
+def prune_response_cache(max_bytes: int, model: str = "") -> dict:
+    """Evict least recently used cache entries until the cache fits a budget.
+
+    Expired entries (from runs with an expiring policy) are removed first.
+
+    Args:
+        max_bytes: Size budget for the cache
+        model: Only consider this model's entries (e.g.
+            "anthropic/claude-3-5-sonnet-20241022"); empty for the whole cache
+
+    Returns:
+        Dictionary with removed (entries deleted), freed_bytes and
+        remaining_bytes
+    """
+    cache_prune()
+
+    entries = _cache_entries(model)
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    freed = 0
+    for _, size, path in entries:
+        if total - freed <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        removed += 1
+        freed += size
+
+    return {"removed": removed, "freed_bytes": freed, "remaining_bytes": total - freed}
@@ -0,0 +1,171 @@
+"""Mid-trajectory checkpoints so interrupted samples resume instead of restarting.
+
+When an eval host dies or a run is cancelled (rate limits, say), samples
+that were in flight are lost and a retry (``inspect eval-retry``) starts
+them over from move 0, paying again for every turn. With checkpointing on,
+the solver appends the sample's progress to a local file every few turns:
+the messages added since the previous checkpoint, the step records and a
+compact MazeState snapshot.
+
+Resuming is opt-in per retry: only runs started with the environment
+variable named by RESUME_ENV_VAR set (``ROTATING_MAZE_RESUME=1 inspect
+eval-retry <log>``) restore the conversation and maze state from a
+sample's latest complete checkpoint, paying only for the turns after it.
+Any other run discards leftover files as its samples start. Otherwise a
+fresh eval with the same args would silently continue an earlier crashed
+run's trajectories. Inspect does not expose to solvers an id that
+eval-retry preserves, so the retry itself has to say so.
+
+Checkpoint files are keyed on the model, sample id, epoch, the sample's
+input and metadata and the solver options, so a checkpoint is only ever
+resumed by the same sample of the same configuration. A sample's file is
+removed once the sample finishes (including by hitting a limit), so only
+interrupted samples leave files behind.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import List, Optional, Union
+
+from pydantic import TypeAdapter
+
+from inspect_ai.model import ChatMessage
+
+from rotating_maze.maze import MazeState
+
+
+# Where checkpoint files go unless the task says otherwise
+DEFAULT_CHECKPOINT_DIR = "results/checkpoints"
+
+# Environment variable that makes a run resume from existing checkpoints
+RESUME_ENV_VAR = "ROTATING_MAZE_RESUME"
+
+_MESSAGE_ADAPTER = TypeAdapter(ChatMessage)
+
+
+def resume_enabled() -> bool:
+    """Check whether this run should resume samples from their checkpoints.
+
+    Returns:
+        True if RESUME_ENV_VAR is set to 1, true or yes
+    """
+    return os.environ.get(RESUME_ENV_VAR, "").lower() in ("1", "true", "yes")
+
+
+def checkpoint_key(model: str, sample_id, epoch: int, input: Union[str, List[ChatMessage]],
+                   metadata: dict, options: dict) -> str:
+    """Identify one sample of one run configuration.
+
+    Args:
+        model: Model name
+        sample_id: Sample id
+        epoch: Epoch of the sample
+        input: The sample's input
+        metadata: Sample metadata (maze, schedule and budgets)
+        options: Solver options that change the trajectory
+
+    Returns:
+        Hex digest used as the checkpoint file name
+    """
+    payload = json.dumps({
+        "model": model,
+        "sample_id": sample_id,
+        "epoch": epoch,
+        "input": input if isinstance(input, str) else [message.text for message in input],
+        "metadata": metadata,
+        "options": options,
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SampleCheckpoint:
+    """Append-only checkpoint file of one sample's trajectory.
+
+    Every save appends one JSON line with the new messages and step records
+    and the current MazeState snapshot, so the cost of a checkpoint does not
+    grow with the length of the conversation. A line cut short by a crash
+    is dropped when the file is loaded.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize the checkpoint.
+
+        Args:
+            path: Checkpoint file
+        """
+        self.path = Path(path)
+        self.saved_messages = 0
+        self.saved_steps = 0
+
+    def load(self) -> Optional[dict]:
+        """Read the latest complete checkpoint.
+
+        Returns:
+            Dictionary with messages, steps (step records), maze_state
+            (MazeState snapshot) and turns, or None if there is none
+        """
+        if not self.path.exists():
+            return None
+
+        messages, steps = [], []
+        latest = None
+        valid_bytes = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                messages.extend(_MESSAGE_ADAPTER.validate_python(m) for m in record["messages"])
+                steps.extend(record["steps"])
+                latest = record
+                valid_bytes += len(line)
+
+        # Drop a partly written line so that later appends stay readable
+        if valid_bytes < self.path.stat().st_size:
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_bytes)
+        if latest is None:
+            return None
+
+        self.saved_messages = len(messages)
+        self.saved_steps = len(steps)
+        return {
+            "messages": messages,
+            "steps": steps,
+            "maze_state": latest["maze_state"],
+            "turns": latest["turns"],
+        }
+
+    def save(self, messages: List[ChatMessage], steps: List[dict], maze_state: MazeState,
+             turns: int):
+        """Append the progress since the previous save.
+
+        Args:
+            messages: Conversation so far
+            steps: Step records so far
+            maze_state: Current maze state
+            turns: Model turns taken so far
+        """
+        record = {
+            "turns": turns,
+            "maze_state": maze_state.snapshot(),
+            "messages": [m.model_dump(mode="json", exclude_none=True)
+                         for m in messages[self.saved_messages:]],
+            "steps": steps[self.saved_steps:],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.saved_messages = len(messages)
+        self.saved_steps = len(steps)
+
+    def clear(self):
+        """Remove the checkpoint file."""
+        self.path.unlink(missing_ok=True)
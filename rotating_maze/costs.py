@@ -0,0 +1,150 @@
+"""Per-sample token, time and cost accounting from eval logs.
+
+Inspect records model usage per sample, the sample's wall-clock and working
+time, and the working time of every model and tool event. These are
+collected into one table row per sample, so cost and latency can be broken
+down by model, variant and maze size.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+
+COST_COLUMNS = [
+    "model", "variant", "size", "sample_id", "epoch", "success", "end_reason",
+    "input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens", "total_tokens",
+    "reported_cost", "total_time", "working_time", "model_time", "tool_time", "turns",
+]
+
+
+def sample_cost_row(model: str, sample) -> dict:
+    """Extract the usage and timing of one sample.
+
+    Args:
+        model: Model the log was run against
+        sample: EvalSample read with its events
+
+    Returns:
+        Row with the COST_COLUMNS
+    """
+    from inspect_ai.event import ModelEvent, ToolEvent
+
+    usage = list((sample.model_usage or {}).values())
+    costs = [u.total_cost for u in usage if u.total_cost is not None]
+    model_events = [e for e in sample.events if isinstance(e, ModelEvent)]
+    tool_events = [e for e in sample.events if isinstance(e, ToolEvent)]
+
+    score = next(iter((sample.scores or {}).values()), None)
+    score_metadata = (score.metadata if score is not None else None) or {}
+    metadata = sample.metadata or {}
+
+    return {
+        "model": model,
+        "variant": metadata.get("variant"),
+        "size": len(metadata.get("grid") or []),
+        "sample_id": str(sample.id),
+        "epoch": sample.epoch,
+        "success": bool(score_metadata.get("success", False)),
+        "end_reason": score_metadata.get("end_reason"),
+        "input_tokens": sum(u.input_tokens for u in usage),
+        "output_tokens": sum(u.output_tokens for u in usage),
+        "cache_read_tokens": sum(u.input_tokens_cache_read or 0 for u in usage),
+        "cache_write_tokens": sum(u.input_tokens_cache_write or 0 for u in usage),
+        "total_tokens": sum(u.total_tokens for u in usage),
+        "reported_cost": sum(costs) if costs else None,
+        "total_time": sample.total_time,
+        "working_time": sample.working_time,
+        "model_time": sum(e.working_time or 0.0 for e in model_events),
+        "tool_time": sum(e.working_time or 0.0 for e in tool_events),
+        "turns": len(model_events),
+    }
+
+
+def load_cost_table(log_files: Sequence[str]) -> pd.DataFrame:
+    """Build the per-sample cost table for a set of eval logs.
+
+    Args:
+        log_files: Paths to Inspect eval logs
+
+    Returns:
+        DataFrame with one row per sample and the COST_COLUMNS
+    """
+    from inspect_ai.log import read_eval_log
+
+    rows = []
+    for log_file in log_files:
+        log = read_eval_log(log_file)
+        for sample in log.samples or []:
+            rows.append(sample_cost_row(log.eval.model, sample))
+    return pd.DataFrame(rows, columns=COST_COLUMNS)
+
+
+def add_costs(table: pd.DataFrame,
+              prices: Optional[Dict[str, Tuple[float, ...]]] = None) -> pd.DataFrame:
+    """Add a cost column in dollars.
+
+    The provider-reported cost is used where the log has one. Otherwise cost
+    is computed from token counts and a price table. Inspect counts cache
+    reads and writes separately from input_tokens, so they are charged at
+    their own prices. Samples with neither get NaN.
+
+    Args:
+        table: Table from load_cost_table
+        prices: Mapping model -> (input, output[, cache read[, cache write]])
+            price per million tokens. Missing cache prices default to the
+            input price.
+
+    Returns:
+        Copy of the table with a cost column
+    """
+    table = table.copy()
+    computed = pd.Series(float("nan"), index=table.index)
+    for model, price in (prices or {}).items():
+        input_price, output_price, *cache_prices = price
+        cache_read_price, cache_write_price = (list(cache_prices) + [input_price] * 2)[:2]
+        rows = table["model"] == model
+        tokens = table.loc[rows].fillna({"cache_read_tokens": 0, "cache_write_tokens": 0})
+        computed[rows] = (tokens["input_tokens"] * input_price +
+                          tokens["output_tokens"] * output_price +
+                          tokens["cache_read_tokens"] * cache_read_price +
+                          tokens["cache_write_tokens"] * cache_write_price) / 1e6
+    table["cost"] = table["reported_cost"].astype(float).fillna(computed)
+    return table
+
+
+def summarize_costs(table: pd.DataFrame,
+                    by: List[str] = ("model", "variant")) -> pd.DataFrame:
+    """Aggregate cost and latency per configuration.
+
+    Args:
+        table: Table from add_costs
+        by: Columns to group by (e.g. ["model", "variant", "size"])
+
+    Returns:
+        DataFrame indexed by the group columns with samples, successes,
+        tokens_per_sample, wall_time_per_sample, model_time_share,
+        tool_time_share, turns_per_sample, turns_per_success, cost and
+        cost_per_success
+    """
+    grouped = table.groupby(list(by), observed=True)
+    summary = pd.DataFrame({
+        "samples": grouped.size(),
+        "successes": grouped["success"].sum(),
+        "tokens_per_sample": grouped["total_tokens"].mean(),
+        "wall_time_per_sample": grouped["total_time"].mean(),
+        "model_time": grouped["model_time"].sum(),
+        "tool_time": grouped["tool_time"].sum(),
+        "working_time": grouped["working_time"].sum(),
+        "turns": grouped["turns"].sum(),
+        "cost": grouped["cost"].sum(min_count=1),
+    })
+
+    successes = summary["successes"].where(summary["successes"] > 0)
+    working = summary["working_time"].where(summary["working_time"] > 0)
+    summary["model_time_share"] = summary["model_time"] / working
+    summary["tool_time_share"] = summary["tool_time"] / working
+    summary["turns_per_sample"] = summary["turns"] / summary["samples"]
+    summary["turns_per_success"] = summary["turns"] / successes
+    summary["cost_per_success"] = summary["cost"] / successes
+    return summary.drop(columns=["model_time", "tool_time", "working_time", "turns"])
@@ -0,0 +1,58 @@
+"""Event loop lag measurement.
+
+All samples of an eval share one event loop, so any synchronous work done
+on it (rendering a large maze view, a BFS over a large grid) delays every
+other sample's model I/O by as long as it runs. LoopLagMonitor runs
+alongside an eval and repeatedly sleeps for a short interval; how much
+later than requested each sleep returns is the time the loop was blocked.
+"""
+
+import math
+import time
+from typing import List
+
+import anyio
+
+
+class LoopLagMonitor:
+    """Samples the lag of the running event loop at a fixed interval."""
+
+    def __init__(self, interval: float = 0.01):
+        """Initialize the monitor.
+
+        Args:
+            interval: Seconds between measurements
+        """
+        self.interval = interval
+        self.lags: List[float] = []
+
+    async def run(self):
+        """Measure until cancelled (start it in a task group)."""
+        while True:
+            start = time.perf_counter()
+            await anyio.sleep(self.interval)
+            self.lags.append(max(time.perf_counter() - start - self.interval, 0.0))
+
+    def summary(self) -> dict:
+        """Summarize the measured lag.
+
+        Returns:
+            Dictionary with samples and mean_ms, p50_ms, p90_ms, p99_ms and
+            max_ms of the lag (None without measurements)
+        """
+        lags = sorted(self.lags)
+        if not lags:
+            return {"samples": 0, "mean_ms": None, "p50_ms": None, "p90_ms": None,
+                    "p99_ms": None, "max_ms": None}
+
+        def percentile(q: float) -> float:
+            return lags[min(math.ceil(q * len(lags)) - 1, len(lags) - 1)] * 1000
+
+        return {
+            "samples": len(lags),
+            "mean_ms": sum(lags) / len(lags) * 1000,
+            "p50_ms": percentile(0.5),
+            "p90_ms": percentile(0.9),
+            "p99_ms": percentile(0.99),
+            "max_ms": lags[-1] * 1000,
+        }
@@ -1,10 +1,13 @@
 """Maze generation and state management for Rotating Maze eval."""
 
 import random
-from typing import Tuple, List, Optional
+import struct
+from typing import Dict, Iterable, Iterator, Tuple, List, Optional
 from collections import deque
 from enum import Enum
 
+from rotating_maze.bitboard import BitGrid
+
 
 class Direction(Enum):
     """Cardinal directions for maze navigation."""
@@ -17,15 +20,17 @@ class Direction(Enum):
 class MazeGenerator:
     """Generates solvable mazes using recursive backtracking."""
 
-    def __init__(self, width: int, height: int):
+    def __init__(self, width: int, height: int, rng: Optional[random.Random] = None):
         """Initialize maze generator.
 
         Args:
             width: Maze width (must be odd for proper wall generation)
             height: Maze height (must be odd for proper wall generation)
+            rng: Random number generator (defaults to the global one)
         """
         self.width = width if width % 2 == 1 else width + 1
         self.height = height if height % 2 == 1 else height + 1
+        self.rng = rng or random
         self.grid = [['#' for _ in range(self.width)] for _ in range(self.height)]
 
     def generate(self) -> Tuple[List[List[str]], Tuple[int, int], Tuple[int, int], int]:
@@ -48,27 +53,41 @@ class MazeGenerator:
         return self.grid, start_pos, goal_pos, optimal_length
 
     def _carve_passages(self, x: int, y: int):
-        """Recursively carve passages using recursive backtracking.
+        """Carve passages using recursive backtracking.
+
+        The recursion runs on an explicit stack (so large mazes don't hit
+        the recursion limit), visiting cells and drawing from the RNG in
+        exactly the order of the recursive formulation.
 
         Args:
-            x: Current x coordinate
-            y: Current y coordinate
+            x: Starting x coordinate
+            y: Starting y coordinate
         """
+        stack = [(x, y, self._enter_cell(x, y))]
+
+        while stack:
+            x, y, directions = stack[-1]
+            for dx, dy in directions:
+                nx, ny = x + dx, y + dy
+
+                # Check if new position is valid and unvisited
+                if (0 <= nx < self.width and 0 <= ny < self.height and
+                    self.grid[ny][nx] == '#'):
+                    # Carve the wall between current and new cell
+                    self.grid[y + dy // 2][x + dx // 2] = ' '
+                    stack.append((nx, ny, self._enter_cell(nx, ny)))
+                    break
+            else:
+                stack.pop()
+
+    def _enter_cell(self, x: int, y: int) -> Iterator[Tuple[int, int]]:
+        """Open a cell and get its neighbour directions in random order."""
         self.grid[y][x] = ' '
 
         # Shuffle directions for randomness
         directions = [(0, -2), (0, 2), (-2, 0), (2, 0)]
-        random.shuffle(directions)
-
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-
-            # Check if new position is valid and unvisited
-            if (0 <= nx < self.width and 0 <= ny < self.height and
-                self.grid[ny][nx] == '#'):
-                # Carve the wall between current and new cell
-                self.grid[y + dy // 2][x + dx // 2] = ' '
-                self._carve_passages(nx, ny)
+        self.rng.shuffle(directions)
+        return iter(directions)
 
     def _calculate_optimal_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> int:
         """Calculate optimal path length using BFS.
@@ -80,27 +99,330 @@ class MazeGenerator:
         Returns:
             Length of optimal path
         """
-        queue = deque([(start, 0)])
-        visited = {start}
+        length = BitGrid(self.grid).distance(start, goal)
 
-        while queue:
-            (x, y), dist = queue.popleft()
+        # Should never happen if maze is solvable
+        if length < 0:
+            raise ValueError("No path found between start and goal")
+        return length
 
-            if (x, y) == goal:
-                return dist
 
-            for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
-                nx, ny = x + dx, y + dy
+class EllerGenerator:
+    """Generates perfect mazes row by row using Eller's algorithm.
 
-                if (0 <= nx < self.width and 0 <= ny < self.height and
-                    self.grid[ny][nx] != '#' and (nx, ny) not in visited):
-                    visited.add((nx, ny))
-                    queue.append(((nx, ny), dist + 1))
+    Only the set membership of the current row of cells is kept, so working
+    memory is O(width) no matter how tall the maze is. Rows are emitted as
+    soon as they are final, which lets callers stream them straight into a
+    PackedGrid or a corpus file.
+    """
+
+    def __init__(self, width: int, height: int, join_probability: float = 0.5,
+                 rng: Optional[random.Random] = None):
+        """Initialize maze generator.
+
+        Args:
+            width: Maze width (must be odd for proper wall generation)
+            height: Maze height (must be odd for proper wall generation)
+            join_probability: Chance of joining neighbouring cells in a row
+                (and of opening extra passages downward)
+            rng: Random number generator (defaults to the global one)
+        """
+        self.width = width if width % 2 == 1 else width + 1
+        self.height = height if height % 2 == 1 else height + 1
+        self.join_probability = join_probability
+        self.rng = rng or random
+
+    def rows(self) -> Iterator[str]:
+        """Generate the maze one grid row at a time.
+
+        Yields:
+            Grid rows as strings of '#' (wall) and ' ' (open)
+        """
+        cols = (self.width - 1) // 2
+        cell_rows = (self.height - 1) // 2
+        wall_row = '#' * self.width
+
+        yield wall_row
+
+        sets: List[Optional[int]] = [None] * cols
+        next_set = 0
+
+        for r in range(cell_rows):
+            last_row = r == cell_rows - 1
+
+            # Cells not carried down from the previous row get a fresh set
+            for c in range(cols):
+                if sets[c] is None:
+                    sets[c] = next_set
+                    next_set += 1
+
+            # Join horizontal neighbours (all of them in the last row)
+            row = ['#'] * self.width
+            for c in range(cols):
+                row[2 * c + 1] = ' '
+            for c in range(cols - 1):
+                if sets[c] != sets[c + 1] and (last_row or self.rng.random() < self.join_probability):
+                    row[2 * c + 2] = ' '
+                    old, new = sets[c + 1], sets[c]
+                    sets = [new if s == old else s for s in sets]
+            yield ''.join(row)
+
+            if last_row:
+                break
+
+            # Every set needs at least one passage down
+            members: dict = {}
+            for c in range(cols):
+                members.setdefault(sets[c], []).append(c)
+
+            below: List[Optional[int]] = [None] * cols
+            down = ['#'] * self.width
+            for set_id, cells in members.items():
+                chosen = [c for c in cells if self.rng.random() < self.join_probability]
+                if not chosen:
+                    chosen = [self.rng.choice(cells)]
+                for c in chosen:
+                    below[c] = set_id
+                    down[2 * c + 1] = ' '
+            sets = below
+            yield ''.join(down)
+
+        yield wall_row
+
+    def generate(self) -> Tuple[List[List[str]], Tuple[int, int], Tuple[int, int], int]:
+        """Generate a maze with start at top-left and goal at bottom-right.
+
+        Returns:
+            Tuple of (grid, start_pos, goal_pos, optimal_path_length)
+        """
+        packed = PackedGrid.from_rows(self.width, self.height, self.rows())
+        start_pos = (1, 1)
+        goal_pos = (self.width - 2, self.height - 2)
+        optimal_length = packed.optimal_path_length(start_pos, goal_pos)
+        return packed.to_grid(), start_pos, goal_pos, optimal_length
+
+
+class PackedGrid:
+    """Maze grid stored as one bit per cell (1 = open).
+
+    Rows are padded to whole bytes. The corpus file format is an 8-byte
+    magic/version, the width and height as little-endian uint32, then the
+    packed rows.
+    """
+
+    MAGIC = b"RMAZE001"
+
+    def __init__(self, width: int, height: int, data: Optional[bytearray] = None):
+        """Initialize packed grid.
+
+        Args:
+            width: Grid width
+            height: Grid height
+            data: Packed rows (all walls if omitted)
+        """
+        self.width = width
+        self.height = height
+        self.stride = (width + 7) // 8
+        self.data = data if data is not None else bytearray(self.stride * height)
+
+    @staticmethod
+    def pack_row(row: str) -> bytes:
+        """Pack a row of '#'/' ' characters into bits."""
+        packed = bytearray((len(row) + 7) // 8)
+        for x, ch in enumerate(row):
+            if ch != '#':
+                packed[x >> 3] |= 1 << (x & 7)
+        return bytes(packed)
+
+    @classmethod
+    def from_rows(cls, width: int, height: int, rows: Iterable[str]) -> "PackedGrid":
+        """Build a packed grid from a stream of rows."""
+        grid = cls(width, height)
+        for y, row in enumerate(rows):
+            grid.data[y * grid.stride:(y + 1) * grid.stride] = cls.pack_row(row)
+        return grid
+
+    @classmethod
+    def write_rows(cls, path: str, width: int, height: int, rows: Iterable[str]):
+        """Stream rows straight into a corpus file without building the grid.
+
+        Args:
+            path: Output file path
+            width: Grid width
+            height: Grid height
+            rows: Row strings, e.g. from EllerGenerator.rows()
+        """
+        with open(path, "wb") as f:
+            f.write(cls.MAGIC + struct.pack("<II", width, height))
+            for row in rows:
+                f.write(cls.pack_row(row))
+
+    @classmethod
+    def load(cls, path: str) -> "PackedGrid":
+        """Load a packed grid from a corpus file."""
+        with open(path, "rb") as f:
+            if f.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"{path} is not a packed maze file")
+            width, height = struct.unpack("<II", f.read(8))
+            data = bytearray(f.read())
+        return cls(width, height, data)
+
+    def save(self, path: str):
+        """Save the packed grid to a corpus file."""
+        with open(path, "wb") as f:
+            f.write(self.MAGIC + struct.pack("<II", self.width, self.height))
+            f.write(self.data)
+
+    def is_open(self, x: int, y: int) -> bool:
+        """Check whether a cell is open (out of bounds counts as wall)."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        return bool(self.data[y * self.stride + (x >> 3)] >> (x & 7) & 1)
+
+    def to_grid(self) -> List[List[str]]:
+        """Unpack into the list-of-lists grid used by MazeState."""
+        return [
+            [' ' if self.is_open(x, y) else '#' for x in range(self.width)]
+            for y in range(self.height)
+        ]
+
+    def optimal_path_length(self, start: Tuple[int, int], goal: Tuple[int, int]) -> int:
+        """Calculate optimal path length using BFS over the packed grid.
+
+        Visited cells are tracked in a second bitmap, so this pass needs two
+        bits per cell rather than a set of tuples.
+
+        Args:
+            start: Start position (x, y)
+            goal: Goal position (x, y)
+
+        Returns:
+            Length of optimal path
+        """
+        visited = bytearray(len(self.data))
+
+        def visit(x: int, y: int) -> bool:
+            i, bit = y * self.stride + (x >> 3), 1 << (x & 7)
+            if visited[i] & bit:
+                return False
+            visited[i] |= bit
+            return True
+
+        visit(*start)
+        frontier = [start]
+        dist = 0
+        while frontier:
+            next_frontier = []
+            for x, y in frontier:
+                if (x, y) == goal:
+                    return dist
+                for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
+                    nx, ny = x + dx, y + dy
+                    if self.is_open(nx, ny) and visit(nx, ny):
+                        next_frontier.append((nx, ny))
+            frontier = next_frontier
+            dist += 1
 
-        # Should never reach here if maze is solvable
         raise ValueError("No path found between start and goal")
 
 
+def shortest_path(grid: List[List[str]], start: Tuple[int, int],
+                  goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """Find a shortest path between two open cells using BFS.
+
+    Args:
+        grid: 2D array representing the maze
+        start: Start position (x, y)
+        goal: Goal position (x, y)
+
+    Returns:
+        List of positions from start to goal (inclusive)
+    """
+    height, width = len(grid), len(grid[0])
+    parents = {start: None}
+    queue = deque([start])
+
+    while queue:
+        x, y = queue.popleft()
+
+        if (x, y) == goal:
+            path = []
+            node = goal
+            while node is not None:
+                path.append(node)
+                node = parents[node]
+            return path[::-1]
+
+        for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
+            nx, ny = x + dx, y + dy
+
+            if (0 <= nx < width and 0 <= ny < height and
+                grid[ny][nx] != '#' and (nx, ny) not in parents):
+                parents[(nx, ny)] = (x, y)
+                queue.append((nx, ny))
+
+    raise ValueError("No path found between start and goal")
+
+
+def distance_field(grid: List[List[str]], goal: Tuple[int, int]) -> List[List[int]]:
+    """Compute the shortest-path distance from every open cell to the goal.
+
+    Args:
+        grid: 2D array representing the maze
+        goal: Goal position (x, y)
+
+    Returns:
+        Grid-shaped distances (-1 for walls and unreachable cells)
+    """
+    return BitGrid(grid).distance_field(goal)
+
+
+def compute_maze_features(grid: List[List[str]], start_pos: Tuple[int, int],
+                          goal_pos: Tuple[int, int]) -> dict:
+    """Compute cheap difficulty features for a maze.
+
+    Args:
+        grid: 2D array representing the maze
+        start_pos: Starting position (x, y)
+        goal_pos: Goal position (x, y)
+
+    Returns:
+        Dictionary with:
+            optimal_length: Moves on the shortest path
+            dead_ends: Open cells with exactly one open neighbour
+            branching_factor: Mean number of onward exits (open neighbours
+                other than the one arrived from) along the shortest path
+            decision_points: Cells on the shortest path (excluding the goal)
+                with three or more open neighbours
+            turns: Direction changes along the shortest path
+    """
+    bits = BitGrid(grid)
+    dead_ends = bits.dead_ends()
+
+    path = shortest_path(grid, start_pos, goal_pos)
+    path_degrees = [bits.degree(x, y) for x, y in path[:-1]]
+    decision_points = sum(1 for d in path_degrees if d >= 3)
+
+    # The start has no arrival direction, every later cell has one
+    exits = [d if i == 0 else d - 1 for i, d in enumerate(path_degrees)]
+    branching_factor = sum(exits) / len(exits) if exits else 0.0
+
+    turns = 0
+    for i in range(2, len(path)):
+        prev_step = (path[i - 1][0] - path[i - 2][0], path[i - 1][1] - path[i - 2][1])
+        step = (path[i][0] - path[i - 1][0], path[i][1] - path[i - 1][1])
+        if step != prev_step:
+            turns += 1
+
+    return {
+        "optimal_length": len(path) - 1,
+        "dead_ends": dead_ends,
+        "branching_factor": branching_factor,
+        "decision_points": decision_points,
+        "turns": turns,
+    }
+
+
 class Transformation(Enum):
     """Types of visual transformations."""
     ROTATE_90 = "rotate_90"
@@ -110,12 +432,76 @@ class Transformation(Enum):
     FLIP_V = "flip_vertical"
 
 
+def transform_flags(rotation_count: int, flip_h: bool, flip_v: bool,
+                    transformation: Transformation) -> Tuple[int, bool, bool]:
+    """Apply a transformation to view orientation flags.
+
+    Args:
+        rotation_count: Clockwise quarter turns (0-3)
+        flip_h: Horizontal flip applied after the rotation
+        flip_v: Vertical flip applied after the horizontal flip
+        transformation: Transformation to apply
+
+    Returns:
+        Updated (rotation_count, flip_h, flip_v)
+    """
+    if transformation == Transformation.ROTATE_90:
+        rotation_count = (rotation_count + 1) % 4
+    elif transformation == Transformation.ROTATE_180:
+        rotation_count = (rotation_count + 2) % 4
+    elif transformation == Transformation.ROTATE_270:
+        rotation_count = (rotation_count + 3) % 4
+    elif transformation == Transformation.FLIP_H:
+        flip_h = not flip_h
+    elif transformation == Transformation.FLIP_V:
+        flip_v = not flip_v
+    return rotation_count, flip_h, flip_v
+
+
+def orientation_id(rotation_count: int, flip_h: bool, flip_v: bool) -> int:
+    """Canonical id (0-7) of a view orientation, i.e. its D4 element.
+
+    Flipping both ways equals a 180° rotation and a vertical flip equals a
+    180° rotation plus a horizontal flip, so every combination reduces to
+    rotation + 4 * horizontal_flip.
+    """
+    rotation = (rotation_count + (2 if flip_v else 0)) % 4
+    return rotation + (4 if flip_h != flip_v else 0)
+
+
+def generate_transform_schedule(num_transforms: int,
+                                rng: Optional[random.Random] = None) -> List[int]:
+    """Draw the sequence of view orientations for a non-stationary run.
+
+    Args:
+        num_transforms: Number of transformations to schedule
+        rng: Random number generator (defaults to the global one)
+
+    Returns:
+        Orientation ids (see orientation_id); entry k is the orientation from
+        move (k + 1) * transform_interval onwards
+    """
+    rng = rng or random
+    transformations = list(Transformation)
+    flags = (0, False, False)
+    schedule = []
+    for _ in range(num_transforms):
+        flags = transform_flags(*flags, rng.choice(transformations))
+        schedule.append(orientation_id(*flags))
+    return schedule
+
+
 class MazeState:
     """Manages maze state including position, transformations, and view generation."""
 
     def __init__(self, grid: List[List[str]], start_pos: Tuple[int, int],
                  goal_pos: Tuple[int, int], optimal_path_length: int,
-                 max_steps: int, variant: str = "stationary"):
+                 max_steps: int, variant: str = "stationary",
+                 transform_schedule: Optional[List[int]] = None,
+                 max_state_visits: Optional[int] = None,
+                 max_invalid_streak: Optional[int] = None,
+                 transform_interval: int = 5,
+                 view_radius: Optional[int] = None):
         """Initialize maze state.
 
         Args:
@@ -125,7 +511,21 @@ class MazeState:
             optimal_path_length: Length of optimal solution
             max_steps: Maximum allowed steps
             variant: "stationary" or "non_stationary"
+            transform_schedule: Precomputed orientations from
+                generate_transform_schedule. Without one, transformations
+                are drawn from the global RNG as they happen.
+            max_state_visits: Treat the agent as looping once it has been in
+                the same (position, orientation) this many times (None = off)
+            max_invalid_streak: Treat the agent as stalled after this many
+                invalid moves in a row (None = off)
+            transform_interval: Moves between transformations
+                (non-stationary only)
+            view_radius: Only show the cells within this many steps of the
+                player in either axis (None = the whole maze)
         """
+        if transform_interval < 1:
+            raise ValueError(f"transform_interval must be at least 1, got {transform_interval}")
+
         self.original_grid = [row[:] for row in grid]  # Deep copy
         self.start_pos = start_pos
         self.goal_pos = goal_pos
@@ -140,15 +540,89 @@ class MazeState:
         self.flip_h = False
         self.flip_v = False
 
-        # Transformation triggers (every 5 moves for non-stationary)
-        self.transform_interval = 5
+        # Transformation triggers (every transform_interval moves for non-stationary)
+        self.transform_interval = transform_interval
+        self.transform_schedule = transform_schedule
+
+        # Windowed observation for large mazes
+        self.view_radius = view_radius
+
+        # Why the episode ended (None while it is running)
+        self.end_reason: Optional[str] = None
+
+        # Loop and stall detection. Visits are keyed on
+        # (y * width + x) * 8 + orientation to keep the counter compact.
+        self.max_state_visits = max_state_visits
+        self.max_invalid_streak = max_invalid_streak
+        self.state_visits: Dict[int, int] = {self._state_key(): 1}
+        self.invalid_streak = 0
+
+        # Adjacency masks for movement checks, goal distances on first use
+        self.bitgrid = BitGrid(self.original_grid)
+        self._goal_distances: Optional[List[List[int]]] = None
+
+    @property
+    def orientation(self) -> int:
+        """Canonical id (0-7) of the current view orientation."""
+        return orientation_id(self.rotation_count, self.flip_h, self.flip_v)
+
+    @orientation.setter
+    def orientation(self, orientation: int):
+        """Set the view orientation from its canonical id."""
+        self.rotation_count = orientation % 4
+        self.flip_h = orientation >= 4
+        self.flip_v = False
+
+    def snapshot(self) -> dict:
+        """Capture the mutable part of the state as a JSON-serializable dict.
+
+        The grid, budgets and transform schedule come from the sample, so
+        only the progress through the episode is recorded.
+
+        Returns:
+            Dictionary with position, move_count, orientation flags,
+            schedule_cursor (transformations applied so far), end_reason,
+            invalid_streak and state_visits
+        """
+        return {
+            "position": list(self.current_position),
+            "move_count": self.move_count,
+            "rotation_count": self.rotation_count,
+            "flip_h": self.flip_h,
+            "flip_v": self.flip_v,
+            "schedule_cursor": (self.move_count // self.transform_interval
+                                if self.variant == "non_stationary" else 0),
+            "end_reason": self.end_reason,
+            "invalid_streak": self.invalid_streak,
+            "state_visits": [[key, count] for key, count in self.state_visits.items()],
+        }
+
+    def restore(self, snapshot: dict):
+        """Return to a state captured with snapshot.
+
+        Args:
+            snapshot: Dictionary from snapshot() of a state built from the
+                same sample
+        """
+        self.current_position = tuple(snapshot["position"])
+        self.move_count = snapshot["move_count"]
+        self.rotation_count = snapshot["rotation_count"]
+        self.flip_h = snapshot["flip_h"]
+        self.flip_v = snapshot["flip_v"]
+        self.end_reason = snapshot["end_reason"]
+        self.invalid_streak = snapshot["invalid_streak"]
+        self.state_visits = {key: count for key, count in snapshot["state_visits"]}
 
     def get_view(self) -> str:
         """Get current transformed ASCII view of the maze.
 
         Returns:
             String representation of the maze with transformations applied
+            (only the window around the player if view_radius is set)
         """
+        if self.view_radius is not None:
+            return self._window_view()
+
         # Start with a copy of the original grid
         view = [row[:] for row in self.original_grid]
 
@@ -172,6 +646,79 @@ class MazeState:
         # Convert to string
         return '\n'.join([''.join(row) for row in view])
 
+    def observation(self) -> str:
+        """Get what the agent is shown after each move.
+
+        Returns:
+            The view. Windowed views are preceded by the goal's offset in the
+            current view and a blank line, since the goal may be out of sight.
+        """
+        view = self.get_view()
+        if self.view_radius is None or self.at_goal():
+            return view
+
+        px, py = self._to_view(*self.current_position)
+        gx, gy = self._to_view(*self.goal_pos)
+        offsets = []
+        if gy != py:
+            offsets.append(f"{abs(gy - py)} {'down' if gy > py else 'up'}")
+        if gx != px:
+            offsets.append(f"{abs(gx - px)} {'right' if gx > px else 'left'}")
+        return f"Goal: {', '.join(offsets)} (in this view)\n\n{view}"
+
+    def _view_size(self) -> Tuple[int, int]:
+        """Get the (width, height) of the transformed view."""
+        height, width = len(self.original_grid), len(self.original_grid[0])
+        return (height, width) if self.rotation_count % 2 else (width, height)
+
+    def _to_view(self, x: int, y: int) -> Tuple[int, int]:
+        """Map grid coordinates to view coordinates (see _apply_transformations)."""
+        width, height = len(self.original_grid[0]), len(self.original_grid)
+        for _ in range(self.rotation_count):
+            x, y = height - 1 - y, x
+            width, height = height, width
+        if self.flip_h:
+            x = width - 1 - x
+        if self.flip_v:
+            y = height - 1 - y
+        return x, y
+
+    def _to_grid(self, vx: int, vy: int) -> Tuple[int, int]:
+        """Map view coordinates back to grid coordinates."""
+        width, height = self._view_size()
+        if self.flip_v:
+            vy = height - 1 - vy
+        if self.flip_h:
+            vx = width - 1 - vx
+        for _ in range(self.rotation_count):
+            vx, vy = vy, width - 1 - vx
+            width, height = height, width
+        return vx, vy
+
+    def _window_view(self) -> str:
+        """Render the window of the transformed view centred on the player.
+
+        Only the (2 * view_radius + 1)^2 window cells are mapped back to the
+        grid, so the cost doesn't grow with the maze. Cells beyond the edge
+        of the maze are shown as walls.
+        """
+        radius = self.view_radius
+        width, height = self._view_size()
+        px, py = self._to_view(*self.current_position)
+        markers = {self.start_pos: 'S', self.goal_pos: 'G', self.current_position: 'P'}
+
+        rows = []
+        for vy in range(py - radius, py + radius + 1):
+            row = []
+            for vx in range(px - radius, px + radius + 1):
+                if 0 <= vx < width and 0 <= vy < height:
+                    x, y = self._to_grid(vx, vy)
+                    row.append(markers.get((x, y)) or self.original_grid[y][x])
+                else:
+                    row.append('#')
+            rows.append(''.join(row))
+        return '\n'.join(rows)
+
     def _apply_transformations(self, grid: List[List[str]]) -> List[List[str]]:
         """Apply current transformations to the grid.
 
@@ -197,15 +744,8 @@ class MazeState:
 
     def _rotate_90(self, grid: List[List[str]]) -> List[List[str]]:
         """Rotate grid 90 degrees clockwise."""
-        height = len(grid)
-        width = len(grid[0])
-        rotated = [['' for _ in range(height)] for _ in range(width)]
-
-        for y in range(height):
-            for x in range(width):
-                rotated[x][height - 1 - y] = grid[y][x]
-
-        return rotated
+        # Row x of the result is column x read from the bottom up
+        return [list(column) for column in zip(*grid[::-1])]
 
     def _flip_horizontal(self, grid: List[List[str]]) -> List[List[str]]:
         """Flip grid horizontally."""
@@ -227,19 +767,15 @@ class MazeState:
         return self.move_count > 0 and self.move_count % self.transform_interval == 0
 
     def apply_transformation(self):
-        """Apply a random transformation to the view."""
-        transformation = random.choice(list(Transformation))
+        """Apply the scheduled (or, without a schedule, a random) transformation."""
+        if self.transform_schedule is not None:
+            self.orientation = self.transform_schedule[self.move_count // self.transform_interval - 1]
+            return
 
-        if transformation == Transformation.ROTATE_90:
-            self.rotation_count = (self.rotation_count + 1) % 4
-        elif transformation == Transformation.ROTATE_180:
-            self.rotation_count = (self.rotation_count + 2) % 4
-        elif transformation == Transformation.ROTATE_270:
-            self.rotation_count = (self.rotation_count + 3) % 4
-        elif transformation == Transformation.FLIP_H:
-            self.flip_h = not self.flip_h
-        elif transformation == Transformation.FLIP_V:
-            self.flip_v = not self.flip_v
+        transformation = random.choice(list(Transformation))
+        self.rotation_count, self.flip_h, self.flip_v = transform_flags(
+            self.rotation_count, self.flip_h, self.flip_v, transformation
+        )
 
     def translate_visual_to_actual(self, visual_direction: str) -> Tuple[int, int]:
         """Translate visual direction to actual coordinate change.
@@ -260,17 +796,18 @@ class MazeState:
 
         dx, dy = base_dirs[visual_direction]
 
+        # Undo the transformations in reverse order: the view is rotated
+        # first and flipped afterwards, so undo the flips first
+        if self.flip_v:
+            dy = -dy
+        if self.flip_h:
+            dx = -dx
+
         # Apply reverse rotation transformations
         for _ in range(self.rotation_count):
             # Rotate counter-clockwise to reverse the visual rotation
             dx, dy = dy, -dx
 
-        # Apply reverse flips
-        if self.flip_h:
-            dx = -dx
-        if self.flip_v:
-            dy = -dy
-
         return dx, dy
 
     def is_valid_move(self, direction: Tuple[int, int]) -> bool:
@@ -282,16 +819,8 @@ class MazeState:
         Returns:
             True if move is valid
         """
-        dx, dy = direction
-        nx, ny = self.current_position[0] + dx, self.current_position[1] + dy
-
-        # Check bounds
-        if not (0 <= nx < len(self.original_grid[0]) and
-                0 <= ny < len(self.original_grid)):
-            return False
-
-        # Check if wall
-        return self.original_grid[ny][nx] != '#'
+        # One lookup in the cell's adjacency mask (covers walls and bounds)
+        return self.bitgrid.can_move(self.current_position, direction)
 
     def make_move(self, direction: Tuple[int, int]):
         """Make a move in the specified direction.
@@ -305,6 +834,42 @@ class MazeState:
             self.current_position[1] + dy
         )
         self.move_count += 1
+        self.invalid_streak = 0
+
+    def record_visit(self):
+        """Count a visit to the current (position, orientation).
+
+        Called once a move (and any transformation it triggers) is complete.
+        """
+        key = self._state_key()
+        self.state_visits[key] = self.state_visits.get(key, 0) + 1
+
+    def record_invalid_move(self):
+        """Count an invalid move (these don't advance move_count)."""
+        self.invalid_streak += 1
+
+    def _state_key(self) -> int:
+        """Get the compact visit-counter key of the current state."""
+        x, y = self.current_position
+        return (y * len(self.original_grid[0]) + x) * 8 + self.orientation
+
+    def looping(self) -> bool:
+        """Check if the current (position, orientation) was visited too often.
+
+        Returns:
+            True if max_state_visits is set and has been reached
+        """
+        return (self.max_state_visits is not None and
+                self.state_visits.get(self._state_key(), 0) >= self.max_state_visits)
+
+    def stalled(self) -> bool:
+        """Check if there have been too many invalid moves in a row.
+
+        Returns:
+            True if max_invalid_streak is set and has been reached
+        """
+        return (self.max_invalid_streak is not None and
+                self.invalid_streak >= self.max_invalid_streak)
 
     def at_goal(self) -> bool:
         """Check if agent is at goal position.
@@ -322,32 +887,130 @@ class MazeState:
         """
         return self.move_count >= self.max_steps
 
+    def distance_to_goal(self) -> int:
+        """Get the shortest-path distance from the current position to the goal.
+
+        Returns:
+            Number of moves (-1 if the goal cannot be reached at all)
+        """
+        if self._goal_distances is None:
+            self._goal_distances = self.bitgrid.distance_field(self.goal_pos)
+        x, y = self.current_position
+        return self._goal_distances[y][x]
+
+    def goal_out_of_reach(self) -> bool:
+        """Check if the goal can no longer be reached within max_steps.
+
+        Returns:
+            True if the remaining steps are fewer than the remaining distance
+        """
+        distance = self.distance_to_goal()
+        return distance < 0 or self.max_steps - self.move_count < distance
+
+
+# Characters a rendered maze view is drawn from
+VIEW_CHARS = frozenset("# PGS")
+
+
+def is_maze_view(text: str) -> bool:
+    """Check whether a text block is a maze view rendered by MazeState.
+
+    Args:
+        text: Candidate view, e.g. the last block of a tool result
+
+    Returns:
+        True if every row is drawn from VIEW_CHARS, all rows have the same
+        width and the player is shown
+    """
+    rows = text.split("\n")
+    return ("P" in text and len({len(row) for row in rows}) == 1 and
+            all(set(row) <= VIEW_CHARS for row in rows))
+
+
+GENERATORS = {
+    "backtracking": MazeGenerator,
+    "eller": EllerGenerator,
+}
+
+
+# Largest maze shown in full with observation="auto"
+FULL_VIEW_MAX_SIZE = 41
+
+# Default window radius for windowed observations
+DEFAULT_VIEW_RADIUS = 10
+
+
+def resolve_view_radius(size: int, observation: str = "auto",
+                        view_radius: int = DEFAULT_VIEW_RADIUS) -> Optional[int]:
+    """Decide how much of a maze of a given size the agent sees.
+
+    Args:
+        size: Maze width/height
+        observation: "full", "window" or "auto" (full view up to
+            FULL_VIEW_MAX_SIZE, windowed above)
+        view_radius: Window radius for windowed observations
+
+    Returns:
+        Window radius, or None for the full view
+    """
+    if observation not in ("full", "window", "auto"):
+        raise ValueError(f"Unknown observation '{observation}'. Expected 'full', 'window' or 'auto'")
+    if observation == "full" or (observation == "auto" and size <= FULL_VIEW_MAX_SIZE):
+        return None
+    return view_radius
+
 
 def generate_maze_instance(size_range: Tuple[int, int] = (12, 18),
-                          variant: str = "stationary") -> dict:
+                          variant: str = "stationary",
+                          algorithm: str = "backtracking",
+                          rng: Optional[random.Random] = None,
+                          step_multiplier: float = 3,
+                          transform_interval: int = 5,
+                          observation: str = "auto",
+                          view_radius: int = DEFAULT_VIEW_RADIUS) -> dict:
     """Generate a single maze instance for the dataset.
 
     Args:
         size_range: (min_size, max_size) for maze dimensions
         variant: "stationary" or "non_stationary"
+        algorithm: "backtracking" (recursive backtracking) or "eller"
+            (row-streaming Eller's algorithm)
+        rng: Random number generator (defaults to the global one)
+        step_multiplier: Step budget as a multiple of the optimal path length
+        transform_interval: Moves between transformations (non-stationary)
+        observation: "full", "window" or "auto" (see resolve_view_radius)
+        view_radius: Window radius for windowed observations
 
     Returns:
         Dictionary with maze data
     """
+    rng = rng or random
+
     # Random size within range (ensure odd for proper maze generation)
-    size = random.randint(size_range[0], size_range[1])
+    size = rng.randint(size_range[0], size_range[1])
     if size % 2 == 0:
         size += 1
 
+    if algorithm not in GENERATORS:
+        raise ValueError(f"Unknown algorithm '{algorithm}'. Expected one of {list(GENERATORS)}")
+
     # Generate maze
-    generator = MazeGenerator(size, size)
+    generator = GENERATORS[algorithm](size, size, rng=rng)
     grid, start_pos, goal_pos, optimal_length = generator.generate()
 
     # Calculate max steps
-    max_steps = optimal_length * 3
+    max_steps = max(int(optimal_length * step_multiplier), optimal_length)
 
     # Create state
-    state = MazeState(grid, start_pos, goal_pos, optimal_length, max_steps, variant)
+    radius = resolve_view_radius(size, observation, view_radius)
+    state = MazeState(grid, start_pos, goal_pos, optimal_length, max_steps, variant,
+                      transform_interval=transform_interval, view_radius=radius)
+
+    # Fix every transformation up front so runs don't depend on RNG state
+    if variant == "non_stationary":
+        schedule = generate_transform_schedule(max_steps // state.transform_interval, rng)
+    else:
+        schedule = []
 
     return {
         "grid": grid,
@@ -356,5 +1019,9 @@ def generate_maze_instance(size_range: Tuple[int, int] = (12, 18),
         "optimal_path_length": optimal_length,
         "max_steps": max_steps,
         "variant": variant,
-        "initial_view": state.get_view()
+        "transform_schedule": schedule,
+        "transform_interval": transform_interval,
+        "view_radius": radius,
+        "initial_view": state.observation(),
+        "features": compute_maze_features(grid, start_pos, goal_pos)
     }
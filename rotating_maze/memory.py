@@ -0,0 +1,225 @@
+"""Memory profiling of dataset builds and per-sample state with tracemalloc.
+
+Two measurements:
+
+- profile_dataset builds the dataset at several sizes and reports the peak
+  during the build, the memory the dataset retains afterwards, and where
+  the retained memory was allocated.
+- profile_trajectory plays one sample the way the solver does (MazeState,
+  movement tool results, step records and chat messages) and reports, at
+  checkpoints along the trajectory, the memory held by the sample, the
+  transient peak of individual steps and where the held memory was
+  allocated.
+
+Allocations are attributed to the innermost frame inside this package, so
+memory allocated inside Inspect or pydantic on behalf of, say, the dataset
+builder is reported against the dataset builder line that caused it.
+"""
+
+import gc
+import os
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+
+PACKAGE_DIR = str(Path(__file__).parent)
+
+# Stack depth recorded per allocation, enough to reach a package frame
+TRACE_FRAMES = 25
+
+
+def _site_name(frame) -> str:
+    """Short "path:line" name for a traceback frame."""
+    filename = frame.filename
+    if filename.startswith(PACKAGE_DIR):
+        filename = os.path.relpath(filename, os.path.dirname(PACKAGE_DIR))
+    elif "site-packages" in filename:
+        filename = filename.split("site-packages" + os.sep, 1)[1]
+    return f"{filename}:{frame.lineno}"
+
+
+def allocation_sites(snapshot: tracemalloc.Snapshot, top: int = 10) -> List[dict]:
+    """Group live allocations by the innermost frame inside the package.
+
+    Args:
+        snapshot: tracemalloc snapshot
+        top: Number of sites to return
+
+    Returns:
+        Largest sites as dictionaries with site ("path:line"), size_bytes
+        and blocks
+    """
+    sites = {}
+    # Allocations sharing a traceback are already grouped here
+    for stat in snapshot.statistics("traceback"):
+        frames = stat.traceback
+        if any(f.filename == tracemalloc.__file__ for f in frames):
+            continue
+        # Frames run from the oldest to the most recent call
+        frame = next((f for f in reversed(frames) if f.filename.startswith(PACKAGE_DIR)),
+                     frames[-1])
+        name = _site_name(frame)
+        size, blocks = sites.get(name, (0, 0))
+        sites[name] = (size + stat.size, blocks + stat.count)
+
+    largest = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    return [{"site": name, "size_bytes": size, "blocks": blocks}
+            for name, (size, blocks) in largest]
+
+
+def profile_dataset(num_instances: Sequence[int], variant: str = "stationary",
+                    size_range: Tuple[int, int] = (12, 18), seed: Optional[int] = 0,
+                    top: int = 10) -> List[dict]:
+    """Measure the memory of building the dataset at several sizes.
+
+    Args:
+        num_instances: Dataset sizes to measure
+        variant: Dataset variant ("stationary", "non_stationary" or "paired")
+        size_range: (min_size, max_size) for maze dimensions
+        seed: Dataset seed
+        top: Number of allocation sites to report per size
+
+    Returns:
+        One dictionary per size with num_instances, samples, peak_bytes
+        (during the build), retained_bytes (held by the finished dataset),
+        retained_bytes_per_sample and sites
+    """
+    from rotating_maze.task import create_dataset
+
+    # First use initialises pydantic validators and other caches
+    create_dataset(num_instances=1, variant=variant, seed=seed, size_range=size_range)
+
+    results = []
+    for n in num_instances:
+        gc.collect()
+        tracemalloc.start(TRACE_FRAMES)
+        dataset = create_dataset(num_instances=n, variant=variant, seed=seed,
+                                 size_range=size_range)
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        results.append({
+            "num_instances": n,
+            "samples": len(dataset),
+            "peak_bytes": peak,
+            "retained_bytes": retained,
+            "retained_bytes_per_sample": retained / max(len(dataset), 1),
+            "sites": allocation_sites(snapshot, top),
+        })
+        del dataset, snapshot
+    return results
+
+
+def profile_trajectory(size: int = 41, variant: str = "non_stationary", steps: int = 2000,
+                       checkpoint_every: int = 250, compact_history: bool = False,
+                       seed: int = 0, top: int = 10) -> dict:
+    """Measure the memory held by one sample as its trajectory grows.
+
+    The agent makes seeded random moves, which rarely reach the goal on
+    larger mazes, so the trajectory runs for the full number of steps like
+    a long failing sample. Each step appends an assistant message with the
+    tool call, the tool message with the result and the step record, as the
+    solver and movement tools do.
+
+    Args:
+        size: Maze width/height
+        variant: "stationary" or "non_stationary"
+        steps: Number of tool calls to make
+        checkpoint_every: Tool calls between checkpoints
+        compact_history: Compact superseded views like the solver's
+            compact_history option
+        seed: Seed for the maze and the moves
+        top: Number of allocation sites to report per checkpoint
+
+    Returns:
+        Dictionary with maze (size, variant, optimal_path_length), the
+        options, and checkpoints: step, move_count, messages, held_bytes,
+        max_step_transient_bytes (largest amount allocated and freed again
+        within one step since the previous checkpoint) and sites
+    """
+    from inspect_ai.model import ChatMessageAssistant, ChatMessageTool
+    from inspect_ai.tool import ToolCall
+
+    from rotating_maze.maze import MazeState, generate_maze_instance, generate_transform_schedule
+    from rotating_maze.task import compact_maze_views
+    from rotating_maze.tools import DIRECTIONS, step_record, take_step
+
+    rng = random.Random(seed)
+    maze = generate_maze_instance(size_range=(size, size), variant=variant, rng=rng)
+    # Scheduled transforms like a real run, but covering the whole walk
+    # rather than the maze's step budget
+    schedule = maze["transform_schedule"]
+    if variant == "non_stationary":
+        schedule = generate_transform_schedule(steps // maze["transform_interval"], rng)
+
+    gc.collect()
+    tracemalloc.start(TRACE_FRAMES)
+    state = MazeState(
+        grid=maze["grid"],
+        start_pos=tuple(maze["start_pos"]),
+        goal_pos=tuple(maze["goal_pos"]),
+        optimal_path_length=maze["optimal_path_length"],
+        max_steps=sys.maxsize,  # keep the walk going
+        variant=variant,
+        transform_schedule=schedule,
+        transform_interval=maze["transform_interval"],
+        view_radius=maze["view_radius"],
+    )
+    messages = []
+    records = []
+    compacted_upto = 0
+    checkpoints = []
+    max_transient = 0
+
+    for step in range(1, steps + 1):
+        tracemalloc.reset_peak()
+
+        direction = rng.choice(DIRECTIONS)
+        call_id = f"call_{step}"
+        messages.append(ChatMessageAssistant(content="", tool_calls=[
+            ToolCall(id=call_id, function=f"move_{direction}", arguments={})
+        ]))
+        moves_before = state.move_count
+        result = take_step(state, direction)
+        records.append(step_record(state, direction, moves_before))
+        messages.append(ChatMessageTool(content=result, tool_call_id=call_id,
+                                        function=f"move_{direction}"))
+        if compact_history:
+            compacted_upto = compact_maze_views(messages, compacted_upto)
+
+        held, peak = tracemalloc.get_traced_memory()
+        max_transient = max(max_transient, peak - held)
+
+        done = state.at_goal()
+        if step % checkpoint_every == 0 or step == steps or done:
+            gc.collect()
+            held, _ = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            checkpoints.append({
+                "step": step,
+                "move_count": state.move_count,
+                "messages": len(messages),
+                "held_bytes": held,
+                "max_step_transient_bytes": max_transient,
+                "sites": allocation_sites(snapshot, top),
+            })
+            del snapshot
+            max_transient = 0
+        if done:
+            break
+
+    tracemalloc.stop()
+    return {
+        "size": len(maze["grid"]),
+        "variant": variant,
+        "optimal_path_length": maze["optimal_path_length"],
+        "view_radius": maze["view_radius"],
+        "compact_history": compact_history,
+        "reached_goal": state.at_goal(),
+        "checkpoints": checkpoints,
+    }
@@ -0,0 +1,201 @@
+"""Local oracle model provider for offline end-to-end runs.
+
+Registers the ``maze_oracle`` model API. Instead of calling a remote model
+it reads the latest maze view from the conversation, runs a BFS from the
+goal in view coordinates and calls the movement tool that leads along a
+shortest path. Since it re-plans from the current view each turn, it keeps
+solving after rotations and flips. With windowed observations, where the
+goal may be out of sight, it heads for the visible cell closest to the goal
+offset instead. That still produces long, realistic trajectories for load
+tests, but it can get stuck in dead ends and is no longer optimal.
+
+This exercises the whole pipeline (task, solver, tools, scorer, logging)
+without API access, for load tests of the eval harness itself (see
+scripts/load_test.py). The API is registered when this module is
+imported; the task module does not import it. The inspect CLI resolves
+models before it loads task files, so run it from Python:
+
+    import rotating_maze.oracle  # noqa: F401
+    eval(rotating_maze(num_instances=1000), model="maze_oracle/oracle",
+         model_args={"noise": 0.2, "latency": 0.5},
+         max_samples=1000, max_connections=1000)
+
+Model args:
+    noise: Probability of a uniformly random move (possibly into a wall)
+        instead of the shortest-path move
+    latency: Seconds to wait before every response
+    latency_jitter: Extra uniformly random wait of up to this many seconds
+    seed: Seed for noise and jitter. Draws depend only on the seed, the
+        latest message (the view the move is planned from, which compacted
+        histories also keep verbatim), the system message (so the two
+        variants of a paired maze differ) and the turn. Samples draw
+        independently and runs are reproducible regardless of scheduling.
+
+Planning runs in a worker thread, so like a remote model the oracle leaves
+the event loop free and loop lag measured during a load test reflects the
+eval's own work.
+"""
+
+import random
+import re
+from typing import Any, List, Optional, Tuple
+
+import anyio
+from inspect_ai.model import (
+    ChatMessage,
+    GenerateConfig,
+    ModelAPI,
+    ModelOutput,
+    ModelUsage,
+    modelapi,
+)
+from inspect_ai.tool import ToolChoice, ToolInfo
+
+from rotating_maze.bitboard import BitGrid
+from rotating_maze.maze import is_maze_view
+
+
+# Visual direction -> (dx, dy) in view coordinates
+VIEW_MOVES = {
+    "up": (0, -1),
+    "down": (0, 1),
+    "left": (-1, 0),
+    "right": (1, 0),
+}
+
+# Goal offset line preceding windowed views (see MazeState.observation)
+GOAL_OFFSET_PATTERN = re.compile(r"Goal: (.*) \(in this view\)")
+
+def parse_goal_offset(text: str) -> Optional[Tuple[int, int]]:
+    """Read the goal's (dx, dy) view offset from a windowed observation."""
+    match = GOAL_OFFSET_PATTERN.search(text)
+    if match is None:
+        return None
+    dx = dy = 0
+    for count, direction in re.findall(r"(\d+) (up|down|left|right)", match.group(1)):
+        mx, my = VIEW_MOVES[direction]
+        dx, dy = dx + mx * int(count), dy + my * int(count)
+    return dx, dy
+
+
+def latest_view(messages: List[ChatMessage]) -> Optional[Tuple[List[str], Optional[Tuple[int, int]]]]:
+    """Find the most recent maze view in a conversation.
+
+    Args:
+        messages: Conversation so far
+
+    Returns:
+        (view rows, goal offset or None), or None if no message ends with
+        a view showing the player
+    """
+    for message in reversed(messages):
+        text = message.text
+        _, sep, view = text.rpartition("\n\n")
+        if sep and is_maze_view(view):
+            return view.split("\n"), parse_goal_offset(text)
+    return None
+
+
+def oracle_direction(rows: List[str],
+                     goal_offset: Optional[Tuple[int, int]] = None) -> Optional[str]:
+    """Get the first move of a shortest path from P towards G in a view.
+
+    Args:
+        rows: View rows
+        goal_offset: Goal (dx, dy) from the player in view coordinates,
+            used when G is outside a windowed view
+
+    Returns:
+        "up", "down", "left" or "right", or None if the goal can't be seen
+        (or located) or is unreachable
+    """
+    player = goal = None
+    for y, row in enumerate(rows):
+        if "P" in row:
+            player = (row.index("P"), y)
+        if "G" in row:
+            goal = (row.index("G"), y)
+    if player is None:
+        return None
+
+    bits = BitGrid(rows)
+    px, py = player
+    if goal is None:
+        if goal_offset is None:
+            return None
+        # Head for the reachable cell nearest to the unseen goal
+        tx, ty = px + goal_offset[0], py + goal_offset[1]
+        reach = bits.distance_field(player)
+        candidates = [(abs(tx - x) + abs(ty - y), d, (x, y))
+                      for y, row in enumerate(reach) for x, d in enumerate(row) if d > 0]
+        if not candidates:
+            return None
+        goal = min(candidates)[2]
+
+    field = bits.distance_field(goal)
+    if field[py][px] < 0:
+        return None
+
+    for direction, (dx, dy) in VIEW_MOVES.items():
+        if bits.can_move(player, (dx, dy)) and field[py + dy][px + dx] == field[py][px] - 1:
+            return direction
+    return None
+
+
+class MazeOracleAPI(ModelAPI):
+    """Model API that solves the maze from the views in the conversation."""
+
+    def __init__(self, model_name: str, base_url: Optional[str] = None,
+                 api_key: Optional[str] = None, config: GenerateConfig = GenerateConfig(),
+                 noise: float = 0.0, latency: float = 0.0, latency_jitter: float = 0.0,
+                 seed: int = 0, **model_args: Any):
+        super().__init__(model_name, base_url, api_key, [], config)
+        self.noise = float(noise)
+        self.latency = float(latency)
+        self.latency_jitter = float(latency_jitter)
+        self.seed = seed
+
+    def max_connections(self) -> int:
+        """Nothing remote to protect, so allow very high concurrency."""
+        return 10_000
+
+    async def generate(self, input: List[ChatMessage], tools: List[ToolInfo],
+                       tool_choice: ToolChoice, config: GenerateConfig) -> ModelOutput:
+        # The system message is shared by every sample of a variant, so the
+        # maze view in the latest message is what tells samples apart (the
+        # initial view may have been compacted away)
+        latest = input[-1].text if input else ""
+        variant = input[0].text if input and input[0].role == "system" else ""
+        rng = random.Random(f"{self.seed}:{len(input)}:{variant}:{latest}")
+
+        wait = self.latency + rng.uniform(0, self.latency_jitter)
+        if wait > 0:
+            await anyio.sleep(wait)
+
+        def plan() -> Tuple[bool, Optional[str]]:
+            view = latest_view(input)
+            return view is not None, oracle_direction(*view) if view else None
+
+        has_view, direction = await anyio.to_thread.run_sync(plan)
+        if has_view and rng.random() < self.noise:
+            direction = rng.choice(list(VIEW_MOVES))
+
+        tool_names = {tool.name for tool in tools}
+        if direction is None or f"move_{direction}" not in tool_names:
+            output = ModelOutput.from_content(self.model_name, "No move available.")
+        else:
+            output = ModelOutput.for_tool_call(
+                self.model_name, f"move_{direction}", {},
+                tool_call_id=f"call_{len(input)}",
+            )
+
+        # Rough character-based estimate; tokenizers may need network access
+        input_tokens = sum(len(message.text) for message in input) // 4
+        output.usage = ModelUsage(input_tokens=input_tokens, output_tokens=1,
+                                  total_tokens=input_tokens + 1)
+        return output
+
+
+@modelapi(name="maze_oracle")
+def maze_oracle() -> type[ModelAPI]:
+    return MazeOracleAPI
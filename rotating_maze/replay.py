@@ -0,0 +1,324 @@
+"""Offline trajectory replay and re-scoring for Rotating Maze eval logs.
+
+Replaying re-simulates each sample's ordered tool calls against a fresh
+MazeState built from the sample metadata, so scores can be recomputed after
+a metric change without calling any model.
+
+Logs from before transform schedules were stored (non-stationary samples
+without transform_schedule in their metadata) were run with an older move
+translation. It undid the view's rotation before its flip, so in rotated
+and flipped views one axis was reversed. Those logs are replayed with that
+translation (see legacy_visual_to_actual), so the replay follows the moves
+the live run actually made.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from rotating_maze.maze import MazeState, distance_field, is_maze_view
+from rotating_maze.scoring import score_metadata
+
+
+# Tool name -> visual direction
+MOVE_TOOLS = {
+    "move_up": "up",
+    "move_down": "down",
+    "move_left": "left",
+    "move_right": "right",
+}
+
+
+# Task args that end episodes early and must be applied when replaying
+LIMIT_ARGS = ("max_state_visits", "max_invalid_streak")
+
+
+class ReplayError(Exception):
+    """Raised when a trajectory cannot be re-simulated deterministically."""
+
+
+def extract_tool_calls(messages) -> List[Tuple[str, str]]:
+    """Extract the ordered tool calls of a sample with their results.
+
+    Args:
+        messages: Sample messages from an eval log
+
+    Returns:
+        List of (tool name, tool result text) in call order
+    """
+    results = {}
+    for message in messages:
+        if message.role == "tool":
+            results[message.tool_call_id] = message.text
+
+    calls = []
+    for message in messages:
+        if message.role == "assistant" and message.tool_calls:
+            for call in message.tool_calls:
+                calls.append((call.function, results.get(call.id, "")))
+    return calls
+
+
+def legacy_visual_to_actual(orientation: int, visual_direction: str) -> Tuple[int, int]:
+    """Translate a visual direction the way runs without transform schedules did.
+
+    The rotation was undone before the flips. Every combination of rotation
+    and flips that renders the same view gives the same result, so the
+    canonical orientation recovered from a logged view is enough.
+
+    Args:
+        orientation: Canonical orientation id of the view
+        visual_direction: "up", "down", "left" or "right"
+
+    Returns:
+        (dx, dy) coordinate change in the original grid
+    """
+    dx, dy = {"up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0)}[visual_direction]
+    for _ in range(orientation % 4):
+        dx, dy = dy, -dx
+    if orientation >= 4:
+        dx = -dx
+    return dx, dy
+
+
+def _observed_view(result: str) -> Optional[str]:
+    """Get the maze view from a tool result ("<status>\\n\\n<view>")."""
+    _, sep, view = result.rpartition("\n\n")
+    return view if sep and is_maze_view(view) else None
+
+
+def _recover_orientation(state: MazeState, view: Optional[str]) -> int:
+    """Find the orientation whose rendering matches an observed view.
+
+    Args:
+        state: Maze state positioned where the view was rendered
+        view: Maze view from the tool result
+
+    Returns:
+        Canonical orientation id
+    """
+    if view is None:
+        raise ReplayError(f"No maze view logged after transform at move {state.move_count}")
+
+    for orientation in range(8):
+        state.orientation = orientation
+        if state.get_view() == view:
+            return orientation
+
+    raise ReplayError(f"Logged view at move {state.move_count} matches no orientation")
+
+
+def simulate(metadata: dict, calls: List[Tuple[str, str]],
+             include_trajectory: bool = False, limits: Optional[dict] = None,
+             turns: Optional[int] = None) -> dict:
+    """Re-simulate a trajectory and recompute its score.
+
+    Transformations in non-stationary samples come from the transform
+    schedule in the metadata. Logs from before schedules were stored have
+    them recovered from the views logged in the tool results instead, and
+    their moves are translated with legacy_visual_to_actual like the live
+    run's were.
+
+    Args:
+        metadata: Sample metadata (grid, positions, max_steps, variant, ...)
+        calls: Ordered (tool name, tool result text) pairs
+        include_trajectory: Also return per-step records
+        limits: Loop and stall thresholds of the run (max_state_visits,
+            max_invalid_streak), if any
+        turns: Model turns in the sample, for applying the max_turns budget
+            (defaults to the number of calls)
+
+    Returns:
+        Score metadata plus invalid_moves, and trajectory if requested. Each
+        trajectory step is (call_index, direction, valid, x, y, orientation,
+        move_count, distance_to_goal) after the call.
+    """
+    state = MazeState(
+        grid=metadata["grid"],
+        start_pos=tuple(metadata["start_pos"]),
+        goal_pos=tuple(metadata["goal_pos"]),
+        optimal_path_length=metadata["optimal_path_length"],
+        max_steps=metadata["max_steps"],
+        variant=metadata["variant"],
+        transform_schedule=metadata.get("transform_schedule"),
+        transform_interval=metadata.get("transform_interval", 5),
+        view_radius=metadata.get("view_radius"),
+        **(limits or {})
+    )
+
+    legacy = state.variant == "non_stationary" and state.transform_schedule is None
+
+    success = False
+    invalid_moves = 0
+    trajectory = []
+    distances = distance_field(state.original_grid, state.goal_pos) if include_trajectory else None
+
+    for i, (name, result) in enumerate(calls):
+        visual = MOVE_TOOLS.get(name)
+        if visual is None:
+            continue
+
+        if legacy:
+            direction = legacy_visual_to_actual(state.orientation, visual)
+        else:
+            direction = state.translate_visual_to_actual(visual)
+        valid = state.is_valid_move(direction)
+        if valid:
+            state.make_move(direction)
+            if state.should_transform():
+                if state.transform_schedule is not None:
+                    state.apply_transformation()
+                else:
+                    state.orientation = _recover_orientation(state, _observed_view(result))
+            state.record_visit()
+        else:
+            state.record_invalid_move()
+            invalid_moves += 1
+
+        if include_trajectory:
+            x, y = state.current_position
+            trajectory.append((i, visual, valid, x, y, state.orientation,
+                               state.move_count, distances[y][x]))
+
+        if state.at_goal():
+            state.end_reason = "success"
+            success = True
+            break
+        if state.exceeded_max_steps():
+            state.end_reason = "max_steps"
+            break
+        if not valid and state.stalled():
+            state.end_reason = "stalled"
+            break
+        if valid and state.looping():
+            state.end_reason = "loop"
+            break
+        if valid and state.goal_out_of_reach():
+            state.end_reason = "goal_out_of_reach"
+            break
+
+    # The solver stops without a terminal result once the turn budget is spent
+    max_turns = metadata.get("max_turns")
+    if state.end_reason is None and max_turns is not None:
+        if (len(calls) if turns is None else turns) >= max_turns:
+            state.end_reason = "turn_limit"
+
+    replayed = score_metadata(success, state.move_count,
+                              metadata["optimal_path_length"],
+                              end_reason=state.end_reason or "message_limit")
+    replayed["invalid_moves"] = invalid_moves
+    if include_trajectory:
+        replayed["trajectory"] = trajectory
+    return replayed
+
+
+def _replay_job(job: dict) -> dict:
+    """Replay one extracted sample (process pool entry point)."""
+    result = {key: job[key] for key in ("sample_id", "epoch", "model", "variant")}
+    try:
+        result.update(simulate(job["metadata"], job["calls"], job["include_trajectory"],
+                               job.get("limits"), job.get("turns")))
+        result["error"] = None
+    except ReplayError as e:
+        result["error"] = str(e)
+    return result
+
+
+def load_replay_jobs(log_file: str, include_trajectory: bool = False) -> List[dict]:
+    """Read an eval log and extract everything needed to replay its samples.
+
+    Args:
+        log_file: Path to an Inspect eval log
+        include_trajectory: Request per-step records from the replay
+
+    Returns:
+        List of picklable replay jobs
+    """
+    from inspect_ai.log import read_eval_log
+
+    log = read_eval_log(log_file)
+    task_args = log.eval.task_args or {}
+    limits = {key: task_args.get(key) for key in LIMIT_ARGS}
+    jobs = []
+    for sample in log.samples or []:
+        jobs.append({
+            "sample_id": sample.id,
+            "epoch": sample.epoch,
+            "model": log.eval.model,
+            "variant": sample.metadata.get("variant"),
+            "metadata": sample.metadata,
+            "calls": extract_tool_calls(sample.messages),
+            "turns": sum(1 for message in sample.messages if message.role == "assistant"),
+            "include_trajectory": include_trajectory,
+            "limits": limits,
+        })
+    return jobs
+
+
+def replay_jobs(jobs: List[dict], workers: Optional[int] = None,
+                chunksize: int = 256) -> List[dict]:
+    """Replay extracted samples, across a process pool when worthwhile.
+
+    Args:
+        jobs: Jobs from load_replay_jobs
+        workers: Number of worker processes (None = CPU count, 0 = in-process)
+        chunksize: Jobs sent to a worker at a time
+
+    Returns:
+        Replay results in job order
+    """
+    if workers == 0 or len(jobs) <= chunksize:
+        return [_replay_job(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_replay_job, jobs, chunksize=chunksize))
+
+
+def replay_logs(log_files: List[str], workers: Optional[int] = None,
+                include_trajectory: bool = False) -> List[dict]:
+    """Replay and re-score every sample in a set of eval logs.
+
+    Args:
+        log_files: Paths to Inspect eval logs
+        workers: Number of worker processes (None = CPU count, 0 = in-process)
+        include_trajectory: Include per-step records in the results
+
+    Returns:
+        One result per sample (see simulate), tagged with sample_id, epoch,
+        model, variant and error (None on success)
+    """
+    jobs = []
+    for log_file in log_files:
+        jobs.extend(load_replay_jobs(log_file, include_trajectory))
+    return replay_jobs(jobs, workers=workers)
+
+
+def summarize(results: List[dict]) -> Dict[Tuple[str, str], dict]:
+    """Aggregate replay results by (model, variant).
+
+    Args:
+        results: Results from replay_logs
+
+    Returns:
+        Dictionary mapping (model, variant) -> summary statistics
+    """
+    summary: Dict[Tuple[str, str], dict] = {}
+    for result in results:
+        entry = summary.setdefault((result["model"], result["variant"]), {
+            "samples": 0, "errors": 0, "successes": 0, "efficiency_sum": 0.0
+        })
+        entry["samples"] += 1
+        if result["error"]:
+            entry["errors"] += 1
+            continue
+        if result["success"]:
+            entry["successes"] += 1
+            entry["efficiency_sum"] += result["efficiency"]
+
+    for entry in summary.values():
+        replayed = entry["samples"] - entry["errors"]
+        entry["success_rate"] = entry["successes"] / replayed if replayed else 0.0
+        entry["avg_efficiency"] = (
+            entry["efficiency_sum"] / entry["successes"] if entry["successes"] else 0.0
+        )
+        del entry["efficiency_sum"]
+    return summary
@@ -0,0 +1,138 @@
+"""Difficulty-feature index and stratified sampling of maze instances."""
+
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from rotating_maze.maze import generate_maze_instance
+
+
+FEATURE_NAMES = (
+    "optimal_length",
+    "dead_ends",
+    "branching_factor",
+    "decision_points",
+    "turns",
+)
+
+
+def instance_rng(seed: Optional[int], index: int) -> Optional[random.Random]:
+    """Get the random number generator for one instance of a seeded dataset.
+
+    Each instance gets its own generator so that instance i is the same no
+    matter which other instances are generated alongside it.
+
+    Args:
+        seed: Base seed (None for the global RNG)
+        index: Instance index
+
+    Returns:
+        Seeded generator, or None to use the global RNG
+    """
+    return random.Random(f"{seed}:{index}") if seed is not None else None
+
+
+def build_maze_index(pool_size: int, size_range: Tuple[int, int] = (12, 18),
+                     variant: str = "stationary", seed: Optional[int] = None,
+                     **instance_args) -> List[dict]:
+    """Generate a pool of maze instances with their difficulty features.
+
+    Generation is cheap compared to running a model, so the pool can be
+    several times larger than the number of samples finally drawn from it.
+
+    Args:
+        pool_size: Number of maze instances to generate
+        size_range: (min_size, max_size) for maze dimensions
+        variant: "stationary" or "non_stationary"
+        seed: Base seed; instance i is generated from instance_rng(seed, i)
+        **instance_args: Further generate_maze_instance arguments (budgets,
+            transform interval, observation)
+
+    Returns:
+        List of maze instances (as from generate_maze_instance), each
+        with a "features" dictionary
+    """
+    return [
+        generate_maze_instance(size_range=size_range, variant=variant,
+                               rng=instance_rng(seed, i), **instance_args)
+        for i in range(pool_size)
+    ]
+
+
+def assign_strata(index: List[dict], feature: str, num_strata: int) -> List[int]:
+    """Bin instances into strata by quantiles of a feature.
+
+    Args:
+        index: Maze instances with "features"
+        feature: Feature to stratify on (one of FEATURE_NAMES)
+        num_strata: Number of strata
+
+    Returns:
+        Stratum number (0 = easiest) for each instance in index
+    """
+    if feature not in FEATURE_NAMES:
+        raise ValueError(f"Unknown feature '{feature}'. Expected one of {FEATURE_NAMES}")
+
+    # Rank-based quantiles so that ties never leave a stratum empty
+    # when there are enough instances
+    order = sorted(range(len(index)), key=lambda i: index[i]["features"][feature])
+    strata = [0] * len(index)
+    for rank, i in enumerate(order):
+        strata[i] = min(rank * num_strata // max(len(index), 1), num_strata - 1)
+    return strata
+
+
+def stratified_sample(index: List[dict], num_samples: int, feature: str = "optimal_length",
+                      num_strata: int = 3, weights: Optional[Sequence[float]] = None,
+                      rng: Optional[random.Random] = None) -> List[dict]:
+    """Draw a quota-balanced sample of instances from an index.
+
+    Each stratum gets a quota proportional to its weight (equal by default).
+    If a stratum runs out of instances, the shortfall is filled from the
+    remaining strata.
+
+    Args:
+        index: Maze instances with "features"
+        num_samples: Number of instances to draw
+        feature: Feature to stratify on (one of FEATURE_NAMES)
+        num_strata: Number of strata
+        weights: Relative share of each stratum (length num_strata)
+        rng: Random number generator (defaults to the global one)
+
+    Returns:
+        List of selected instances, each with a "stratum" key added
+    """
+    rng = rng or random.Random()
+    if num_samples > len(index):
+        raise ValueError(f"Cannot draw {num_samples} samples from an index of {len(index)}")
+
+    weights = list(weights) if weights is not None else [1.0] * num_strata
+    if len(weights) != num_strata:
+        raise ValueError(f"Expected {num_strata} weights, got {len(weights)}")
+
+    strata = assign_strata(index, feature, num_strata)
+    buckets: Dict[int, List[int]] = {s: [] for s in range(num_strata)}
+    for i, s in enumerate(strata):
+        buckets[s].append(i)
+    for bucket in buckets.values():
+        rng.shuffle(bucket)
+
+    # Largest-remainder allocation of the quotas
+    total = sum(weights)
+    exact = [num_samples * w / total for w in weights]
+    quotas = [int(q) for q in exact]
+    by_remainder = sorted(range(num_strata), key=lambda s: exact[s] - quotas[s], reverse=True)
+    for s in by_remainder[:num_samples - sum(quotas)]:
+        quotas[s] += 1
+
+    selected = []
+    for s in range(num_strata):
+        take = min(quotas[s], len(buckets[s]))
+        selected.extend(buckets[s][:take])
+        buckets[s] = buckets[s][take:]
+
+    # Fill any shortfall from whatever is left
+    leftover = [i for s in range(num_strata) for i in buckets[s]]
+    rng.shuffle(leftover)
+    selected.extend(leftover[:num_samples - len(selected)])
+
+    return [dict(index[i], stratum=strata[i]) for i in selected]
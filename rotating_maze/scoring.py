@@ -0,0 +1,33 @@
+"""Score computation shared by the live scorer and offline replay."""
+
+from typing import Optional
+
+
+def score_metadata(success: bool, steps_taken: int, optimal_steps: int,
+                   end_reason: Optional[str] = None) -> dict:
+    """Compute the per-sample score metadata.
+
+    Args:
+        success: Whether the goal was reached within max_steps
+        steps_taken: Number of (valid) moves made
+        optimal_steps: Optimal path length
+        end_reason: Why the episode ended ("success", "max_steps",
+            "goal_out_of_reach", "loop", "stalled", "turn_limit" or
+            "message_limit")
+
+    Returns:
+        Dictionary with success, steps_taken, optimal_steps, efficiency and
+        end_reason
+    """
+    if success:
+        efficiency = optimal_steps / steps_taken if steps_taken > 0 else 0
+    else:
+        efficiency = 0.0
+
+    return {
+        "success": success,
+        "steps_taken": steps_taken,
+        "optimal_steps": optimal_steps,
+        "efficiency": efficiency,
+        "end_reason": end_reason
+    }
@@ -0,0 +1,164 @@
+"""Sequential early stopping for Rotating Maze runs.
+
+Instead of running all samples up front, samples are dispatched in batches
+and the success rate of each variant is re-estimated after every batch.
+Dispatching stops as soon as every variant's confidence interval is narrower
+than the precision target, which for clearly strong or weak models takes far
+fewer samples than a full run.
+
+Batches are drawn from the same seeded dataset, so the samples a stopped run
+has seen are exactly the first samples of the corresponding full run.
+"""
+
+import math
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+
+def wilson_interval(successes: int, n: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """Wilson score interval for a success rate.
+
+    Unlike the normal approximation it stays inside [0, 1] and does not
+    collapse to zero width when every sample succeeds (or fails).
+
+    Args:
+        successes: Number of successful samples
+        n: Number of samples
+        confidence: Two-sided confidence level
+
+    Returns:
+        (low, high) bounds; (0.0, 1.0) when there are no samples
+    """
+    if n == 0:
+        return 0.0, 1.0
+
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    p = successes / n
+    denominator = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def precision_reached(tallies: Dict[str, List[int]], half_width: float,
+                      confidence: float = 0.95, min_samples: int = 20) -> bool:
+    """Check whether every variant's success rate is pinned down.
+
+    Args:
+        tallies: Mapping variant -> [successes, samples]
+        half_width: Target half-width of the confidence interval
+        confidence: Two-sided confidence level
+        min_samples: Samples required per variant before stopping
+
+    Returns:
+        True if all variants have enough samples and a narrow enough interval
+    """
+    if not tallies:
+        return False
+
+    for successes, n in tallies.values():
+        low, high = wilson_interval(successes, n, confidence)
+        if n < min_samples or (high - low) / 2 > half_width:
+            return False
+    return True
+
+
+def sample_solved(sample) -> bool:
+    """Check whether a logged sample solved its maze.
+
+    Samples that errored (kept in the log with fail_on_error=False or a
+    fraction) have no scores and count as failures: the maze wasn't solved,
+    and leaving them out would make flaky runs look better.
+
+    Args:
+        sample: EvalSample from a log
+
+    Returns:
+        True if the maze scorer scored the sample as a success
+    """
+    score = (sample.scores or {}).get("maze_scorer")
+    return sample.error is None and score is not None and score.as_float() == 1.0
+
+
+def sample_ids(variant: str, start: int, stop: int) -> List[str]:
+    """Get the sample ids of dataset instances start..stop.
+
+    Args:
+        variant: Task variant ("paired" covers both variants of each maze)
+        start: First instance index
+        stop: Index after the last instance
+
+    Returns:
+        Sample ids as created by create_dataset
+    """
+    variants = ["stationary", "non_stationary"] if variant == "paired" else [variant]
+    return [f"maze_{v}_{i}" for i in range(start, stop) for v in variants]
+
+
+def run_sequential(model: str, variant: str = "non_stationary", max_samples: int = 200,
+                   batch_size: int = 10, half_width: float = 0.1,
+                   confidence: float = 0.95, min_samples: int = 20, seed: int = 0,
+                   task_args: Optional[dict] = None, **eval_args) -> dict:
+    """Run the eval in batches until the success rate has converged.
+
+    Args:
+        model: Model to evaluate
+        variant: Task variant (see rotating_maze)
+        max_samples: Maze instances to run at most (the full run size)
+        batch_size: Maze instances dispatched per batch
+        half_width: Target half-width of the confidence interval
+        confidence: Two-sided confidence level
+        min_samples: Samples required per variant before stopping
+        seed: Dataset seed (batches must come from the same dataset)
+        task_args: Further rotating_maze task arguments
+        **eval_args: Arguments passed on to inspect_ai.eval for every batch
+            (log_dir, display, max_connections, ...)
+
+    Returns:
+        Dictionary with stopped_early, instances run, and per-variant
+        successes, samples, errors (errored samples, counted as failures,
+        see sample_solved), success_rate and interval
+    """
+    from inspect_ai import eval
+
+    from rotating_maze.task import rotating_maze
+
+    task = rotating_maze(variant=variant, num_instances=max_samples, seed=seed,
+                         **(task_args or {}))
+    tallies: Dict[str, List[int]] = {}
+    errors: Dict[str, int] = {}
+    run = 0
+
+    while run < max_samples:
+        stop = min(run + batch_size, max_samples)
+        logs = eval(task, model=model, sample_id=sample_ids(variant, run, stop),
+                    **eval_args)
+        run = stop
+
+        for log in logs:
+            if log.status != "success":
+                raise RuntimeError(f"Batch ending at instance {stop} failed: {log.error}")
+            for sample in log.samples or []:
+                variant_name = sample.metadata["variant"]
+                tally = tallies.setdefault(variant_name, [0, 0])
+                tally[0] += int(sample_solved(sample))
+                tally[1] += 1
+                errors[variant_name] = errors.get(variant_name, 0) + int(sample.error is not None)
+
+        if precision_reached(tallies, half_width, confidence, min_samples):
+            break
+
+    return {
+        "stopped_early": run < max_samples,
+        "instances": run,
+        "variants": {
+            v: {
+                "successes": successes,
+                "samples": n,
+                "errors": errors.get(v, 0),
+                "success_rate": successes / n if n else 0.0,
+                "interval": wilson_interval(successes, n, confidence),
+            }
+            for v, (successes, n) in tallies.items()
+        },
+    }
@@ -0,0 +1,188 @@
+"""Deterministic sharding of seeded datasets across machines.
+
+A seeded dataset is fully determined by its task args, so a large run can be
+split into shards that are run independently (on different machines, or at
+different times): shard k of n runs the maze indices k, k + n, k + 2n, ...
+Every shard keeps the global maze index in its sample ids, so the shards of
+a run are disjoint, together cover the whole dataset, and both variants of a
+paired maze always land in the same shard.
+
+check_coverage groups shard logs back into runs and reports missing shards,
+missing or duplicated samples and errored samples. merge_shards writes the
+shards of one run as a single log, with metrics recomputed over all samples,
+that the usual analysis scripts can read like an unsharded run.
+"""
+
+from collections import Counter, defaultdict
+from typing import Dict, List, Sequence
+
+from rotating_maze.sequential import sample_ids
+
+
+# Task args that select a shard rather than define the dataset
+SHARD_ARGS = ("shard_index", "num_shards")
+
+# Task args that may differ between the shards of one run
+_RUN_LOCAL_ARGS = SHARD_ARGS + ("checkpoint_every", "checkpoint_dir", "render_offload_size")
+
+
+def shard_indices(num_instances: int, shard_index: int = 0, num_shards: int = 1) -> range:
+    """Get the maze indices that belong to a shard.
+
+    Args:
+        num_instances: Number of maze instances in the whole dataset
+        shard_index: Shard to select (0-based)
+        num_shards: Number of shards the dataset is split into
+
+    Returns:
+        Range of maze indices in the shard
+    """
+    if num_shards < 1:
+        raise ValueError(f"num_shards must be at least 1, got {num_shards}")
+    if not 0 <= shard_index < num_shards:
+        raise ValueError(f"shard_index must be in [0, {num_shards}), got {shard_index}")
+    return range(shard_index, num_instances, num_shards)
+
+
+def _run_key(log) -> tuple:
+    """Key identifying the run a shard log belongs to (model and dataset args)."""
+    args = {k: v for k, v in (log.eval.task_args or {}).items() if k not in _RUN_LOCAL_ARGS}
+    return (log.eval.model, tuple(sorted((k, repr(v)) for k, v in args.items())))
+
+
+def _sample_order(sample_id: str) -> tuple:
+    """Sort key putting sample ids in dataset order (maze index, then variant)."""
+    variant, _, index = str(sample_id)[len("maze_"):].rpartition("_")
+    return int(index), variant != "stationary"
+
+
+def _key_order(key: tuple) -> tuple:
+    """Sort key for (sample id, epoch) pairs, in dataset order."""
+    sample_id, epoch = key
+    return _sample_order(sample_id), epoch
+
+
+def check_coverage(log_files: Sequence[str]) -> List[dict]:
+    """Check that the shard logs of each run cover its whole dataset.
+
+    Logs are grouped into runs by model and task args (other than the shard
+    args), so a directory may hold the shards of several runs. Each sample
+    is expected once per epoch.
+
+    Args:
+        log_files: Paths to shard eval logs
+
+    Returns:
+        One dictionary per run with model, task_args, num_shards, epochs,
+        log_files (by shard index), missing_shards, and missing_samples,
+        duplicate_samples and errored_samples as (sample id, epoch) pairs,
+        and complete (all shards present, every sample exactly once per
+        epoch and none errored)
+    """
+    from inspect_ai.log import read_eval_log, read_eval_log_sample_summaries
+
+    runs: Dict[tuple, List[tuple]] = defaultdict(list)
+    for log_file in log_files:
+        log = read_eval_log(log_file, header_only=True)
+        runs[_run_key(log)].append((log_file, log))
+
+    reports = []
+    for shards in runs.values():
+        task_args = shards[0][1].eval.task_args or {}
+        num_shards = task_args.get("num_shards", 1)
+        variant = task_args.get("variant", "stationary")
+        num_instances = task_args.get("num_instances", 0)
+        epochs = shards[0][1].eval.config.epochs or 1
+
+        files = defaultdict(list)
+        counts = Counter()
+        errored = []
+        for log_file, log in shards:
+            files[log.eval.task_args.get("shard_index", 0)].append(log_file)
+            for summary in read_eval_log_sample_summaries(log_file):
+                key = (str(summary.id), summary.epoch)
+                counts[key] += 1
+                if summary.error:
+                    errored.append(key)
+
+        first = task_args.get("first_instance", 0)
+        # Inspect numbers epochs from 1
+        expected = [(sample_id, epoch) for sample_id in sample_ids(variant, first, num_instances)
+                    for epoch in range(1, epochs + 1)]
+        missing_shards = [k for k in range(num_shards) if k not in files]
+        missing = [key for key in expected if counts[key] == 0]
+        duplicates = sorted((key for key, n in counts.items() if n > 1), key=_key_order)
+
+        reports.append({
+            "model": shards[0][1].eval.model,
+            "task_args": {k: v for k, v in task_args.items() if k not in _RUN_LOCAL_ARGS},
+            "num_shards": num_shards,
+            "epochs": epochs,
+            "log_files": dict(sorted(files.items())),
+            "missing_shards": missing_shards,
+            "missing_samples": missing,
+            "duplicate_samples": duplicates,
+            "errored_samples": sorted(errored, key=_key_order),
+            "complete": not (missing_shards or missing or duplicates or errored),
+        })
+    return reports
+
+
+def merge_shards(log_files: Sequence[str], output_file: str) -> dict:
+    """Merge the shard logs of one run into a single log.
+
+    Samples are put back in dataset order, the task args are those of an
+    unsharded run, token usage is summed over the shards and the metrics are
+    recomputed over all samples. The merged shard indices and source logs
+    are recorded in the log's metadata under "merged_shards".
+
+    Args:
+        log_files: Paths to the shard logs of one run
+        output_file: Where to write the merged log
+
+    Returns:
+        Dictionary with the number of shards and samples merged
+    """
+    from inspect_ai.log import read_eval_log, recompute_metrics, write_eval_log
+
+    # Imported for its side effect only: recompute_metrics looks the scorer
+    # and its metrics up in inspect's registry, which importing them fills.
+    # Imported here as the task module itself imports shard_indices.
+    from rotating_maze.task import maze_scorer, paired_difference  # noqa: F401
+
+    shards = sorted(((read_eval_log(log_file), str(log_file)) for log_file in log_files),
+                    key=lambda shard: shard[0].eval.task_args.get("shard_index", 0))
+    logs = [log for log, _ in shards]
+    if len({_run_key(log) for log in logs}) > 1:
+        raise ValueError("Logs belong to different runs (model or task args differ)")
+
+    merged = logs[0].model_copy(deep=True)
+    samples = [sample for log in logs for sample in log.samples or []]
+    samples.sort(key=lambda sample: (_sample_order(sample.id), sample.epoch))
+    merged.samples = samples
+
+    merged.eval.task_args = {**merged.eval.task_args, "shard_index": 0, "num_shards": 1}
+    merged.eval.metadata = {
+        **(merged.eval.metadata or {}),
+        "merged_shards": {
+            "shard_indices": [log.eval.task_args.get("shard_index", 0) for log in logs],
+            "log_files": [log_file for _, log_file in shards],
+        },
+    }
+    sample_order = list(dict.fromkeys(sample.id for sample in samples))
+    merged.eval.dataset.samples = len(sample_order)
+    merged.eval.dataset.sample_ids = sample_order
+
+    model_usage = {}
+    for log in logs:
+        for model, usage in log.stats.model_usage.items():
+            model_usage[model] = model_usage[model] + usage if model in model_usage else usage
+    merged.stats.model_usage = model_usage
+    merged.stats.started_at = min(log.stats.started_at for log in logs)
+    merged.stats.completed_at = max(log.stats.completed_at for log in logs)
+    if any(log.status != "success" for log in logs):
+        merged.status = "error"
+
+    recompute_metrics(merged)
+    write_eval_log(merged, output_file)
+    return {"shards": len(logs), "samples": len(samples)}
@@ -0,0 +1,191 @@
+"""Eval log slimming: replace maze renderings with reconstructible references.
+
+Every tool result (and the first user message) embeds a full ASCII maze, so
+logs of long runs on large mazes are dominated by renderings of the same
+grid. A rendering is fully determined by the grid, the player position and
+the view orientation, so it can be replaced by a short reference such as
+``[[maze_view x=3 y=5 orientation=2]]`` and rendered again on demand.
+
+A view is only replaced if rendering the reference reproduces it exactly,
+so expanding a slimmed log gives back the original text.
+
+A windowed view always has the player at its centre, so the position can't
+be read off the view. Windowed views are matched against the states the
+sample was actually in (the start and the step records under maze_steps)
+instead; views that match none of them are left as they are.
+"""
+
+import re
+from typing import Callable, Dict, List, Optional
+
+from rotating_maze.maze import MazeState
+from rotating_maze.tools import MAZE_STEPS_KEY
+
+
+VIEW_REF_PATTERN = re.compile(r"\[\[maze_view x=(\d+) y=(\d+) orientation=(\d)\]\]")
+
+
+class ViewCodec:
+    """Encodes a sample's maze views as references and renders them back."""
+
+    def __init__(self, metadata: dict, steps: Optional[List[dict]] = None):
+        """Initialize the codec.
+
+        Args:
+            metadata: Sample metadata (grid, start_pos, goal_pos, ...)
+            steps: The sample's step records (needed to encode windowed views)
+        """
+        grid = metadata["grid"]
+        self.state = MazeState(
+            grid=grid,
+            start_pos=tuple(metadata["start_pos"]),
+            goal_pos=tuple(metadata["goal_pos"]),
+            optimal_path_length=metadata["optimal_path_length"],
+            max_steps=metadata["max_steps"],
+            view_radius=metadata.get("view_radius"),
+        )
+        self.sources = []
+        self.windows: Dict[str, str] = {}
+        if self.state.view_radius is None:
+            # Where each view cell comes from in the grid, per orientation
+            coords = [[(x, y) for x in range(len(grid[0]))] for y in range(len(grid))]
+            for orientation in range(8):
+                self.state.orientation = orientation
+                self.sources.append(self.state._apply_transformations(coords))
+        else:
+            # Window of every state the sample was in, by rendered text
+            x, y = self.state.start_pos
+            visited = [(x, y, orientation) for orientation in range(8)]
+            visited += [(s["x"], s["y"], s["orientation"]) for s in steps or []]
+            for x, y, orientation in dict.fromkeys(visited):
+                self.windows.setdefault(self.render(x, y, orientation),
+                                        f"[[maze_view x={x} y={y} orientation={orientation}]]")
+        # Model event inputs repeat every earlier message, so memoize
+        self._encoded: Dict[str, str] = {}
+        self._decoded: Dict[str, str] = {}
+
+    def render(self, x: int, y: int, orientation: int) -> str:
+        """Render the view with the player at (x, y) in an orientation."""
+        self.state.current_position = (x, y)
+        self.state.orientation = orientation
+        return self.state.get_view()
+
+    def identify(self, view: str) -> Optional[str]:
+        """Find the reference that renders exactly to a view.
+
+        Args:
+            view: Maze view text
+
+        Returns:
+            Reference string, or None if no state renders to the view
+        """
+        if self.state.view_radius is not None:
+            return self.windows.get(view)
+
+        rows = view.split("\n")
+        player = next(((vx, vy) for vy, row in enumerate(rows)
+                       for vx, ch in enumerate(row) if ch == "P"), None)
+        if player is None:
+            return None
+
+        vx, vy = player
+        for orientation, source in enumerate(self.sources):
+            if vy >= len(source) or vx >= len(source[vy]):
+                continue
+            x, y = source[vy][vx]
+            if self.render(x, y, orientation) == view:
+                return f"[[maze_view x={x} y={y} orientation={orientation}]]"
+        return None
+
+    def encode(self, text: str) -> str:
+        """Replace the maze view at the end of a text with a reference.
+
+        Args:
+            text: Message text ("<status>\\n\\n<view>")
+
+        Returns:
+            Text with the view replaced, or the text unchanged
+        """
+        if text in self._encoded:
+            return self._encoded[text]
+
+        encoded = text
+        head, sep, view = text.rpartition("\n\n")
+        # Full views start with the border; windows may start anywhere
+        if sep and (view.startswith("#") or self.state.view_radius is not None):
+            reference = self.identify(view)
+            if reference is not None:
+                encoded = head + sep + reference
+        self._encoded[text] = encoded
+        return encoded
+
+    def decode(self, text: str) -> str:
+        """Render every view reference in a text back to the maze view."""
+        if "[[maze_view" not in text:
+            return text
+        if text not in self._decoded:
+            self._decoded[text] = VIEW_REF_PATTERN.sub(
+                lambda m: self.render(int(m.group(1)), int(m.group(2)), int(m.group(3))), text
+            )
+        return self._decoded[text]
+
+
+def _map_strings(value, fn: Callable[[str], str]):
+    """Apply fn to every string in a nested structure of dicts and lists."""
+    if isinstance(value, str):
+        return fn(value)
+    if isinstance(value, list):
+        return [_map_strings(item, fn) for item in value]
+    if isinstance(value, dict):
+        return {key: _map_strings(item, fn) for key, item in value.items()}
+    return value
+
+
+def _transform_log(log_file: str, output_file: str, slim: bool) -> dict:
+    """Slim or expand every maze sample in a log and write the result."""
+    from inspect_ai.log import EvalSample, read_eval_log, write_eval_log
+
+    log = read_eval_log(log_file)
+    samples = []
+    for sample in log.samples or []:
+        if "grid" not in (sample.metadata or {}):
+            samples.append(sample)
+            continue
+
+        codec = ViewCodec(sample.metadata, (sample.store or {}).get(MAZE_STEPS_KEY))
+        data = sample.model_dump()
+        # Metadata holds the grid the references are rendered from
+        metadata = data.pop("metadata")
+        data = _map_strings(data, codec.encode if slim else codec.decode)
+        data["metadata"] = metadata
+        samples.append(EvalSample.model_validate(data))
+
+    log.samples = samples
+    write_eval_log(log, output_file)
+    return {"samples": len(samples)}
+
+
+def slim_log(log_file: str, output_file: str) -> dict:
+    """Write a copy of an eval log with maze views replaced by references.
+
+    Args:
+        log_file: Path to an Inspect eval log
+        output_file: Where to write the slimmed log
+
+    Returns:
+        Dictionary with the number of samples processed
+    """
+    return _transform_log(log_file, output_file, slim=True)
+
+
+def expand_log(log_file: str, output_file: str) -> dict:
+    """Write a copy of a slimmed eval log with the maze views rendered back.
+
+    Args:
+        log_file: Path to a slimmed eval log
+        output_file: Where to write the expanded log
+
+    Returns:
+        Dictionary with the number of samples processed
+    """
+    return _transform_log(log_file, output_file, slim=False)
@@ -0,0 +1,134 @@
+"""Adaptive staircase over maze size.
+
+Rather than spreading samples uniformly over a fixed size range, the
+staircase runs small batches of mazes at one size and moves the size up
+after a mostly successful batch and down after a mostly failed one. The
+step size halves at every reversal of direction, so the sizes tried settle
+around the size at which the model succeeds half of the time. That
+threshold is estimated from the sizes at the reversals.
+"""
+
+from typing import List, Optional, Tuple
+
+
+class Staircase:
+    """Up/down staircase on (odd) maze sizes targeting 50% success."""
+
+    def __init__(self, start_size: int = 15, min_size: int = 5, max_size: int = 61,
+                 initial_step: int = 8, min_step: int = 2):
+        """Initialize the staircase.
+
+        Args:
+            start_size: Size of the first batch
+            min_size: Smallest size to try
+            max_size: Largest size to try
+            initial_step: Size change before the first reversal
+            min_step: Smallest size change (steps are kept even so that
+                sizes stay odd)
+        """
+        self.min_size = min_size | 1
+        self.max_size = max_size | 1
+        self.size = min(max(start_size | 1, self.min_size), self.max_size)
+        self.step = max(initial_step // 2 * 2, 2)
+        self.min_step = max(min_step // 2 * 2, 2)
+        self.direction = 0  # +1 after moving up, -1 after moving down
+        self.reversals: List[int] = []
+        self.history: List[Tuple[int, int, int]] = []
+
+    def update(self, successes: int, n: int):
+        """Record a batch at the current size and choose the next size.
+
+        Args:
+            successes: Successful samples in the batch
+            n: Samples in the batch
+        """
+        self.history.append((self.size, successes, n))
+
+        # Ties keep the size: the batch sat right at the threshold
+        if 2 * successes == n:
+            return
+        direction = 1 if 2 * successes > n else -1
+
+        if self.direction and direction != self.direction:
+            self.reversals.append(self.size)
+            self.step = max(self.step // 4 * 2, self.min_step)
+        self.direction = direction
+        self.size = min(max(self.size + direction * self.step, self.min_size), self.max_size)
+
+    def threshold(self, last: int = 6) -> float:
+        """Estimate the 50%-success size.
+
+        Args:
+            last: Number of most recent reversals to average
+
+        Returns:
+            Mean size at the last reversals (the current size before any
+            reversal has happened)
+        """
+        if not self.reversals:
+            return float(self.size)
+        recent = self.reversals[-last:]
+        return sum(recent) / len(recent)
+
+
+def run_staircase(model: str, variant: str = "non_stationary", trials: int = 20,
+                  batch_size: int = 4, max_reversals: int = 8, seed: int = 0,
+                  staircase: Optional[Staircase] = None,
+                  task_args: Optional[dict] = None, **eval_args) -> dict:
+    """Find a model's 50%-success maze size with an adaptive staircase.
+
+    Args:
+        model: Model to evaluate
+        variant: "stationary" or "non_stationary"
+        trials: Maximum number of batches
+        batch_size: Mazes per batch
+        max_reversals: Stop after this many reversals
+        seed: Dataset seed; every batch uses fresh maze indices
+        staircase: Staircase to drive (defaults to Staircase())
+        task_args: Further rotating_maze task arguments
+        **eval_args: Arguments passed on to inspect_ai.eval for every batch
+
+    Returns:
+        Dictionary with threshold, samples, errors (errored samples, counted
+        as failures, see sample_solved), reversals and history (size,
+        successes, samples per batch)
+    """
+    from inspect_ai import eval
+
+    from rotating_maze.sequential import sample_solved
+    from rotating_maze.task import rotating_maze
+
+    if variant == "paired":
+        raise ValueError("The staircase needs a single variant, not 'paired'")
+
+    staircase = staircase or Staircase()
+    errors = 0
+    for trial in range(trials):
+        # Maze i comes from instance_rng(seed, i), so only this trial's
+        # mazes are generated
+        start, stop = trial * batch_size, (trial + 1) * batch_size
+        task = rotating_maze(variant=variant, num_instances=stop, seed=seed,
+                             size_range=(staircase.size, staircase.size),
+                             first_instance=start, **(task_args or {}))
+        logs = eval(task, model=model, **eval_args)
+
+        successes, n = 0, 0
+        for log in logs:
+            if log.status != "success":
+                raise RuntimeError(f"Staircase trial {trial} failed: {log.error}")
+            for sample in log.samples or []:
+                successes += int(sample_solved(sample))
+                errors += int(sample.error is not None)
+                n += 1
+
+        staircase.update(successes, n)
+        if len(staircase.reversals) >= max_reversals:
+            break
+
+    return {
+        "threshold": staircase.threshold(),
+        "samples": sum(n for _, _, n in staircase.history),
+        "errors": errors,
+        "reversals": staircase.reversals,
+        "history": staircase.history,
+    }
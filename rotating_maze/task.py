@@ -1,29 +1,66 @@
 """Rotating Maze evaluation task for Inspect AI."""
 
+import math
+import random
 import re
 import sys
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 # Add parent directory to path for imports
 parent_dir = str(Path(__file__).parent.parent)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
+import anyio
 from inspect_ai import Task, task
 from inspect_ai.dataset import Sample, MemoryDataset
-from inspect_ai.scorer import Score, Scorer, accuracy, mean, scorer
+from inspect_ai.scorer import (
+    Metric, SampleScore, Score, Scorer, Value, accuracy, mean, metric, scorer
+)
 from inspect_ai.solver import TaskState, generate, use_tools, solver
-from inspect_ai.model import ChatMessageUser
+from inspect_ai.model import ChatMessageSystem, ChatMessageTool, ChatMessageUser, ContentText
+from inspect_ai.util import LimitExceededError
 
-from rotating_maze.maze import generate_maze_instance, MazeState
-from rotating_maze.tools import create_movement_tools
+from rotating_maze.cache import response_cache_policy
+from rotating_maze.checkpoint import (
+    DEFAULT_CHECKPOINT_DIR, SampleCheckpoint, checkpoint_key, resume_enabled
+)
+from rotating_maze.maze import DEFAULT_VIEW_RADIUS, generate_maze_instance, is_maze_view, MazeState
+from rotating_maze.sampling import build_maze_index, instance_rng, stratified_sample
+from rotating_maze.scoring import score_metadata
+from rotating_maze.shards import shard_indices
+from rotating_maze.tools import (
+    MAZE_END_REASON_KEY, MAZE_MOVE_COUNT_KEY, MOVEMENT_TOOLS, MazeEpisode,
+    save_episode, start_episode
+)
 
 
-def create_system_message(variant: str) -> str:
+# Variants emitted for every maze in paired mode
+PAIRED_VARIANTS = ["stationary", "non_stationary"]
+
+# Tool calls allowed per step of the step budget: every move may come with
+# one failed (invalid) attempt
+TURNS_PER_STEP = 2
+
+# Smallest maze (width/height) whose steps run off the event loop. Full
+# views of larger mazes take milliseconds to render, windowed views stay
+# cheap but the first goal-distance BFS still grows with the maze.
+DEFAULT_RENDER_OFFLOAD_SIZE = 61
+
+# Sample store key recording where an interrupted sample was resumed
+MAZE_RESUME_KEY = "maze_resumed"
+
+# Stands in for maze views that a later tool result has superseded
+COMPACTED_VIEW_PLACEHOLDER = "[maze view omitted - see the latest view below]"
+
+
+def create_system_message(variant: str, view_radius: Optional[int] = None) -> str:
     """Create system message based on variant.
 
     Args:
         variant: "stationary" or "non_stationary"
+        view_radius: Window radius if the agent only sees part of the maze
 
     Returns:
         System message string
@@ -40,6 +77,11 @@ Legend:
 Available actions: move_up, move_down, move_left, move_right
 - These move you relative to the current view
 
+"""
+
+    if view_radius is not None:
+        base_message += f"""You only see the part of the maze within {view_radius} cells of your position; anything beyond the edge of the maze is shown as wall. The line above each view gives the goal's offset from you in that view.
+
 """
 
     if variant == "non_stationary":
@@ -52,6 +94,48 @@ Available actions: move_up, move_down, move_left, move_right
     return base_message
 
 
+@metric
+def paired_difference() -> Metric:
+    """Mean paired success difference (stationary - non_stationary).
+
+    Scores are matched on pair_id, so each difference compares a model on
+    the same maze with and without transformations. Unpaired scores are
+    ignored.
+
+    Returns:
+        Metric returning success_diff, its standard error and the number of
+        complete pairs
+    """
+
+    def compute(scores: List[SampleScore]) -> Value:
+        pairs: Dict[int, Dict[str, float]] = {}
+        for sample_score in scores:
+            metadata = sample_score.score.metadata or {}
+            if metadata.get("pair_id") is None:
+                continue
+            pair = pairs.setdefault(metadata["pair_id"], {})
+            pair[metadata["variant"]] = sample_score.score.as_float()
+
+        diffs = [
+            pair["stationary"] - pair["non_stationary"]
+            for pair in pairs.values()
+            if "stationary" in pair and "non_stationary" in pair
+        ]
+        n = len(diffs)
+        if n == 0:
+            return {"success_diff": 0.0, "success_diff_stderr": 0.0, "pairs": 0}
+
+        mean_diff = sum(diffs) / n
+        variance = sum((d - mean_diff) ** 2 for d in diffs) / (n - 1) if n > 1 else 0.0
+        return {
+            "success_diff": mean_diff,
+            "success_diff_stderr": math.sqrt(variance / n),
+            "pairs": n,
+        }
+
+    return compute
+
+
 @scorer(metrics=[accuracy(), mean()])
 def maze_scorer():
     """Score maze navigation attempts."""
@@ -91,78 +175,248 @@ def maze_scorer():
 
         optimal_steps = state.metadata.get("optimal_path_length", 0)
 
-        if success:
-            efficiency = optimal_steps / steps_taken if steps_taken > 0 else 0
-            return Score(
-                value=1.0,
-                answer=final_output,
-                metadata={
-                    "success": True,
-                    "steps_taken": steps_taken,
-                    "optimal_steps": optimal_steps,
-                    "efficiency": efficiency
-                }
-            )
-        else:
-            return Score(
-                value=0.0,
-                answer=final_output,
-                metadata={
-                    "success": False,
-                    "steps_taken": steps_taken,
-                    "optimal_steps": optimal_steps,
-                    "efficiency": 0.0
-                }
-            )
+        # Samples without a terminal tool result ran into the message limit
+        end_reason = state.store.get(MAZE_END_REASON_KEY)
+        if state.store.get(MAZE_MOVE_COUNT_KEY) is not None:
+            steps_taken = state.store.get(MAZE_MOVE_COUNT_KEY)
+
+        metadata = score_metadata(success, steps_taken, optimal_steps,
+                                  end_reason=end_reason or "message_limit")
+        metadata["variant"] = state.metadata.get("variant")
+        metadata["pair_id"] = state.metadata.get("pair_id")
+
+        return Score(
+            value=1.0 if success else 0.0,
+            answer=final_output,
+            metadata=metadata
+        )
 
     return score
 
 
-def create_dataset(num_instances: int = 50, variant: str = "stationary") -> MemoryDataset:
+def create_dataset(num_instances: int = 50, variant: str = "stationary",
+                   cache_breakpoints: bool = False, stratify_by: Optional[str] = None,
+                   num_strata: int = 3, stratum_weights: Optional[List[float]] = None,
+                   pool_factor: int = 4, seed: Optional[int] = None,
+                   size_range: Tuple[int, int] = (12, 18),
+                   step_multiplier: float = 3, transform_interval: int = 5,
+                   observation: str = "auto",
+                   view_radius: int = DEFAULT_VIEW_RADIUS,
+                   shard_index: int = 0, num_shards: int = 1,
+                   first_instance: int = 0) -> MemoryDataset:
     """Create dataset of maze instances.
 
+    The instructions go in a system message that is identical for every
+    sample of a variant, so together with the (stable) tool definitions they
+    form a prefix that providers can cache. Only the maze itself goes in the
+    user message that follows.
+
     Args:
         num_instances: Number of maze instances to generate
-        variant: "stationary" or "non_stationary"
+        variant: "stationary", "non_stationary" or "paired" (every maze is
+            emitted once per variant, linked by pair_id)
+        cache_breakpoints: Mark the end of the shared system message as an
+            explicit cache breakpoint (for providers that support it)
+        stratify_by: Difficulty feature to balance the dataset on (see
+            rotating_maze.sampling.FEATURE_NAMES). None keeps whatever mazes
+            come out of the generator.
+        num_strata: Number of difficulty strata (quantiles of the pool)
+        stratum_weights: Relative share of the dataset drawn from each
+            stratum, easiest first (None = equal shares, which keeps the
+            pool's difficulty mix since the strata are quantiles of it)
+        pool_factor: Size of the candidate pool as a multiple of num_instances
+        seed: Seed for maze generation and transform schedules (None for an
+            unseeded dataset)
+        size_range: (min_size, max_size) for maze dimensions
+        step_multiplier: Step budget as a multiple of the optimal path length
+        transform_interval: Moves between transformations (non-stationary)
+        observation: "full", "window" or "auto" (windowed above
+            rotating_maze.maze.FULL_VIEW_MAX_SIZE)
+        view_radius: Window radius for windowed observations
+        shard_index: Shard of the dataset to build (see rotating_maze.shards)
+        num_shards: Number of shards the dataset is split into. Sample ids
+            and maze_id keep the index in the whole dataset.
+        first_instance: Leave out the mazes before this index. Unless
+            stratify_by is set they aren't generated either. Sample ids and
+            maze_id keep the index in the whole dataset.
 
     Returns:
-        MemoryDataset with maze samples
+        MemoryDataset with maze samples. Each sample's metadata holds its
+        max_turns (tool call budget, TURNS_PER_STEP * max_steps).
     """
+    if num_shards > 1 and seed is None:
+        raise ValueError("Sharded datasets need a seed so that every shard sees the same mazes")
+    indices = [i for i in shard_indices(num_instances, shard_index, num_shards)
+               if i >= first_instance]
+
     samples = []
 
-    for i in range(num_instances):
-        # Generate maze instance
-        maze_data = generate_maze_instance(size_range=(12, 18), variant=variant)
+    # Paired mazes are generated once (with a transform schedule) and
+    # emitted as both variants
+    if variant == "paired":
+        generation_variant = "non_stationary"
+        sample_variants = PAIRED_VARIANTS
+    else:
+        generation_variant = variant
+        sample_variants = [variant]
+
+    instance_args = {
+        "step_multiplier": step_multiplier,
+        "transform_interval": transform_interval,
+        "observation": observation,
+        "view_radius": view_radius,
+    }
+
+    if stratify_by is not None:
+        index = build_maze_index(num_instances * pool_factor, size_range=size_range,
+                                 variant=generation_variant, seed=seed, **instance_args)
+        instances = stratified_sample(index, num_instances, feature=stratify_by,
+                                      num_strata=num_strata, weights=stratum_weights,
+                                      rng=random.Random(seed) if seed is not None else None)
+        instances = [(i, instances[i]) for i in indices if i < len(instances)]
+    else:
+        instances = [
+            (i, generate_maze_instance(size_range=size_range, variant=generation_variant,
+                                       rng=instance_rng(seed, i), **instance_args))
+            for i in indices
+        ]
+
+    # Shared across all samples of a variant (and observation) so it stays a
+    # byte-identical prefix
+    system_msgs = {}
+
+    def system_message(sample_variant: str, radius: Optional[int]) -> ChatMessageSystem:
+        key = (sample_variant, radius)
+        if key not in system_msgs:
+            system_msgs[key] = ChatMessageSystem(
+                content=[ContentText(text=create_system_message(sample_variant, radius),
+                                     cache_breakpoint=cache_breakpoints)]
+            )
+        return system_msgs[key]
 
-        # Create the initial prompt
-        system_msg = create_system_message(variant)
+    for i, maze_data in instances:
+        # Variable content comes after the stable prefix
         initial_view = maze_data["initial_view"]
-
-        input_text = f"{system_msg}\n\nHere is your maze:\n\n{initial_view}"
-
-        # Create sample
-        sample = Sample(
-            input=[ChatMessageUser(content=input_text)],
-            target="SUCCESS",  # Not used for scoring but required
-            id=f"maze_{variant}_{i}",
-            metadata={
-                "maze_id": i,
-                "optimal_path_length": maze_data["optimal_path_length"],
-                "max_steps": maze_data["max_steps"],
-                "variant": variant,
-                "start_pos": maze_data["start_pos"],
-                "goal_pos": maze_data["goal_pos"],
-                "grid": maze_data["grid"]
-            }
-        )
-        samples.append(sample)
+        input_text = f"Here is your maze:\n\n{initial_view}"
+
+        for sample_variant in sample_variants:
+            if sample_variant == "non_stationary":
+                schedule = maze_data["transform_schedule"]
+            else:
+                schedule = []
+
+            # Create sample
+            sample = Sample(
+                input=[system_message(sample_variant, maze_data["view_radius"]),
+                       ChatMessageUser(content=input_text)],
+                target="SUCCESS",  # Not used for scoring but required
+                id=f"maze_{sample_variant}_{i}",
+                metadata={
+                    "maze_id": i,
+                    "pair_id": i if variant == "paired" else None,
+                    "optimal_path_length": maze_data["optimal_path_length"],
+                    "max_steps": maze_data["max_steps"],
+                    "max_turns": TURNS_PER_STEP * maze_data["max_steps"],
+                    "variant": sample_variant,
+                    "transform_schedule": schedule,
+                    "transform_interval": maze_data["transform_interval"],
+                    "view_radius": maze_data["view_radius"],
+                    "start_pos": maze_data["start_pos"],
+                    "goal_pos": maze_data["goal_pos"],
+                    "grid": maze_data["grid"],
+                    "features": maze_data["features"],
+                    "stratum": maze_data.get("stratum")
+                }
+            )
+            samples.append(sample)
 
     return MemoryDataset(samples)
 
 
+def compact_maze_views(messages, start: int = 0) -> int:
+    """Replace superseded maze views in older messages with a placeholder.
+
+    Tool results look like "<status>\n\n<maze view>", with a "Goal: ..."
+    line and a blank line before windowed views. Everything before the view
+    is kept and the view is swapped for COMPACTED_VIEW_PLACEHOLDER in every
+    tool message except the most recent one, which stays verbatim. The
+    initial view in the user message is compacted the same way once a tool
+    result supersedes it.
+
+    Args:
+        messages: Conversation messages (superseded messages are replaced
+            by compacted copies)
+        start: Index of the first message that may still hold a full view
+
+    Returns:
+        Index to pass as `start` on the next call
+    """
+    view_indices = [
+        i for i in range(start, len(messages))
+        if isinstance(messages[i], (ChatMessageTool, ChatMessageUser))
+    ]
+    tool_indices = [i for i in view_indices if isinstance(messages[i], ChatMessageTool)]
+    if not tool_indices:
+        return start
+
+    latest = tool_indices[-1]
+    for i in view_indices:
+        message = messages[i]
+        if i >= latest or not isinstance(message.content, str):
+            continue
+        head, sep, view = message.content.rpartition("\n\n")
+        if sep and is_maze_view(view):
+            # A copy, as the user message may be shared with the sample input
+            messages[i] = message.model_copy(
+                update={"content": f"{head}\n\n{COMPACTED_VIEW_PLACEHOLDER}"}
+            )
+
+    return latest
+
+
+def is_terminal_message(message) -> bool:
+    """Check whether a tool result ends the episode.
+
+    Args:
+        message: Chat message
+
+    Returns:
+        True if the message reports success or failure
+    """
+    text = getattr(message, "text", None)
+    return bool(text) and ("Success!" in text or "Task failed" in text)
+
+
 @solver
-def maze_solver():
-    """Create a maze solver instance."""
+def maze_solver(compact_history: bool = False, max_state_visits: Optional[int] = None,
+                max_invalid_streak: Optional[int] = None, cache: bool = False,
+                checkpoint_every: int = 0, checkpoint_dir: str = DEFAULT_CHECKPOINT_DIR,
+                render_offload_size: Optional[int] = DEFAULT_RENDER_OFFLOAD_SIZE):
+    """Create a maze solver instance.
+
+    Args:
+        compact_history: Replace maze views in the user message and all but
+            the latest tool result with a short placeholder before each
+            model call. Note that the compacted messages are also what ends
+            up in the log.
+        max_state_visits: End the sample once the agent has been in the same
+            (position, orientation) this many times (None = off)
+        max_invalid_streak: End the sample after this many invalid moves in
+            a row (None = off)
+        cache: Serve repeated turns from the local response cache (see
+            rotating_maze.cache)
+        checkpoint_every: Checkpoint the sample to checkpoint_dir every this
+            many turns (0 = off). Runs started with ROTATING_MAZE_RESUME=1
+            resume samples from their latest checkpoint (see
+            rotating_maze.checkpoint).
+        checkpoint_dir: Directory for checkpoint files
+        render_offload_size: Run the steps of mazes at least this wide in a
+            bounded thread pool instead of on the event loop (None = never,
+            see rotating_maze.tools)
+    """
+    cache_policy = response_cache_policy() if cache else False
+    options = {"compact_history": compact_history, "max_state_visits": max_state_visits,
+               "max_invalid_streak": max_invalid_streak}
 
     async def solve(state: TaskState, generate):
         """Custom solver that manages maze state and tools.
@@ -181,51 +435,182 @@ def maze_solver():
             goal_pos=tuple(state.metadata["goal_pos"]),
             optimal_path_length=state.metadata["optimal_path_length"],
             max_steps=state.metadata["max_steps"],
-            variant=state.metadata["variant"]
+            variant=state.metadata["variant"],
+            transform_schedule=state.metadata.get("transform_schedule"),
+            max_state_visits=max_state_visits,
+            max_invalid_streak=max_invalid_streak,
+            transform_interval=state.metadata.get("transform_interval", 5),
+            view_radius=state.metadata.get("view_radius")
         )
+        max_turns = state.metadata.get("max_turns")
+
+        # The shared movement tools act on this sample's episode
+        episode = MazeEpisode(maze_state, render_offload_size)
+        start_episode(episode)
+        state.tools = list(MOVEMENT_TOOLS)
+
+        turns = 0
+        checkpoint = None
+        if checkpoint_every > 0:
+            key = checkpoint_key(str(state.model), state.sample_id, state.epoch,
+                                 state.input, state.metadata, options)
+            checkpoint = SampleCheckpoint(Path(checkpoint_dir) / f"{key}.jsonl")
+            if resume_enabled():
+                resumed = await anyio.to_thread.run_sync(checkpoint.load)
+            else:
+                # A leftover file belongs to another run's trajectory
+                await anyio.to_thread.run_sync(checkpoint.clear)
+                resumed = None
+            if resumed is not None:
+                state.messages = resumed["messages"]
+                maze_state.restore(resumed["maze_state"])
+                episode.steps = resumed["steps"]
+                state.store.set(MAZE_RESUME_KEY, {"turns": resumed["turns"],
+                                                  "move_count": maze_state.move_count})
+                turns = resumed["turns"]
+
+        # One model turn per generate call, until a terminal tool result or
+        # the sample's turn budget runs out. The task's message limit (sized
+        # for the largest budget) is only a backstop.
+        compacted_upto = 0
+        try:
+            while not state.completed:
+                if max_turns is not None and turns >= max_turns:
+                    maze_state.end_reason = "turn_limit"
+                    break
 
-        # Create tools bound to this maze state
-        tools = create_movement_tools(maze_state)
-
-        # Set tools in state
-        state.tools = tools
+                if compact_history:
+                    compacted_upto = compact_maze_views(state.messages, compacted_upto)
 
-        # Use generate with tools until terminal condition
-        max_iterations = state.metadata["max_steps"] + 10  # Safety margin
-        for _ in range(max_iterations):
-            state = await generate(state)
+                turn_start = len(state.messages)
+                state = await generate(state, tool_calls="single", cache=cache_policy)
+                turns += 1
 
-            # Check if terminal condition reached
-            if state.messages and len(state.messages) > 0:
-                last_message = state.messages[-1]
-                if hasattr(last_message, 'text') and last_message.text:
-                    if "Success!" in last_message.text or "Task failed" in last_message.text:
-                        break
+                # Check if terminal condition reached
+                if any(is_terminal_message(m) for m in state.messages[turn_start:]):
+                    break
 
+                if checkpoint is not None and turns % checkpoint_every == 0:
+                    # File writes and fsync stay off the shared event loop
+                    await anyio.to_thread.run_sync(
+                        checkpoint.save, state.messages, episode.steps, maze_state, turns
+                    )
+        except LimitExceededError:
+            # Limits end the sample for good, so there is nothing to resume
+            if checkpoint is not None:
+                await anyio.to_thread.run_sync(checkpoint.clear)
+            raise
+        finally:
+            save_episode(state.store, episode)
+
+        if checkpoint is not None:
+            await anyio.to_thread.run_sync(checkpoint.clear)
         return state
 
     return solve
 
 
 @task
-def rotating_maze(variant: str = "stationary", num_instances: int = 50):
+def rotating_maze(variant: str = "stationary", num_instances: int = 50,
+                  cache_breakpoints: bool = False, compact_history: bool = False,
+                  stratify_by: Optional[str] = None, num_strata: int = 3,
+                  stratum_weights: Optional[List[float]] = None,
+                  seed: Optional[int] = None, size_range: Tuple[int, int] = (12, 18),
+                  max_state_visits: Optional[int] = None,
+                  max_invalid_streak: Optional[int] = None, cache: bool = False,
+                  step_multiplier: float = 3, transform_interval: int = 5,
+                  observation: str = "auto", view_radius: int = DEFAULT_VIEW_RADIUS,
+                  shard_index: int = 0, num_shards: int = 1, checkpoint_every: int = 0,
+                  checkpoint_dir: str = DEFAULT_CHECKPOINT_DIR,
+                  render_offload_size: Optional[int] = DEFAULT_RENDER_OFFLOAD_SIZE,
+                  first_instance: int = 0):
     """Rotating Maze evaluation task.
 
     Tests agent's ability to navigate a maze when the visual representation
     rotates and flips during navigation.
 
     Args:
-        variant: "stationary" (no rotations) or "non_stationary" (rotations every 5 moves)
-        num_instances: Number of maze instances to generate
+        variant: "stationary" (no rotations), "non_stationary" (rotations every
+            transform_interval moves) or "paired" (every maze run as both
+            variants)
+        num_instances: Number of maze instances to generate (samples per
+            variant in paired mode)
+        cache_breakpoints: Place an explicit prompt-cache breakpoint after the
+            shared system message
+        compact_history: Drop superseded maze views from the user message and
+            older tool results before each model call (recorded in the task args and metadata)
+        stratify_by: Difficulty feature to balance samples on, e.g.
+            "optimal_length" or "decision_points"
+        num_strata: Number of difficulty strata when stratify_by is set
+        stratum_weights: Relative share of samples per stratum, easiest
+            first, e.g. [1, 1, 2] to oversample the hardest third (default
+            equal shares)
+        seed: Seed for maze generation and transform schedules, so that
+            separate runs see identical mazes and transformations
+        size_range: (min_size, max_size) for maze dimensions (even sizes are
+            rounded up to the next odd size)
+        max_state_visits: End a sample as looping once the agent has been in
+            the same (position, orientation) this many times (None = off)
+        max_invalid_streak: End a sample as stalled after this many invalid
+            moves in a row (None = off)
+        cache: Cache model responses on disk so that re-running the same
+            seeded mazes against the same model replays earlier turns
+            instead of paying for them again
+        step_multiplier: Step budget (max_steps) as a multiple of each
+            maze's optimal path length. Each sample may make
+            TURNS_PER_STEP * max_steps tool calls.
+        transform_interval: Moves between transformations (non-stationary)
+        observation: "full" (whole maze every turn), "window" (only the
+            cells within view_radius of the player, plus the goal's offset)
+            or "auto" (windowed above rotating_maze.maze.FULL_VIEW_MAX_SIZE)
+        view_radius: Window radius for windowed observations
+        shard_index: Shard of the dataset to run (0-based)
+        num_shards: Split the seeded dataset into this many disjoint shards,
+            e.g. to run it across machines; shard k runs mazes k, k +
+            num_shards, ... (merge the logs with scripts/merge_shards.py)
+        checkpoint_every: Save each sample's progress every this many turns
+            so that samples interrupted by a crash or cancellation can resume
+            from their latest checkpoint when retried with
+            ROTATING_MAZE_RESUME=1 (0 = off)
+        checkpoint_dir: Local directory for the checkpoint files
+        render_offload_size: Move validation and rendering for mazes at
+            least this wide run in a bounded thread pool so they don't block
+            other samples' model calls (None = always on the event loop)
+        first_instance: Run only the mazes from this index on, e.g. for
+            batches of a seeded dataset (without stratify_by, mazes before it
+            are not generated)
 
     Returns:
         Task object
     """
-    dataset = create_dataset(num_instances=num_instances, variant=variant)
+    dataset = create_dataset(num_instances=num_instances, variant=variant,
+                             cache_breakpoints=cache_breakpoints,
+                             stratify_by=stratify_by, num_strata=num_strata,
+                             stratum_weights=stratum_weights, seed=seed,
+                             size_range=tuple(size_range),
+                             step_multiplier=step_multiplier,
+                             transform_interval=transform_interval,
+                             observation=observation, view_radius=view_radius,
+                             shard_index=shard_index, num_shards=num_shards,
+                             first_instance=first_instance)
+
+    # Room for the largest turn budget: system and user message, then an
+    # assistant and a tool message per turn
+    message_limit = 3 + 2 * max((sample.metadata["max_turns"] for sample in dataset), default=0)
+
+    # Paired runs additionally report the within-maze variant effect
+    metrics = [accuracy(), mean(), paired_difference()] if variant == "paired" else None
 
     return Task(
         dataset=dataset,
-        solver=[maze_solver()],
+        solver=[maze_solver(compact_history=compact_history,
+                            max_state_visits=max_state_visits,
+                            max_invalid_streak=max_invalid_streak,
+                            cache=cache, checkpoint_every=checkpoint_every,
+                            checkpoint_dir=checkpoint_dir,
+                            render_offload_size=render_offload_size)],
         scorer=maze_scorer(),
-        max_messages=300,  # Safety limit
+        metrics=metrics,
+        message_limit=message_limit,
+        metadata={"compact_history": compact_history},
     )
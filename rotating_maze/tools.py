@@ -1,137 +1,220 @@
-"""Movement tools for Rotating Maze eval."""
+"""Movement tools for Rotating Maze eval.
+
+The four movement tools are built once per process and shared by every
+sample. Each call looks up the running sample's MazeEpisode (set by the
+solver in a context variable, which every sample has its own copy of), so
+no per-sample tool construction (or docstring/schema parsing) is needed.
+The live MazeState can't be serialized, so it stays out of the sample
+store. The episode also keeps the step records in a plain list, as
+rewriting a growing store list on every call costs O(n^2) copying and a
+store event per step. The solver records the steps and outcome under plain
+store keys once the episode ends (see save_episode).
+
+On large mazes a step (move validation, goal distance and rendering the
+view) takes milliseconds of pure Python, which would block the event loop
+shared by all samples. For grids at least as large as the episode's
+render_offload_size the step runs in a small bounded thread pool instead.
+The GIL still serializes the work, but the loop gets to run between thread
+switches, so other samples' model I/O is no longer held up for the whole
+step.
+"""
+
+from contextvars import ContextVar
+from typing import List, Optional
+
+import anyio
+from inspect_ai.tool import Tool, ToolDef, ToolParams
+from inspect_ai.util import Store
 
-from inspect_ai.tool import tool
 from rotating_maze.maze import MazeState
 
 
-def create_movement_tools(state: MazeState):
-    """Create movement tools bound to a specific maze state.
+# Sample store key holding the structured state after every tool call
+# (written at the end of the episode)
+MAZE_STEPS_KEY = "maze_steps"
 
-    Args:
-        state: MazeState instance to bind tools to
-
-    Returns:
-        List of tool functions
-    """
-
-    @tool
-    def move_up():
-        async def execute() -> str:
-            """Move one step up in the current maze view.
-            
-            Navigate upward in the maze using the current visual orientation.
-            The maze may rotate or flip, but this tool always moves "up" from
-            the current perspective.
-            """
-            # Translate visual "up" to actual coordinate change
-            direction = state.translate_visual_to_actual("up")
+# Sample store keys holding the outcome of the episode (see save_episode)
+MAZE_END_REASON_KEY = "maze_end_reason"
+MAZE_MOVE_COUNT_KEY = "maze_move_count"
+MAZE_SNAPSHOT_KEY = "maze_snapshot"
 
-            if not state.is_valid_move(direction):
-                return f"Cannot move up - wall or boundary.\nSteps: {state.move_count}/{state.max_steps}\n\n{state.get_view()}"
+# Threads for offloaded steps, shared by all samples in the process
+RENDER_THREADS = 4
 
-            # Make the move
-            state.make_move(direction)
+DIRECTIONS = ["up", "down", "left", "right"]
 
-            # Check if transformation should occur
-            if state.should_transform():
-                state.apply_transformation()
+_render_limiter: Optional[anyio.CapacityLimiter] = None
 
-            # Check terminal conditions
-            if state.at_goal():
-                return f"Success! Reached the goal in {state.move_count} moves.\n\n{state.get_view()}"
 
-            if state.exceeded_max_steps():
-                return f"Max steps ({state.max_steps}) reached. Task failed.\n\n{state.get_view()}"
+class MazeEpisode:
+    """Live maze state of the running sample, shared by its solver and tools."""
 
-            return f"Moved up.\nSteps: {state.move_count}/{state.max_steps}\n\n{state.get_view()}"
+    def __init__(self, state: MazeState, render_offload_size: Optional[int] = None):
+        """Initialize the episode.
 
-        return execute
+        Args:
+            state: The sample's MazeState
+            render_offload_size: Grid size from which steps run in the render
+                thread pool (None = always on the event loop)
+        """
+        self.state = state
+        self.render_offload_size = render_offload_size
+        self.steps: List[dict] = []
 
-    @tool
-    def move_down():
-        async def execute() -> str:
-            """Move one step down in the current maze view.
-            
-            Navigate downward in the maze using the current visual orientation.
-            The maze may rotate or flip, but this tool always moves "down" from
-            the current perspective.
-            """
-            direction = state.translate_visual_to_actual("down")
 
-            if not state.is_valid_move(direction):
-                return f"Cannot move down - wall or boundary.\nSteps: {state.move_count}/{state.max_steps}\n\n{state.get_view()}"
+_current_episode: ContextVar[MazeEpisode] = ContextVar("maze_episode")
 
-            state.make_move(direction)
 
-            if state.should_transform():
-                state.apply_transformation()
+def start_episode(episode: MazeEpisode):
+    """Make an episode the one the movement tools of this sample act on."""
+    _current_episode.set(episode)
 
-            if state.at_goal():
-                return f"Success! Reached the goal in {state.move_count} moves.\n\n{state.get_view()}"
 
-            if state.exceeded_max_steps():
-                return f"Max steps ({state.max_steps}) reached. Task failed.\n\n{state.get_view()}"
+def current_episode() -> MazeEpisode:
+    """Get the episode of the running sample (see start_episode)."""
+    return _current_episode.get()
 
-            return f"Moved down.\nSteps: {state.move_count}/{state.max_steps}\n\n{state.get_view()}"
 
-        return execute
+def save_episode(sample_store: Store, episode: MazeEpisode):
+    """Record the steps and outcome of an episode under serializable store keys.
 
-    @tool
-    def move_left():
-        async def execute() -> str:
-            """Move one step left in the current maze view.
-            
-            Navigate leftward in the maze using the current visual orientation.
-            The maze may rotate or flip, but this tool always moves "left" from
-            the current perspective.
-            """
-            direction = state.translate_visual_to_actual("left")
+    The scorer reads these back, so re-scoring a log sees the same end
+    reason and move count as the live run.
 
-            if not state.is_valid_move(direction):
-                return f"Cannot move left - wall or boundary.\nSteps: {state.move_count}/{state.max_steps}\n\n{state.get_view()}"
-
-            state.make_move(direction)
-
-            if state.should_transform():
-                state.apply_transformation()
+    Args:
+        sample_store: The sample's store
+        episode: The episode, once it has ended
+    """
+    state = episode.state
+    sample_store.set(MAZE_STEPS_KEY, episode.steps)
+    sample_store.set(MAZE_END_REASON_KEY, state.end_reason)
+    sample_store.set(MAZE_MOVE_COUNT_KEY, state.move_count)
+    sample_store.set(MAZE_SNAPSHOT_KEY, state.snapshot())
 
-            if state.at_goal():
-                return f"Success! Reached the goal in {state.move_count} moves.\n\n{state.get_view()}"
 
-            if state.exceeded_max_steps():
-                return f"Max steps ({state.max_steps}) reached. Task failed.\n\n{state.get_view()}"
+def render_limiter() -> anyio.CapacityLimiter:
+    """Get the limiter bounding the threads used for offloaded steps."""
+    global _render_limiter
+    if _render_limiter is None:
+        _render_limiter = anyio.CapacityLimiter(RENDER_THREADS)
+    return _render_limiter
 
-            return f"Moved left.\nSteps: {state.move_count}/{state.max_steps}\n\n{state.get_view()}"
 
-        return execute
+def take_step(state: MazeState, direction: str) -> str:
+    """Move in a visual direction and describe the outcome.
 
-    @tool
-    def move_right():
-        async def execute() -> str:
-            """Move one step right in the current maze view.
-            
-            Navigate rightward in the maze using the current visual orientation.
-            The maze may rotate or flip, but this tool always moves "right" from
-            the current perspective.
-            """
-            direction = state.translate_visual_to_actual("right")
+    Args:
+        state: MazeState to move in
+        direction: "up", "down", "left" or "right" in the current view
 
-            if not state.is_valid_move(direction):
-                return f"Cannot move right - wall or boundary.\nSteps: {state.move_count}/{state.max_steps}\n\n{state.get_view()}"
+    Returns:
+        Tool result: a status line, a blank line, then the current
+        observation (see MazeState.observation)
+    """
+    # Translate visual direction to actual coordinate change
+    actual = state.translate_visual_to_actual(direction)
+
+    if not state.is_valid_move(actual):
+        state.record_invalid_move()
+        if state.stalled():
+            state.end_reason = "stalled"
+            return (f"Cannot move {direction} - wall or boundary.\n"
+                    f"{state.invalid_streak} invalid moves in a row. Task failed.\n"
+                    f"Steps: {state.move_count}/{state.max_steps}\n\n{state.observation()}")
+        return f"Cannot move {direction} - wall or boundary.\nSteps: {state.move_count}/{state.max_steps}\n\n{state.observation()}"
+
+    # Make the move
+    state.make_move(actual)
+
+    # Check if transformation should occur
+    if state.should_transform():
+        state.apply_transformation()
+    state.record_visit()
+
+    # Check terminal conditions
+    if state.at_goal():
+        state.end_reason = "success"
+        return f"Success! Reached the goal in {state.move_count} moves.\n\n{state.observation()}"
+
+    if state.exceeded_max_steps():
+        state.end_reason = "max_steps"
+        return f"Max steps ({state.max_steps}) reached. Task failed.\n\n{state.observation()}"
+
+    if state.looping():
+        state.end_reason = "loop"
+        return (f"Moved {direction}.\nStuck in a loop (same position and view "
+                f"{state.max_state_visits} times). Task failed.\n"
+                f"Steps: {state.move_count}/{state.max_steps}\n\n{state.observation()}")
+
+    # No point continuing once the remaining budget can't cover the distance
+    if state.goal_out_of_reach():
+        state.end_reason = "goal_out_of_reach"
+        return (f"Goal out of reach ({state.distance_to_goal()} moves needed, "
+                f"{state.max_steps - state.move_count} left). Task failed.\n"
+                f"Steps: {state.move_count}/{state.max_steps}\n\n{state.observation()}")
+
+    return f"Moved {direction}.\nSteps: {state.move_count}/{state.max_steps}\n\n{state.observation()}"
+
+
+def step_record(state: MazeState, direction: str, moves_before: int) -> dict:
+    """Build the structured record of a tool call.
 
-            state.make_move(direction)
+    Args:
+        state: MazeState after the step
+        direction: Visual direction of the call
+        moves_before: state.move_count before the step
 
-            if state.should_transform():
-                state.apply_transformation()
+    Returns:
+        Dictionary with direction, valid, x, y, orientation and move_count
+    """
+    x, y = state.current_position
+    return {
+        "direction": direction,
+        "valid": state.move_count > moves_before,
+        "x": x,
+        "y": y,
+        "orientation": state.orientation,
+        "move_count": state.move_count,
+    }
 
-            if state.at_goal():
-                return f"Success! Reached the goal in {state.move_count} moves.\n\n{state.get_view()}"
 
-            if state.exceeded_max_steps():
-                return f"Max steps ({state.max_steps}) reached. Task failed.\n\n{state.get_view()}"
+def _movement_tool(direction: str) -> Tool:
+    """Build the tool that moves in one visual direction.
 
-            return f"Moved right.\nSteps: {state.move_count}/{state.max_steps}\n\n{state.get_view()}"
+    Args:
+        direction: "up", "down", "left" or "right"
 
-        return execute
+    Returns:
+        Tool operating on the current sample's MazeState
+    """
 
-    return [move_up(), move_down(), move_left(), move_right()]
+    async def execute() -> str:
+        episode = current_episode()
+        state = episode.state
+        moves_before = state.move_count
+        offload_size = episode.render_offload_size
+        if offload_size is not None and len(state.original_grid) >= offload_size:
+            result = await anyio.to_thread.run_sync(take_step, state, direction,
+                                                    limiter=render_limiter())
+        else:
+            result = take_step(state, direction)
+
+        # Structured record of the step, logged with the sample store
+        episode.steps.append(step_record(state, direction, moves_before))
+        return result
+
+    return ToolDef(
+        execute,
+        name=f"move_{direction}",
+        description=(
+            f"Move one step {direction} in the current maze view.\n\n"
+            f"Navigate {direction}ward in the maze using the current visual orientation.\n"
+            f"The maze may rotate or flip, but this tool always moves \"{direction}\" from\n"
+            f"the current perspective."
+        ),
+        parameters=ToolParams(),
+    ).as_tool()
+
+
+# Built once per process and reused across all samples
+MOVEMENT_TOOLS = [_movement_tool(direction) for direction in DIRECTIONS]
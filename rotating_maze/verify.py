@@ -0,0 +1,207 @@
+"""High-throughput verification of maze invariants.
+
+Checks the properties the design promises for every maze:
+- perfect: the open cells form a tree (connected, open adjacencies = cells - 1)
+- solvable: the goal is reachable from the start
+- optimal_path_length matches the true shortest-path distance
+
+Mazes of the same shape are stacked into one boolean array and checked
+together with whole-batch NumPy operations (a breadth-first flood from the
+start, one shift-and-mask step per BFS layer). Generated mazes and corpus
+files are split into chunks and verified across a process pool.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rotating_maze.maze import PackedGrid, generate_maze_instance
+from rotating_maze.sampling import instance_rng
+
+
+def grids_to_array(grids: Sequence[List[List[str]]]) -> np.ndarray:
+    """Stack same-shaped grids into a (batch, height, width) open-cell mask."""
+    return np.array([[[ch != '#' for ch in row] for row in grid] for grid in grids],
+                    dtype=bool)
+
+
+def packed_to_array(packed: PackedGrid) -> np.ndarray:
+    """Unpack a PackedGrid into a (height, width) open-cell mask."""
+    rows = np.frombuffer(bytes(packed.data), dtype=np.uint8).reshape(packed.height, packed.stride)
+    return np.unpackbits(rows, axis=1, bitorder="little")[:, :packed.width].astype(bool)
+
+
+def verify_batch(open_cells: np.ndarray, starts: np.ndarray, goals: np.ndarray,
+                 optimal_lengths: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """Verify a batch of same-shaped mazes.
+
+    Args:
+        open_cells: (batch, height, width) boolean mask of open cells
+        starts: (batch, 2) start positions as (x, y)
+        goals: (batch, 2) goal positions as (x, y)
+        optimal_lengths: (batch,) claimed optimal path lengths, if known
+
+    Returns:
+        Dictionary of (batch,) arrays: perfect, reachable, distance (-1 if
+        unreachable), length_ok and valid (all checks passed)
+    """
+    batch = np.arange(len(open_cells))
+    sx, sy = starts[:, 0], starts[:, 1]
+    gx, gy = goals[:, 0], goals[:, 1]
+
+    # Tree check: a connected graph with V - 1 edges has no cycles
+    cells = open_cells.sum(axis=(1, 2))
+    edges = ((open_cells[:, :, 1:] & open_cells[:, :, :-1]).sum(axis=(1, 2)) +
+             (open_cells[:, 1:, :] & open_cells[:, :-1, :]).sum(axis=(1, 2)))
+
+    # Layered BFS flood from the start over the whole batch at once
+    start_open = open_cells[batch, sy, sx]
+    reached = np.zeros_like(open_cells)
+    reached[batch, sy, sx] = start_open
+    frontier = reached.copy()
+    distance = np.full(len(open_cells), -1, dtype=np.int64)
+    step = 0
+    while frontier.any():
+        at_goal = frontier[batch, gy, gx] & (distance < 0)
+        distance[at_goal] = step
+
+        grown = np.zeros_like(frontier)
+        grown[:, 1:, :] |= frontier[:, :-1, :]
+        grown[:, :-1, :] |= frontier[:, 1:, :]
+        grown[:, :, 1:] |= frontier[:, :, :-1]
+        grown[:, :, :-1] |= frontier[:, :, 1:]
+        frontier = grown & open_cells & ~reached
+        reached |= frontier
+        step += 1
+
+    connected = reached.sum(axis=(1, 2)) == cells
+    perfect = start_open & connected & (edges == cells - 1)
+    reachable = distance >= 0
+    if optimal_lengths is None:
+        length_ok = np.ones(len(open_cells), dtype=bool)
+    else:
+        length_ok = distance == optimal_lengths
+
+    return {
+        "perfect": perfect,
+        "reachable": reachable,
+        "distance": distance,
+        "length_ok": length_ok,
+        "valid": perfect & reachable & length_ok,
+    }
+
+
+def _failures(labels: Sequence, checks: Dict[str, np.ndarray]) -> List[dict]:
+    """List the mazes in a checked batch that violate any invariant."""
+    failures = []
+    for i in np.flatnonzero(~checks["valid"]):
+        failures.append({
+            "maze": labels[i],
+            "failed": [name for name in ("perfect", "reachable", "length_ok")
+                       if not checks[name][i]],
+            "distance": int(checks["distance"][i]),
+        })
+    return failures
+
+
+def _verify_instances(instances: List[dict], labels: List) -> Tuple[int, List[dict]]:
+    """Verify generated instances, batching them by grid shape."""
+    by_shape: Dict[Tuple[int, int], List[int]] = {}
+    for i, instance in enumerate(instances):
+        shape = (len(instance["grid"]), len(instance["grid"][0]))
+        by_shape.setdefault(shape, []).append(i)
+
+    failures = []
+    for members in by_shape.values():
+        group = [instances[i] for i in members]
+        checks = verify_batch(
+            grids_to_array([m["grid"] for m in group]),
+            np.array([m["start_pos"] for m in group]),
+            np.array([m["goal_pos"] for m in group]),
+            np.array([m["optimal_path_length"] for m in group]),
+        )
+        failures.extend(_failures([labels[i] for i in members], checks))
+    return len(instances), failures
+
+
+def _verify_generated_chunk(job: Tuple[int, int, Tuple[int, int], str, int]) -> Tuple[int, List[dict]]:
+    """Generate and verify mazes start..stop (process pool entry point)."""
+    start, stop, size_range, algorithm, seed = job
+    indices = list(range(start, stop))
+    instances = [
+        generate_maze_instance(size_range=size_range, algorithm=algorithm,
+                               rng=instance_rng(seed, i))
+        for i in indices
+    ]
+    return _verify_instances(instances, indices)
+
+
+def _verify_corpus_file(path: str) -> Tuple[int, List[dict]]:
+    """Verify one packed corpus file (process pool entry point).
+
+    Corpus files only store the grid, so the generator's conventions are
+    assumed: start top-left, goal bottom-right, no claimed optimal length.
+    """
+    packed = PackedGrid.load(path)
+    checks = verify_batch(
+        packed_to_array(packed)[None],
+        np.array([(1, 1)]),
+        np.array([(packed.width - 2, packed.height - 2)]),
+    )
+    return 1, _failures([path], checks)
+
+
+def _run(worker, jobs: list, workers: Optional[int]) -> dict:
+    """Run verification jobs (in-process when workers == 0) and merge reports."""
+    if workers == 0:
+        outcomes = [worker(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(worker, jobs))
+
+    failures = [f for _, chunk_failures in outcomes for f in chunk_failures]
+    return {
+        "checked": sum(count for count, _ in outcomes),
+        "failed": len(failures),
+        "failures": failures,
+    }
+
+
+def verify_generated(num_mazes: int, size_range: Tuple[int, int] = (12, 18),
+                     algorithm: str = "backtracking", seed: int = 0,
+                     workers: Optional[int] = None, chunk_size: int = 2000) -> dict:
+    """Generate seeded mazes and verify their invariants.
+
+    Args:
+        num_mazes: Number of mazes to generate and check
+        size_range: (min_size, max_size) for maze dimensions
+        algorithm: Generator to check ("backtracking" or "eller")
+        seed: Base seed; maze i uses instance_rng(seed, i), so failures can
+            be regenerated from their index
+        workers: Worker processes (None = CPU count, 0 = in-process)
+        chunk_size: Mazes generated and verified per job
+
+    Returns:
+        Report with checked, failed and failures (maze index, failed checks,
+        true distance)
+    """
+    jobs = [
+        (start, min(start + chunk_size, num_mazes), size_range, algorithm, seed)
+        for start in range(0, num_mazes, chunk_size)
+    ]
+    return _run(_verify_generated_chunk, jobs, workers)
+
+
+def verify_corpus(paths: Sequence[str], workers: Optional[int] = None) -> dict:
+    """Verify the invariants of packed corpus files.
+
+    Args:
+        paths: Packed maze files (see PackedGrid)
+        workers: Worker processes (None = CPU count, 0 = in-process)
+
+    Returns:
+        Report with checked, failed and failures (file path, failed checks,
+        true distance)
+    """
+    return _run(_verify_corpus_file, list(paths), workers)
@@ -0,0 +1,64 @@
+"""Build the per-step trajectory table and adaptation analyses from eval logs."""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rotating_maze.analytics import (
+    build_step_table,
+    invalid_move_profile,
+    read_step_table,
+    recovery_times,
+    regret_curves,
+    write_step_table,
+)
+from rotating_maze.replay import replay_logs
+
+
+def main():
+    """Main function to build the step table and write the analyses."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("log_dir", nargs="?", default="results/logs",
+                        help="Directory containing eval logs")
+    parser.add_argument("--output-dir", default="results/analytics",
+                        help="Directory for the Parquet table and CSV outputs")
+    parser.add_argument("--from-parquet", action="store_true",
+                        help="Reuse an existing steps.parquet instead of replaying logs")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Replay worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    table_path = output_dir / "steps.parquet"
+
+    if args.from_parquet:
+        table = read_step_table(str(table_path))
+    else:
+        log_files = sorted(str(p) for p in Path(args.log_dir).glob("**/*.eval"))
+        if not log_files:
+            print(f"❌ No .eval logs found in {args.log_dir}")
+            return
+        print(f"🔁 Replaying {len(log_files)} logs...")
+        results = replay_logs(log_files, workers=args.workers, include_trajectory=True)
+        table = build_step_table(results)
+        write_step_table(table, str(table_path))
+        print(f"✅ Saved {len(table)} steps to {table_path}")
+
+    recovery = recovery_times(table)
+    recovery.to_csv(output_dir / "recovery_times.csv", index=False)
+    invalid_move_profile(table).to_csv(output_dir / "invalid_after_transform.csv")
+    regret_curves(table).to_csv(output_dir / "regret_curves.csv")
+
+    if len(recovery):
+        summary = recovery.groupby(["model", "variant"], observed=True)["recovery_calls"]
+        print("\nRecovery after transforms (tool calls until progress):")
+        print(summary.describe()[["count", "mean", "50%", "max"]].to_string())
+
+    print(f"\n✅ Saved analyses to {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Token, runtime and cost dashboard for Rotating Maze eval logs."""
+
+import argparse
+import sys
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rotating_maze.costs import add_costs, load_cost_table, summarize_costs
+
+
+def parse_prices(specs):
+    """Parse --price MODEL=INPUT,OUTPUT[,CACHE_READ[,CACHE_WRITE]] options.
+
+    Args:
+        specs: Price specs, prices in dollars per million tokens
+
+    Returns:
+        Dictionary mapping model -> (input, output[, cache read[, cache
+        write]]) prices
+    """
+    prices = {}
+    for spec in specs or []:
+        model, _, values = spec.rpartition("=")
+        price = tuple(float(v) for v in values.split(","))
+        if not 2 <= len(price) <= 4:
+            raise ValueError(f"Expected 2 to 4 prices for {model}, got '{values}'")
+        prices[model] = price
+    return prices
+
+
+def _config_labels(summary):
+    """Label summary rows as 'model (variant)'."""
+    return [f"{model.split('/')[-1]} ({variant})" for model, variant in summary.index]
+
+
+def generate_token_graph(summary, output_path="results/cost_tokens.png"):
+    """Plot mean tokens per sample and turns per success by configuration.
+
+    Args:
+        summary: Summary grouped by model and variant
+        output_path: Output file path
+    """
+    labels = _config_labels(summary)
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+
+    ax1.bar(labels, summary["tokens_per_sample"])
+    ax1.set_ylabel("Tokens per Sample", fontsize=12, fontweight='bold')
+    ax1.set_title("Mean Tokens per Sample", fontsize=14, fontweight='bold')
+
+    ax2.bar(labels, summary["turns_per_success"].fillna(0))
+    ax2.set_ylabel("Turns per Success", fontsize=12, fontweight='bold')
+    ax2.set_title("Model Turns per Solved Maze", fontsize=14, fontweight='bold')
+
+    for ax in (ax1, ax2):
+        ax.tick_params(axis='x', rotation=45)
+        ax.grid(axis='y', alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    print(f"✅ Saved token graph to {output_path}")
+    plt.close()
+
+
+def generate_time_graph(table, output_path="results/cost_time.png"):
+    """Plot mean wall time per sample split into model, tool and other time.
+
+    Args:
+        table: Per-sample cost table
+        output_path: Output file path
+    """
+    grouped = table.groupby(["model", "variant"]).mean(numeric_only=True)
+    labels = _config_labels(grouped)
+    other = (grouped["total_time"] - grouped["model_time"] - grouped["tool_time"]).clip(lower=0)
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.bar(labels, grouped["model_time"], label="Model")
+    ax.bar(labels, grouped["tool_time"], bottom=grouped["model_time"], label="Tools")
+    ax.bar(labels, other, bottom=grouped["model_time"] + grouped["tool_time"], label="Other")
+
+    ax.set_ylabel("Seconds per Sample", fontsize=12, fontweight='bold')
+    ax.set_title("Rotating Maze: Wall Time per Sample", fontsize=14, fontweight='bold')
+    ax.tick_params(axis='x', rotation=45)
+    ax.legend()
+    ax.grid(axis='y', alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    print(f"✅ Saved time graph to {output_path}")
+    plt.close()
+
+
+def generate_size_graph(table, output_path="results/cost_by_size.png"):
+    """Plot tokens and cost per sample against maze size.
+
+    Args:
+        table: Per-sample cost table
+        output_path: Output file path
+    """
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+
+    for (model, variant), group in table.groupby(["model", "variant"]):
+        by_size = group.groupby("size").mean(numeric_only=True)
+        label = f"{model.split('/')[-1]} ({variant})"
+        ax1.plot(by_size.index, by_size["total_tokens"], marker='o', label=label)
+        if by_size["cost"].notna().any():
+            ax2.plot(by_size.index, by_size["cost"], marker='o', label=label)
+
+    ax1.set_ylabel("Tokens per Sample", fontsize=12, fontweight='bold')
+    ax1.set_title("Tokens by Maze Size", fontsize=14, fontweight='bold')
+    ax2.set_ylabel("Cost per Sample ($)", fontsize=12, fontweight='bold')
+    ax2.set_title("Cost by Maze Size", fontsize=14, fontweight='bold')
+
+    for ax in (ax1, ax2):
+        ax.set_xlabel("Maze Size", fontsize=12, fontweight='bold')
+        ax.grid(alpha=0.3)
+        if ax.get_legend_handles_labels()[0]:
+            ax.legend(fontsize=8)
+
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    print(f"✅ Saved size graph to {output_path}")
+    plt.close()
+
+
+def generate_cost_summary(table, output_path="results/cost_summary.txt"):
+    """Write the cost summary table per configuration and per size.
+
+    Args:
+        table: Per-sample cost table
+        output_path: Output file path
+    """
+    columns = ["samples", "successes", "tokens_per_sample", "wall_time_per_sample",
+               "model_time_share", "tool_time_share", "turns_per_success",
+               "cost", "cost_per_success"]
+
+    lines = []
+    lines.append("=" * 80)
+    lines.append("ROTATING MAZE COST AND RUNTIME")
+    lines.append("=" * 80)
+    for by in (["model", "variant"], ["model", "variant", "size"]):
+        summary = summarize_costs(table, by=by)[columns]
+        lines.append(f"\nBy {', '.join(by)}")
+        lines.append("-" * 60)
+        lines.append(summary.to_string(float_format=lambda v: f"{v:.4g}", na_rep="-"))
+    lines.append("\n" + "=" * 80)
+
+    summary = "\n".join(lines)
+    print(summary)
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w") as f:
+        f.write(summary)
+
+    print(f"\n✅ Saved cost summary to {output_path}")
+
+
+def main():
+    """Main function to generate the cost dashboard."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("log_dir", nargs="?", default="results/logs",
+                        help="Directory containing eval logs")
+    parser.add_argument("--price", action="append",
+                        metavar="MODEL=INPUT,OUTPUT[,CACHE_READ[,CACHE_WRITE]]",
+                        help="Dollars per million input/output (and cache read/write, "
+                             "default: input price) tokens for a model without "
+                             "provider-reported cost (repeatable)")
+    parser.add_argument("--output-dir", default="results",
+                        help="Where to write the charts and summary")
+    args = parser.parse_args()
+
+    log_files = sorted(Path(args.log_dir).glob("**/*.eval"))
+    if not log_files:
+        print(f"❌ No .eval logs found in {args.log_dir}")
+        return
+
+    print(f"💰 Loading usage from {len(log_files)} logs...")
+    table = add_costs(load_cost_table([str(f) for f in log_files]),
+                      parse_prices(args.price))
+    if table.empty:
+        print("❌ No samples found in the logs")
+        return
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    generate_token_graph(summarize_costs(table), output_dir / "cost_tokens.png")
+    generate_time_graph(table, output_dir / "cost_time.png")
+    generate_size_graph(table, output_dir / "cost_by_size.png")
+    generate_cost_summary(table, output_dir / "cost_summary.txt")
+
+    print("\n✨ Cost dashboard generated successfully!")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,68 @@
 """Generate graphs from Rotating Maze eval results."""
 
 import json
+import math
 import matplotlib.pyplot as plt
 import pandas as pd
 from pathlib import Path
 from collections import defaultdict
 
 
+def _model_name(model: str) -> str:
+    """Clean up a model name ("provider/model" -> "model")."""
+    return model.split("/")[1] if "/" in model else model
+
+
+def _score_record(metadata: dict, log_file: Path, epoch: int) -> dict:
+    """Build the per-sample record used by the graphs from score metadata."""
+    return {
+        "success": metadata.get("success", False),
+        "steps_taken": metadata.get("steps_taken", 0),
+        "optimal_steps": metadata.get("optimal_steps", 0),
+        "efficiency": metadata.get("efficiency", 0.0),
+        "pair_id": metadata.get("pair_id"),
+        "run": str(log_file),
+        "epoch": epoch,
+    }
+
+
+def _load_eval_log(log_file: Path, results):
+    """Add the scored samples of an Inspect eval log to results."""
+    from inspect_ai.log import read_eval_log
+
+    log = read_eval_log(str(log_file))
+    model = _model_name(log.eval.model)
+    variant = (log.eval.task_args or {}).get("variant", "unknown")
+    for sample in log.samples or []:
+        # Errored samples have no scores
+        score = (sample.scores or {}).get("maze_scorer")
+        if score is None:
+            continue
+        metadata = score.metadata or {}
+        # Paired runs mix both variants in one log, so prefer the
+        # per-sample variant
+        sample_variant = metadata.get("variant") or variant
+        results[(model, sample_variant)].append(_score_record(metadata, log_file, sample.epoch))
+
+
+def _load_summary_json(data: dict, log_file: Path, results):
+    """Add the scores of a summary JSON file ({"model", "eval", "results"}) to results."""
+    model = _model_name(data.get("model", "unknown"))
+    variant = data.get("eval", {}).get("task_args", {}).get("variant", "unknown")
+    for score in data.get("results", {}).get("scores", []):
+        metadata = score.get("metadata", {})
+        sample_variant = metadata.get("variant") or variant
+        results[(model, sample_variant)].append(
+            _score_record(metadata, log_file, score.get("epoch", 1))
+        )
+
+
 def load_results(log_dir: str = "results/logs"):
     """Load results from Inspect log files.
 
+    Reads Inspect eval logs (.eval, or .json written with --log-format=json)
+    sample by sample, and summary JSON files with per-score metadata.
+
     Args:
         log_dir: Directory containing log files
 
@@ -23,35 +76,17 @@ def load_results(log_dir: str = "results/logs"):
 
     results = defaultdict(list)
 
-    # Find all JSON log files
-    for log_file in log_path.glob("**/*.json"):
+    log_files = sorted(log_path.glob("**/*.eval")) + sorted(log_path.glob("**/*.json"))
+    for log_file in log_files:
         try:
-            with open(log_file) as f:
-                data = json.load(f)
-
-            # Extract model and variant
-            model = data.get("model", "unknown")
-            # Clean up model name
-            if "/" in model:
-                model = model.split("/")[1]
-
-            # Get eval info
-            eval_info = data.get("eval", {})
-            task_args = eval_info.get("task_args", {})
-            variant = task_args.get("variant", "unknown")
-
-            # Get results
-            results_data = data.get("results", {})
-            scores = results_data.get("scores", [])
-
-            for score in scores:
-                metadata = score.get("metadata", {})
-                results[(model, variant)].append({
-                    "success": metadata.get("success", False),
-                    "steps_taken": metadata.get("steps_taken", 0),
-                    "optimal_steps": metadata.get("optimal_steps", 0),
-                    "efficiency": metadata.get("efficiency", 0.0),
-                })
+            if log_file.suffix == ".json":
+                with open(log_file) as f:
+                    data = json.load(f)
+                # Inspect JSON logs carry a format version
+                if "version" not in data:
+                    _load_summary_json(data, log_file, results)
+                    continue
+            _load_eval_log(log_file, results)
 
         except Exception as e:
             print(f"⚠️  Error loading {log_file}: {e}")
@@ -208,6 +243,57 @@ def generate_efficiency_graph(results, output_path="results/efficiency.png"):
     plt.close()
 
 
+def compute_paired_differences(results):
+    """Compute per-model paired differences between the variants.
+
+    Only scores from paired runs (variant="paired", linked by pair_id) are
+    used, so each difference compares the same maze with and without
+    transformations. Pairs are matched within one log and epoch, as pair
+    ids repeat across runs and epochs.
+
+    Args:
+        results: Results dictionary
+
+    Returns:
+        Dictionary mapping model -> pairs, success_diff (stationary minus
+        non-stationary success rate), its standard error and 95% confidence
+        interval, and steps_diff (mean extra steps on pairs solved in both
+        variants, or None)
+    """
+    by_pair = defaultdict(dict)
+    for (model, variant), scores in results.items():
+        for s in scores:
+            if s.get("pair_id") is not None:
+                by_pair[(model, s.get("run"), s.get("epoch"), s["pair_id"])][variant] = s
+
+    diffs = defaultdict(list)
+    step_diffs = defaultdict(list)
+    for (model, *_), pair in by_pair.items():
+        if "stationary" not in pair or "non_stationary" not in pair:
+            continue
+        stationary, non_stationary = pair["stationary"], pair["non_stationary"]
+        diffs[model].append(float(stationary["success"]) - float(non_stationary["success"]))
+        if stationary["success"] and non_stationary["success"]:
+            step_diffs[model].append(non_stationary["steps_taken"] - stationary["steps_taken"])
+
+    paired = {}
+    for model, values in diffs.items():
+        n = len(values)
+        mean_diff = sum(values) / n
+        variance = sum((d - mean_diff) ** 2 for d in values) / (n - 1) if n > 1 else 0.0
+        stderr = math.sqrt(variance / n)
+        steps = step_diffs[model]
+        paired[model] = {
+            "pairs": n,
+            "success_diff": mean_diff,
+            "stderr": stderr,
+            "ci_low": mean_diff - 1.96 * stderr,
+            "ci_high": mean_diff + 1.96 * stderr,
+            "steps_diff": sum(steps) / len(steps) if steps else None,
+        }
+    return paired
+
+
 def generate_summary_table(results, output_path="results/summary.txt"):
     """Generate text summary of results.
 
@@ -246,6 +332,21 @@ def generate_summary_table(results, output_path="results/summary.txt"):
             lines.append(f"  Avg optimal path: {avg_optimal:.1f}")
             lines.append(f"  Avg efficiency: {avg_efficiency:.1f}%")
 
+    paired = compute_paired_differences(results)
+    if paired:
+        lines.append("\n" + "=" * 80)
+        lines.append("PAIRED DIFFERENCES (stationary - non-stationary, same mazes)")
+        lines.append("=" * 80)
+        for model, diff in sorted(paired.items()):
+            lines.append(f"\n{model}")
+            lines.append("-" * 60)
+            lines.append(f"  Pairs: {diff['pairs']}")
+            lines.append(f"  Success rate diff: {diff['success_diff'] * 100:+.1f} pts "
+                         f"(SE {diff['stderr'] * 100:.1f}, 95% CI "
+                         f"{diff['ci_low'] * 100:+.1f} to {diff['ci_high'] * 100:+.1f})")
+            if diff["steps_diff"] is not None:
+                lines.append(f"  Extra steps when both solved: {diff['steps_diff']:+.1f}")
+
     lines.append("\n" + "=" * 80)
 
     summary = "\n".join(lines)
@@ -0,0 +1,101 @@
+"""Offline load test of the Rotating Maze eval against the local oracle model."""
+
+import argparse
+import os
+import resource
+import sys
+import time
+from pathlib import Path
+
+import anyio
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from inspect_ai import eval_async
+
+import rotating_maze.oracle  # noqa: F401  (registers maze_oracle/oracle)
+from rotating_maze.loop_lag import LoopLagMonitor
+from rotating_maze.task import DEFAULT_RENDER_OFFLOAD_SIZE, rotating_maze
+
+
+async def run_eval(task, args, monitor):
+    """Run the eval while the monitor measures event loop lag."""
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(monitor.run)
+        logs = await eval_async(
+            task,
+            model="maze_oracle/oracle",
+            model_args={"noise": args.noise, "latency": args.latency,
+                        "latency_jitter": args.latency_jitter, "seed": args.seed},
+            max_samples=args.samples,
+            max_connections=args.samples,
+            log_dir=args.log_dir,
+        )
+        tg.cancel_scope.cancel()
+    return logs
+
+
+def main():
+    """Main function to run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=100,
+                        help="Number of mazes, all run concurrently")
+    parser.add_argument("--variant", default="non_stationary",
+                        choices=["stationary", "non_stationary", "paired"])
+    parser.add_argument("--noise", type=float, default=0.0,
+                        help="Probability of a random move instead of the oracle move")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds the oracle waits before every response")
+    parser.add_argument("--latency-jitter", type=float, default=0.0,
+                        help="Extra random wait of up to this many seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--size", type=int, nargs=2, default=[12, 18], metavar=("MIN", "MAX"),
+                        help="Maze size range")
+    parser.add_argument("--observation", default="auto", choices=["auto", "full", "window"])
+    parser.add_argument("--render-offload-size", type=int, default=DEFAULT_RENDER_OFFLOAD_SIZE,
+                        help="Run the steps of mazes at least this wide off the event loop")
+    parser.add_argument("--no-render-offload", action="store_true",
+                        help="Run every step on the event loop")
+    parser.add_argument("--log-dir", default="results/load_test_logs")
+    args = parser.parse_args()
+
+    print(f"🏋️  Running {args.samples} {args.variant} mazes against maze_oracle "
+          f"(noise={args.noise}, latency={args.latency}s)...")
+    offload_size = None if args.no_render_offload else args.render_offload_size
+    task = rotating_maze(variant=args.variant, num_instances=args.samples, seed=args.seed,
+                         size_range=tuple(args.size), observation=args.observation,
+                         render_offload_size=offload_size)
+    monitor = LoopLagMonitor()
+    # eval_async has no display argument
+    os.environ.setdefault("INSPECT_DISPLAY", "none")
+    # ru_maxrss is in kilobytes on Linux
+    baseline_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    start = time.perf_counter()
+    logs = anyio.run(run_eval, task, args, monitor)
+    elapsed = time.perf_counter() - start
+
+    log = logs[0]
+    if log.status != "success":
+        print(f"❌ Eval failed: {log.error}")
+        return
+
+    samples = log.samples or []
+    turns = sum(1 for s in samples for m in s.messages if m.role == "assistant")
+    solved = sum(1 for s in samples if s.scores["maze_scorer"].as_float() == 1.0)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    growth_mb = peak_mb - baseline_mb
+
+    print(f"\n✅ {len(samples)} samples in {elapsed:.1f}s")
+    print(f"  Samples/s: {len(samples) / elapsed:.2f}")
+    print(f"  Model turns/s: {turns / elapsed:.1f} ({turns} turns)")
+    print(f"  Solved: {solved}/{len(samples)}")
+    print(f"  Peak RSS: {peak_mb:.0f} MB (+{growth_mb:.0f} MB during the eval, "
+          f"{growth_mb / max(len(samples), 1):.2f} MB per sample)")
+    lag = monitor.summary()
+    if lag["samples"]:
+        print(f"  Event loop lag: p50 {lag['p50_ms']:.1f} ms, p99 {lag['p99_ms']:.1f} ms, "
+              f"max {lag['max_ms']:.1f} ms ({lag['samples']} measurements)")
+
+
+if __name__ == "__main__":
+    main()
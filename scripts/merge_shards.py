@@ -0,0 +1,77 @@
+"""Check and merge the shard logs of sharded Rotating Maze runs."""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rotating_maze.shards import check_coverage, merge_shards
+
+
+def _preview(items, limit=10):
+    """Join the first few items of a list for printing.
+
+    (sample id, epoch) pairs are shown as "id (epoch n)".
+    """
+    shown = ", ".join(f"{item[0]} (epoch {item[1]})" if isinstance(item, tuple) else str(item)
+                      for item in items[:limit])
+    return shown + (f", ... ({len(items)} total)" if len(items) > limit else "")
+
+
+def main():
+    """Main function to check shard coverage and merge the logs."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("log_dir", nargs="?", default="results/shard_logs",
+                        help="Directory containing the shard logs")
+    parser.add_argument("--output-dir", default="results/logs",
+                        help="Where to write the merged logs")
+    parser.add_argument("--allow-partial", action="store_true",
+                        help="Merge runs with missing, duplicated or errored samples too")
+    args = parser.parse_args()
+
+    log_files = sorted(Path(args.log_dir).glob("**/*.eval"))
+    if not log_files:
+        print(f"❌ No .eval logs found in {args.log_dir}")
+        sys.exit(1)
+
+    print(f"🧩 Checking {len(log_files)} shard logs...")
+    reports = check_coverage([str(f) for f in log_files])
+
+    incomplete = 0
+    for report in reports:
+        task_args = report["task_args"]
+        name = (f"{report['model']} {task_args.get('variant')} "
+                f"n={task_args.get('num_instances')} seed={task_args.get('seed')}")
+        found = sum(len(files) for files in report["log_files"].values())
+        print(f"\n{name}: {found} logs for {report['num_shards']} shards, "
+              f"{report['epochs']} epochs")
+        if report["missing_shards"]:
+            print(f"  ⚠️  Missing shards: {_preview(report['missing_shards'])}")
+        if report["missing_samples"]:
+            print(f"  ⚠️  Missing samples: {_preview(report['missing_samples'])}")
+        if report["duplicate_samples"]:
+            print(f"  ⚠️  Duplicate samples: {_preview(report['duplicate_samples'])}")
+        if report["errored_samples"]:
+            print(f"  ⚠️  Errored samples: {_preview(report['errored_samples'])}")
+
+        if not report["complete"]:
+            incomplete += 1
+            if not args.allow_partial:
+                print("  ❌ Incomplete, not merged (use --allow-partial to merge anyway)")
+                continue
+
+        files = [f for shard_files in report["log_files"].values() for f in shard_files]
+        output = Path(args.output_dir) / f"merged_{Path(files[0]).name}"
+        output.parent.mkdir(parents=True, exist_ok=True)
+        result = merge_shards(files, str(output))
+        print(f"  ✅ Merged {result['samples']} samples from {result['shards']} logs to {output}")
+
+    if incomplete and not args.allow_partial:
+        print(f"\n❌ {incomplete} of {len(reports)} runs incomplete")
+        sys.exit(1)
+    print(f"\n✨ {len(reports)} runs checked")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Profile the memory of dataset builds and per-sample state (tracemalloc)."""
+
+import argparse
+import json
+import platform
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rotating_maze.memory import TRACE_FRAMES, profile_dataset, profile_trajectory
+
+
+def _mb(size: float) -> str:
+    """Format a byte count in megabytes."""
+    return f"{size / 1e6:.2f} MB"
+
+
+def main():
+    """Main function to run the memory profile."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num-instances", type=int, nargs="+", default=[10, 50, 200],
+                        help="Dataset sizes to profile")
+    parser.add_argument("--variant", default="non_stationary",
+                        choices=["stationary", "non_stationary", "paired"])
+    parser.add_argument("--size-range", type=int, nargs=2, default=[12, 18],
+                        metavar=("MIN", "MAX"), help="Maze sizes for the dataset builds")
+    parser.add_argument("--trajectory-size", type=int, default=41,
+                        help="Maze size for the per-sample trajectory")
+    parser.add_argument("--steps", type=int, default=2000,
+                        help="Tool calls in the trajectory")
+    parser.add_argument("--checkpoint-every", type=int, default=250)
+    parser.add_argument("--compact-history", action="store_true",
+                        help="Compact superseded views in the trajectory's messages")
+    parser.add_argument("--top", type=int, default=10, help="Allocation sites per measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="results/memory_profile.json")
+    args = parser.parse_args()
+
+    print(f"🧮 Profiling dataset builds ({args.variant}, sizes {args.size_range})...")
+    dataset = profile_dataset(args.num_instances, variant=args.variant,
+                              size_range=tuple(args.size_range), seed=args.seed, top=args.top)
+    for row in dataset:
+        print(f"  {row['num_instances']:>6} instances: peak {_mb(row['peak_bytes'])}, "
+              f"retained {_mb(row['retained_bytes'])} "
+              f"({row['retained_bytes_per_sample'] / 1e3:.1f} KB/sample)")
+    for site in dataset[-1]["sites"][:5]:
+        print(f"      {_mb(site['size_bytes']):>10}  {site['site']}")
+
+    trajectory_variant = "non_stationary" if args.variant == "paired" else args.variant
+    print(f"\n🧮 Profiling a {args.steps}-call trajectory on a "
+          f"{args.trajectory_size}x{args.trajectory_size} maze...")
+    trajectory = profile_trajectory(size=args.trajectory_size, variant=trajectory_variant,
+                                    steps=args.steps, checkpoint_every=args.checkpoint_every,
+                                    compact_history=args.compact_history, seed=args.seed,
+                                    top=args.top)
+    for checkpoint in trajectory["checkpoints"]:
+        print(f"  step {checkpoint['step']:>6}: held {_mb(checkpoint['held_bytes'])}, "
+              f"max step transient {checkpoint['max_step_transient_bytes'] / 1e3:.1f} KB")
+    for site in trajectory["checkpoints"][-1]["sites"][:5]:
+        print(f"      {_mb(site['size_bytes']):>10}  {site['site']}")
+
+    report = {
+        "python": platform.python_version(),
+        "trace_frames": TRACE_FRAMES,
+        "args": vars(args),
+        "dataset": dataset,
+        "trajectory": trajectory,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Saved memory profile to {output}")
+
+
+if __name__ == "__main__":
+    main()
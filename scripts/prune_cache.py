@@ -0,0 +1,28 @@
+"""Keep the local model response cache within a size budget."""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rotating_maze.cache import prune_response_cache
+
+
+def main():
+    """Main function to prune the response cache."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-mb", type=float, default=1024,
+                        help="Size budget in megabytes")
+    parser.add_argument("--model", default="",
+                        help="Only prune this model's entries (default: all models)")
+    args = parser.parse_args()
+
+    report = prune_response_cache(int(args.max_mb * 1024 * 1024), model=args.model)
+    print(f"🧹 Removed {report['removed']} entries "
+          f"({report['freed_bytes'] / 1024 / 1024:.1f} MB)")
+    print(f"✅ Cache now holds {report['remaining_bytes'] / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Replay Rotating Maze eval logs and recompute scores without a model."""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rotating_maze.replay import replay_logs, summarize
+
+
+def main():
+    """Main function to replay logs."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("log_dir", nargs="?", default="results/logs",
+                        help="Directory containing eval logs")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count, 0: in-process)")
+    parser.add_argument("--output", default="results/replay.json",
+                        help="Where to write per-sample replay results")
+    parser.add_argument("--trajectories", action="store_true",
+                        help="Include per-step trajectories in the output")
+    args = parser.parse_args()
+
+    log_files = sorted(str(p) for p in Path(args.log_dir).glob("**/*.eval"))
+    if not log_files:
+        print(f"❌ No .eval logs found in {args.log_dir}")
+        return
+
+    print(f"🔁 Replaying {len(log_files)} logs...")
+    start = time.perf_counter()
+    results = replay_logs(log_files, workers=args.workers,
+                          include_trajectory=args.trajectories)
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {len(results)} samples in {elapsed:.2f}s")
+
+    for (model, variant), entry in sorted(summarize(results).items()):
+        print(f"  {model} - {variant}: success {entry['success_rate'] * 100:.1f}% "
+              f"({entry['successes']}/{entry['samples'] - entry['errors']}), "
+              f"avg efficiency {entry['avg_efficiency'] * 100:.1f}%, "
+              f"errors {entry['errors']}")
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f)
+    print(f"\n✅ Saved replay results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Run Rotating Maze in batches and stop once the success rate has converged."""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rotating_maze.sequential import run_sequential
+
+
+def main():
+    """Main function to run a sequential eval."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", required=True, help="Model to evaluate")
+    parser.add_argument("--variant", default="non_stationary",
+                        help="stationary, non_stationary or paired")
+    parser.add_argument("--max-samples", type=int, default=200,
+                        help="Maze instances to run at most")
+    parser.add_argument("--batch-size", type=int, default=10,
+                        help="Maze instances dispatched per batch")
+    parser.add_argument("--half-width", type=float, default=0.1,
+                        help="Target half-width of the success-rate interval")
+    parser.add_argument("--confidence", type=float, default=0.95,
+                        help="Confidence level of the interval")
+    parser.add_argument("--min-samples", type=int, default=20,
+                        help="Samples required per variant before stopping")
+    parser.add_argument("--seed", type=int, default=0, help="Dataset seed")
+    parser.add_argument("--log-dir", default="results/logs",
+                        help="Where to write eval logs")
+    args = parser.parse_args()
+
+    print(f"🧪 Sequential run of {args.model} ({args.variant}), "
+          f"target ±{args.half_width * 100:.1f} pts")
+    result = run_sequential(
+        args.model,
+        variant=args.variant,
+        max_samples=args.max_samples,
+        batch_size=args.batch_size,
+        half_width=args.half_width,
+        confidence=args.confidence,
+        min_samples=args.min_samples,
+        seed=args.seed,
+        log_dir=args.log_dir,
+    )
+
+    for variant, entry in sorted(result["variants"].items()):
+        low, high = entry["interval"]
+        print(f"  {variant}: success {entry['success_rate'] * 100:.1f}% "
+              f"({entry['successes']}/{entry['samples']}), "
+              f"{args.confidence * 100:.0f}% CI {low * 100:.1f}-{high * 100:.1f}%")
+        if entry["errors"]:
+            print(f"  ⚠️  {entry['errors']} {variant} samples errored (counted as failures)")
+
+    if result["stopped_early"]:
+        saved = args.max_samples - result["instances"]
+        print(f"\n✅ Converged after {result['instances']}/{args.max_samples} instances "
+              f"({saved} not run)")
+    else:
+        print(f"\n⚠️  Ran all {args.max_samples} instances without reaching the target")
+
+
+if __name__ == "__main__":
+    main()
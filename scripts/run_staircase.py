@@ -0,0 +1,56 @@
+"""Find a model's 50%-success maze size with an adaptive staircase."""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rotating_maze.staircase import Staircase, run_staircase
+
+
+def main():
+    """Main function to run a staircase."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", required=True, help="Model to evaluate")
+    parser.add_argument("--variant", default="non_stationary",
+                        help="stationary or non_stationary")
+    parser.add_argument("--trials", type=int, default=20,
+                        help="Maximum number of batches")
+    parser.add_argument("--batch-size", type=int, default=4,
+                        help="Mazes per batch")
+    parser.add_argument("--max-reversals", type=int, default=8,
+                        help="Stop after this many reversals")
+    parser.add_argument("--start-size", type=int, default=15,
+                        help="Maze size of the first batch")
+    parser.add_argument("--min-size", type=int, default=5, help="Smallest maze size")
+    parser.add_argument("--max-size", type=int, default=61, help="Largest maze size")
+    parser.add_argument("--seed", type=int, default=0, help="Dataset seed")
+    parser.add_argument("--log-dir", default="results/logs",
+                        help="Where to write eval logs")
+    args = parser.parse_args()
+
+    staircase = Staircase(start_size=args.start_size, min_size=args.min_size,
+                          max_size=args.max_size)
+    print(f"🪜 Staircase for {args.model} ({args.variant})")
+    result = run_staircase(
+        args.model,
+        variant=args.variant,
+        trials=args.trials,
+        batch_size=args.batch_size,
+        max_reversals=args.max_reversals,
+        seed=args.seed,
+        staircase=staircase,
+        log_dir=args.log_dir,
+    )
+
+    for size, successes, n in result["history"]:
+        print(f"  size {size:3d}: {successes}/{n}")
+    if result["errors"]:
+        print(f"  ⚠️  {result['errors']} samples errored (counted as failures)")
+    print(f"\n✅ 50% threshold ≈ {result['threshold']:.1f} "
+          f"({result['samples']} samples, {len(result['reversals'])} reversals)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Shrink Rotating Maze eval logs by replacing maze views with references."""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rotating_maze.slim import expand_log, slim_log
+
+
+def main():
+    """Main function to slim (or expand) logs."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("log_dir", nargs="?", default="results/logs",
+                        help="Directory containing eval logs")
+    parser.add_argument("--output-dir", default="results/logs_slim",
+                        help="Where to write the processed logs")
+    parser.add_argument("--expand", action="store_true",
+                        help="Render the views of slimmed logs back instead")
+    args = parser.parse_args()
+
+    log_files = sorted(Path(args.log_dir).glob("**/*.eval"))
+    if not log_files:
+        print(f"❌ No .eval logs found in {args.log_dir}")
+        return
+
+    transform = expand_log if args.expand else slim_log
+    action = "Expanding" if args.expand else "Slimming"
+    print(f"🗜️  {action} {len(log_files)} logs...")
+
+    total_in = total_out = 0
+    for log_file in log_files:
+        output = Path(args.output_dir) / log_file.relative_to(args.log_dir)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        transform(str(log_file), str(output))
+        size_in, size_out = os.path.getsize(log_file), os.path.getsize(output)
+        total_in += size_in
+        total_out += size_out
+        print(f"  {log_file.name}: {size_in / 1024:.0f} KB -> {size_out / 1024:.0f} KB "
+              f"({time.perf_counter() - start:.1f}s)")
+
+    print(f"\n✅ {total_in / 1024:.0f} KB -> {total_out / 1024:.0f} KB, written to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
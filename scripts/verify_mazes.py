@@ -0,0 +1,67 @@
+"""Verify maze invariants for generated mazes or packed corpus files."""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rotating_maze.verify import verify_corpus, verify_generated
+
+
+def main():
+    """Main function to verify mazes."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--generated", type=int, default=0,
+                        help="Number of seeded mazes to generate and verify")
+    parser.add_argument("--algorithm", default="backtracking",
+                        help="Generator to verify (backtracking or eller)")
+    parser.add_argument("--size-min", type=int, default=12)
+    parser.add_argument("--size-max", type=int, default=18)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus", nargs="*", default=[],
+                        help="Packed maze files to verify")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count, 0: in-process)")
+    parser.add_argument("--output", default=None,
+                        help="Write the JSON report here")
+    args = parser.parse_args()
+
+    reports = {}
+    start = time.perf_counter()
+    if args.generated:
+        print(f"🔍 Verifying {args.generated} generated mazes ({args.algorithm})...")
+        reports["generated"] = verify_generated(
+            args.generated, size_range=(args.size_min, args.size_max),
+            algorithm=args.algorithm, seed=args.seed, workers=args.workers,
+        )
+    if args.corpus:
+        print(f"🔍 Verifying {len(args.corpus)} corpus files...")
+        reports["corpus"] = verify_corpus(args.corpus, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    if not reports:
+        print("❌ Nothing to verify. Pass --generated N and/or --corpus FILES")
+        return
+
+    ok = True
+    for name, report in reports.items():
+        rate = report["checked"] / elapsed if elapsed > 0 else 0
+        print(f"  {name}: {report['checked']} checked, {report['failed']} failed "
+              f"({rate:,.0f} mazes/s overall)")
+        for failure in report["failures"][:10]:
+            print(f"    ⚠️  {failure}")
+        ok = ok and report["failed"] == 0
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2)
+
+    print("\n✅ All invariants hold" if ok else "\n❌ Invariant violations found")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,32 @@
 """Test the full maze solving flow manually."""
 
+import json
+import os
+import random
 import sys
+import tempfile
+import time
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from rotating_maze.maze import MazeState, generate_maze_instance
-from rotating_maze.tools import create_movement_tools
+import anyio
+from inspect_ai.model import (
+    ChatMessageAssistant, ChatMessageSystem, ChatMessageTool, ChatMessageUser, GenerateConfig
+)
+from inspect_ai.tool import ToolCall, ToolDef, ToolInfo
+
+from rotating_maze.cache import prune_response_cache
+from rotating_maze.checkpoint import SampleCheckpoint
+from rotating_maze.loop_lag import LoopLagMonitor
+from rotating_maze.maze import MazeState, generate_maze_instance, shortest_path
+from rotating_maze.memory import profile_trajectory
+from rotating_maze.oracle import MazeOracleAPI, oracle_direction
+from rotating_maze.replay import legacy_visual_to_actual, simulate
+from rotating_maze.scoring import score_metadata
+from rotating_maze.task import (
+    COMPACTED_VIEW_PLACEHOLDER, compact_maze_views, create_dataset, create_system_message
+)
+from rotating_maze.tools import DIRECTIONS, MOVEMENT_TOOLS, take_step
 
 # Generate a small maze
 print("Generating test maze...")
@@ -27,23 +48,18 @@ state = MazeState(
     variant="stationary"
 )
 
-# Create tools
-tools = create_movement_tools(state)
-print(f"\n✅ Created {len(tools)} movement tools")
+# Shared tools (looked up per sample via the store at runtime)
+tool_names = [ToolDef(tool).name for tool in MOVEMENT_TOOLS]
+print(f"\n✅ Shared movement tools: {tool_names}")
+assert tool_names == ["move_up", "move_down", "move_left", "move_right"]
 
 # Test a few moves manually
 print("\n--- Testing Manual Moves ---")
 
-# Get tool functions
-tool_map = {tool._name: tool for tool in tools}
-
-# Try moving (this would normally be done by the model)
+# Try moving (this would normally be done by the model via the tools)
 print("\nAttempting move_up...")
-move_up = tool_map.get('move_up')
-if move_up:
-    import asyncio
-    result = asyncio.run(move_up())
-    print(result[:200] + "..." if len(result) > 200 else result)
+result = take_step(state, "up")
+print(result[:200] + "..." if len(result) > 200 else result)
 
 print("\n✅ Tool execution working!")
 
@@ -77,7 +93,257 @@ for i in range(5):
         print(f"View after transformation:\n{state_ns.get_view()}")
         break
 
+# Visual moves must move P in the same visual direction in every orientation
+print("\n--- Testing Moves in All Orientations ---")
+open_grid = [list(row) for row in ["#######", "#     #", "#     #", "#     #", "#######"]]
+expected = {"up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0)}
+
+
+def player_position(view):
+    rows = view.split("\n")
+    return next((x, y) for y, row in enumerate(rows) for x, c in enumerate(row) if c == "P")
+
+
+for orientation in range(8):
+    probe = MazeState(open_grid, (3, 2), (5, 3), 3, 99)
+    probe.orientation = orientation
+    for visual, (ex, ey) in expected.items():
+        before = player_position(probe.get_view())
+        dx, dy = probe.translate_visual_to_actual(visual)
+        probe.current_position = (3 + dx, 2 + dy)
+        after = player_position(probe.get_view())
+        probe.current_position = (3, 2)
+        assert (after[0] - before[0], after[1] - before[1]) == (ex, ey), (orientation, visual)
+
+print("✅ Moves follow the view in all 8 orientations")
+
+# Scheduled transformations are fixed per maze
+ns_data = generate_maze_instance(size_range=(9, 9), variant="non_stationary")
+print(f"\nTransform schedule: {ns_data['transform_schedule']}")
+assert len(ns_data["transform_schedule"]) == ns_data["max_steps"] // 5
+
 print("\n✅ Transformation system working!")
+
+# A step back off the optimal path with no slack left aborts the episode
+tight = MazeState(maze_data["grid"], maze_data["start_pos"], maze_data["goal_pos"],
+                  maze_data["optimal_path_length"], maze_data["optimal_path_length"])
+first = shortest_path(maze_data["grid"], maze_data["start_pos"], maze_data["goal_pos"])[1]
+step = (first[0] - maze_data["start_pos"][0], first[1] - maze_data["start_pos"][1])
+toward, back = {(0, -1): ("up", "down"), (0, 1): ("down", "up"),
+                (-1, 0): ("left", "right"), (1, 0): ("right", "left")}[step]
+assert take_step(tight, toward).startswith("Moved") and tight.end_reason is None
+result = take_step(tight, back)
+print(f"\n{result.splitlines()[0]}")
+assert "Task failed" in result and tight.end_reason == "goal_out_of_reach"
+print("✅ Unreachable goal ends the episode early")
+
+# Oscillating between two cells trips the loop detector
+looping = MazeState(maze_data["grid"], maze_data["start_pos"], maze_data["goal_pos"],
+                    maze_data["optimal_path_length"], maze_data["max_steps"],
+                    max_state_visits=3)
+for _ in range(2):
+    take_step(looping, toward)
+    result = take_step(looping, back)
+assert looping.end_reason == "loop" and "Task failed" in result, result
+print("✅ Loops end the episode")
+
+# Walking into walls over and over trips the stall detector
+stalled = MazeState(maze_data["grid"], maze_data["start_pos"], maze_data["goal_pos"],
+                    maze_data["optimal_path_length"], maze_data["max_steps"],
+                    max_invalid_streak=2)
+wall = next(d for d in ("up", "left", "down", "right")
+            if not stalled.is_valid_move(stalled.translate_visual_to_actual(d)))
+take_step(stalled, wall)
+assert stalled.end_reason is None
+result = take_step(stalled, wall)
+assert stalled.end_reason == "stalled" and "Task failed" in result, result
+print("✅ Repeated invalid moves end the episode")
+
+# The oracle model re-plans from each view, so it stays optimal under transforms
+rotating = MazeState(maze_data["grid"], maze_data["start_pos"], maze_data["goal_pos"],
+                     maze_data["optimal_path_length"], maze_data["max_steps"],
+                     variant="non_stationary")
+while not rotating.at_goal():
+    take_step(rotating, oracle_direction(rotating.get_view().split("\n")))
+assert rotating.move_count == maze_data["optimal_path_length"], rotating.move_count
+assert oracle_direction(rotating.get_view().split("\n")) is None
+print("✅ Oracle moves follow a shortest path in the rotating view")
+
+# With noise, every sample draws its own moves (not just every turn)
+
+noisy = MazeOracleAPI("oracle", noise=1.0, seed=0)
+move_tools = [ToolInfo(name=f"move_{d}", description=d) for d in ("up", "down", "left", "right")]
+
+
+async def first_moves():
+    moves = []
+    for i in range(8):
+        maze = generate_maze_instance(size_range=(9, 9), rng=random.Random(i))
+        prompt = [ChatMessageSystem(content=create_system_message("stationary")),
+                  ChatMessageUser(content=f"Here is your maze:\n\n{maze['initial_view']}")]
+        output = await noisy.generate(prompt, move_tools, "auto", GenerateConfig())
+        moves.append(output.message.tool_calls[0].function)
+    return moves
+
+noisy_moves = anyio.run(first_moves)
+assert len(set(noisy_moves)) > 1, noisy_moves
+print("✅ Oracle noise is drawn per sample")
+
+# Memory profile of a short trajectory: held memory grows with the history,
+# and compacting superseded views keeps it smaller
+full_history = profile_trajectory(size=15, steps=60, checkpoint_every=30, top=3)
+compacted = profile_trajectory(size=15, steps=60, checkpoint_every=30, top=3, compact_history=True)
+held = [c["held_bytes"] for c in full_history["checkpoints"]]
+assert len(held) == 2 and held[1] > held[0] > 0, held
+assert compacted["checkpoints"][-1]["held_bytes"] < held[-1]
+assert full_history["checkpoints"][-1]["sites"][0]["site"].startswith("rotating_maze/")
+json.dumps(full_history)
+print("✅ Memory profile tracks per-sample growth")
+
+# Transforms come from a seeded schedule, so the walk is reproducible, even
+# past the maze's own step budget
+walks = [[c["move_count"] for c in profile_trajectory(size=15, steps=300, checkpoint_every=100,
+                                                      top=1)["checkpoints"]]
+         for _ in range(2)]
+assert walks[0] == walks[1], walks
+print("✅ Memory profile walks are reproducible")
+
+# Compaction keeps the status and goal lines, and drops the initial view once
+# a tool result supersedes it
+
+view_state = MazeState(maze_data["grid"], maze_data["start_pos"], maze_data["goal_pos"],
+                       maze_data["optimal_path_length"], maze_data["max_steps"], view_radius=2)
+initial = ChatMessageUser(content=f"Here is your maze:\n\n{view_state.observation()}")
+history = [initial]
+assert compact_maze_views(history) == 0 and history[0] is initial
+for turn in range(2):
+    history.append(ChatMessageAssistant(content=""))
+    history.append(ChatMessageTool(content=f"Moved up.\nSteps: {turn}/9\n\n{view_state.observation()}"))
+compact_maze_views(history)
+goal_line = view_state.observation().split("\n\n")[0]
+assert history[0].text == f"Here is your maze:\n\n{goal_line}\n\n{COMPACTED_VIEW_PLACEHOLDER}"
+assert history[2].text == f"Moved up.\nSteps: 0/9\n\n{goal_line}\n\n{COMPACTED_VIEW_PLACEHOLDER}"
+assert history[4].text.endswith(view_state.get_view())
+assert initial.text.endswith(view_state.get_view())  # the sample input is left alone
+print("✅ Compaction keeps status and goal lines and drops the initial view")
+
+# Only blocks that are maze views are replaced, not prose containing a "P"
+prose = ChatMessageTool(content="Invalid move.\n\nPath is blocked by a wall.")
+history = [prose, ChatMessageTool(content=f"Moved up.\n\n{view_state.observation()}")]
+compact_maze_views(history)
+assert history[0] is prose
+print("✅ Compaction leaves blocks that are not maze views alone")
+
+# Checkpoints restore the conversation and maze state; a cut-off line is dropped
+
+walker = MazeState(ns_data["grid"], ns_data["start_pos"], ns_data["goal_pos"],
+                   ns_data["optimal_path_length"], ns_data["max_steps"], variant="non_stationary",
+                   transform_schedule=ns_data["transform_schedule"])
+resumed = MazeState(ns_data["grid"], ns_data["start_pos"], ns_data["goal_pos"],
+                    ns_data["optimal_path_length"], ns_data["max_steps"], variant="non_stationary",
+                    transform_schedule=ns_data["transform_schedule"])
+with tempfile.TemporaryDirectory() as tmp:
+    checkpoint = SampleCheckpoint(Path(tmp) / "sample.jsonl")
+    assert checkpoint.load() is None
+    conversation = [ChatMessageUser(content=ns_data["initial_view"])]
+    walk = random.Random(0)
+    for turn in range(1, 13):
+        direction = walk.choice(DIRECTIONS)
+        conversation.append(ChatMessageAssistant(content="", tool_calls=[
+            ToolCall(id=f"call_{turn}", function=f"move_{direction}", arguments={})
+        ]))
+        conversation.append(ChatMessageTool(content=take_step(walker, direction),
+                                            tool_call_id=f"call_{turn}"))
+        if turn % 4 == 0:
+            checkpoint.save(conversation, [{"turn": turn}], walker, turn)
+    with open(checkpoint.path, "a") as f:
+        f.write('{"turns": 99, "maze_st')
+
+    latest = SampleCheckpoint(checkpoint.path).load()
+    resumed.restore(latest["maze_state"])
+    assert latest["turns"] == 12 and latest["messages"] == conversation
+    assert resumed.snapshot() == walker.snapshot() and resumed.observation() == walker.observation()
+    assert checkpoint.path.read_text().endswith("\n")
+print("✅ Checkpoints resume interrupted trajectories")
+
+# The loop lag monitor notices synchronous work blocking the event loop
+
+
+async def block_loop(seconds):
+    monitor = LoopLagMonitor(interval=0.005)
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(monitor.run)
+        await anyio.sleep(0.02)
+        time.sleep(seconds)
+        await anyio.sleep(0.02)
+        tg.cancel_scope.cancel()
+    return monitor.summary()
+
+lag = anyio.run(block_loop, 0.05)
+assert lag["samples"] > 2 and lag["max_ms"] >= 40 and lag["p50_ms"] < 40, lag
+print(f"✅ Loop lag monitor sees a blocked loop (max {lag['max_ms']:.0f} ms)")
+
+# Replaying the logged tool calls reproduces the live score metadata
+
+metadata = create_dataset(num_instances=1, variant="non_stationary", seed=4,
+                          size_range=(9, 9))[0].metadata
+live = MazeState(metadata["grid"], tuple(metadata["start_pos"]), tuple(metadata["goal_pos"]),
+                 metadata["optimal_path_length"], metadata["max_steps"],
+                 variant="non_stationary", transform_schedule=metadata["transform_schedule"],
+                 transform_interval=metadata["transform_interval"])
+walk = random.Random(4)
+calls = []
+while live.end_reason is None and len(calls) < metadata["max_turns"]:
+    direction = walk.choice(DIRECTIONS)
+    calls.append((f"move_{direction}", take_step(live, direction)))
+expected = score_metadata(live.end_reason == "success", live.move_count,
+                          metadata["optimal_path_length"],
+                          end_reason=live.end_reason or "turn_limit")
+assert live.rotation_count or live.flip_h or live.flip_v, "walk never transformed"
+replayed = simulate(metadata, calls)
+assert {key: replayed[key] for key in expected} == expected, (replayed, expected)
+print(f"✅ Replay reproduces the live score ({expected['end_reason']})")
+
+# Logs without a schedule come from runs with the old move translation, and
+# replaying them follows the moves those runs made
+
+legacy_run = MazeState(metadata["grid"], tuple(metadata["start_pos"]), tuple(metadata["goal_pos"]),
+                       metadata["optimal_path_length"], metadata["max_steps"],
+                       variant="non_stationary", transform_schedule=metadata["transform_schedule"],
+                       transform_interval=metadata["transform_interval"])
+legacy_run.translate_visual_to_actual = lambda visual: legacy_visual_to_actual(
+    legacy_run.orientation, visual)
+walk = random.Random(4)
+legacy_calls, orientations = [], set()
+while legacy_run.end_reason is None and len(legacy_calls) < metadata["max_turns"]:
+    direction = walk.choice(DIRECTIONS)
+    legacy_calls.append((f"move_{direction}", take_step(legacy_run, direction)))
+    orientations.add(legacy_run.orientation)
+assert orientations & {5, 7}, orientations  # rotated a quarter turn and flipped
+replayed = simulate(dict(metadata, transform_schedule=None), legacy_calls, include_trajectory=True)
+assert replayed["steps_taken"] == legacy_run.move_count
+assert replayed["trajectory"][-1][3:5] == legacy_run.current_position
+print("✅ Legacy logs replay with the translation they were run with")
+
+# Pruning the response cache evicts the least recently used entries first;
+# a recent read keeps an old entry alive
+
+with tempfile.TemporaryDirectory() as cache_dir:
+    os.environ["INSPECT_CACHE_DIR"] = cache_dir
+    entries = Path(cache_dir) / "generate" / "maze_oracle" / "oracle"
+    entries.mkdir(parents=True)
+    # name: (last access, last modification)
+    times = {"read_recently": (1000, 100), "oldest": (200, 200), "older": (300, 300),
+             "newest": (400, 400)}
+    for name, (atime, mtime) in times.items():
+        (entries / name).write_bytes(b"x" * 10)
+        os.utime(entries / name, (atime, mtime))
+    pruned = prune_response_cache(max_bytes=20)
+    del os.environ["INSPECT_CACHE_DIR"]
+    assert pruned == {"removed": 2, "freed_bytes": 20, "remaining_bytes": 20}, pruned
+    assert sorted(p.name for p in entries.iterdir()) == ["newest", "read_recently"]
+print("✅ Cache pruning evicts the least recently used entries first")
+
 print("\n" + "="*50)
 print("✅ All systems functional!")
 print("="*50)
@@ -83,3 +83,106 @@ print("Check results/ directory for:")
 print("  - success_rates.png")
 print("  - efficiency.png")
 print("  - summary.txt")
+
+# Paired differences from a real paired log (scores are read per sample)
+print("\n🔗 Testing paired differences on an oracle log...")
+import tempfile
+sys.path.insert(0, ".")
+import rotating_maze.oracle  # noqa: F401  (registers maze_oracle/oracle)
+from inspect_ai import eval
+from rotating_maze.task import rotating_maze
+
+with tempfile.TemporaryDirectory() as tmp:
+    eval(rotating_maze(variant="paired", num_instances=3, seed=1, size_range=(9, 9)),
+         model="maze_oracle/oracle", log_dir=tmp, display="none")
+    paired_results = generate_graphs.load_results(tmp)
+    assert {key: len(scores) for key, scores in paired_results.items()} == {
+        ("oracle", "stationary"): 3, ("oracle", "non_stationary"): 3}
+    generate_graphs.generate_summary_table(paired_results, f"{tmp}/summary.txt")
+    paired_summary = Path(f"{tmp}/summary.txt").read_text()
+assert "Pairs: 3" in paired_summary, paired_summary
+print("✅ Paired differences are computed from real eval logs")
+
+# Cost summaries from a synthetic per-sample table
+print("\n💰 Testing cost summaries...")
+import pandas as pd
+sys.path.insert(0, ".")
+from rotating_maze.costs import COST_COLUMNS, add_costs, summarize_costs
+
+rows = [
+    {"model": "m", "variant": "stationary", "size": 15, "success": True,
+     "input_tokens": 1_000_000, "output_tokens": 100_000, "total_tokens": 1_100_000,
+     "reported_cost": None, "total_time": 10.0, "working_time": 8.0,
+     "model_time": 6.0, "tool_time": 1.0, "turns": 20},
+    {"model": "m", "variant": "stationary", "size": 15, "success": False,
+     "input_tokens": 2_000_000, "output_tokens": 200_000, "total_tokens": 2_200_000,
+     "reported_cost": None, "total_time": 20.0, "working_time": 16.0,
+     "model_time": 12.0, "tool_time": 2.0, "turns": 40},
+    {"model": "n", "variant": "stationary", "size": 15, "success": False,
+     "input_tokens": 10, "output_tokens": 10, "total_tokens": 20,
+     "reported_cost": 0.5, "total_time": 1.0, "working_time": 1.0,
+     "model_time": 0.5, "tool_time": 0.1, "turns": 1},
+]
+table = add_costs(pd.DataFrame(rows, columns=COST_COLUMNS), {"m": (3.0, 15.0)})
+assert table["cost"].tolist() == [4.5, 9.0, 0.5]
+
+summary = summarize_costs(table)
+m = summary.loc[("m", "stationary")]
+assert m["samples"] == 2 and m["successes"] == 1
+assert m["cost_per_success"] == 13.5
+assert m["turns_per_success"] == 60
+assert m["model_time_share"] == 0.75
+n = summary.loc[("n", "stationary")]
+assert pd.isna(n["cost_per_success"]) and pd.isna(n["turns_per_success"])
+print("✅ Costs use provider cost or the price table, per-success ratios skip unsolved configs")
+
+# Cached input is charged at the cache prices, or the input price without them
+cached = pd.DataFrame([dict(rows[0], cache_read_tokens=10_000_000, cache_write_tokens=1_000_000)],
+                      columns=COST_COLUMNS)
+assert add_costs(cached, {"m": (3.0, 15.0, 0.3, 3.75)})["cost"].tolist() == [4.5 + 3.0 + 3.75]
+assert add_costs(cached, {"m": (3.0, 15.0)})["cost"].tolist() == [4.5 + 30.0 + 3.0]
+print("✅ Cache reads and writes are priced separately from input tokens")
+
+# Adaptation analytics on a tiny synthetic replay
+print("\n🔄 Testing step analytics...")
+import numpy as np
+from rotating_maze.analytics import build_step_table, invalid_move_profile, recovery_times, regret_curves
+
+# (call_index, direction, valid, x, y, orientation, move_count, distance_to_goal)
+replayed = [
+    {"model": "m", "variant": "non_stationary", "sample_id": "a", "epoch": 1,
+     "optimal_steps": 4, "error": None, "trajectory": [
+         (0, "up", True, 1, 2, 0, 1, 3),
+         (1, "left", True, 1, 3, 1, 2, 4),   # transform, then a detour
+         (2, "left", False, 1, 3, 1, 2, 4),  # walked into a wall
+         (3, "up", True, 1, 2, 1, 3, 3),     # progress two calls after it
+         (4, "up", True, 2, 2, 1, 4, 2),
+     ]},
+    {"model": "m", "variant": "non_stationary", "sample_id": "b", "epoch": 1,
+     "optimal_steps": 2, "error": None, "trajectory": [
+         (0, "up", True, 1, 2, 0, 1, 1),
+         (1, "up", True, 1, 3, 2, 2, 2),     # transform, never recovered
+     ]},
+    {"model": "m", "variant": "non_stationary", "sample_id": "c", "epoch": 1,
+     "error": "No maze view logged"},
+]
+steps = build_step_table(replayed)
+assert len(steps) == 7
+assert steps["transform"].tolist() == [False, True, False, False, False, False, True]
+assert steps["steps_since_transform"].tolist() == [0, 0, 1, 2, 3, 0, 0]
+
+recovery = recovery_times(steps)
+assert recovery["recovery_calls"].iloc[0] == 2
+assert np.isnan(recovery["recovery_calls"].iloc[1])
+
+profile = invalid_move_profile(steps)
+assert profile.loc[("m", "non_stationary", 1), "invalid_rate"] == 1.0
+assert profile.loc[("m", "non_stationary", 0), "invalid_rate"] == 0.0
+
+# Regret = moves made - progress bought
+regret = regret_curves(steps)
+assert regret.loc[("m", "non_stationary", 0), "mean_regret"] == 0
+assert regret.loc[("m", "non_stationary", 1), "mean_regret"] == 2
+assert regret.loc[("m", "non_stationary", 1), "samples"] == 2
+assert regret.loc[("m", "non_stationary", 4), "samples"] == 1
+print("✅ Recovery times, invalid-move profile and regret match the synthetic trajectories")
@@ -0,0 +1,35 @@
+"""Test that the maze core imports without Inspect."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Budget for importing the core in a fresh interpreter (Inspect alone takes seconds)
+IMPORT_BUDGET_SECONDS = 0.5
+
+CHECK = """
+import sys, time
+start = time.perf_counter()
+import rotating_maze.maze, rotating_maze.bitboard, rotating_maze.sampling, rotating_maze.scoring
+elapsed = time.perf_counter() - start
+heavy = [m for m in ("inspect_ai", "numpy", "pandas") if m in sys.modules]
+print(f"{elapsed:.4f} {','.join(heavy)}")
+"""
+
+output = subprocess.run([sys.executable, "-c", CHECK], cwd=ROOT, capture_output=True,
+                        text=True, check=True).stdout.split()
+elapsed = float(output[0])
+heavy = output[1] if len(output) > 1 else ""
+
+print(f"Core import time: {elapsed * 1000:.1f} ms")
+assert not heavy, f"Core import pulled in: {heavy}"
+assert elapsed < IMPORT_BUDGET_SECONDS, f"Core import took {elapsed:.3f}s"
+
+# The task is still reachable from the package
+import rotating_maze
+assert callable(rotating_maze.rotating_maze)
+
+print("\n✅ Core imports without Inspect!")
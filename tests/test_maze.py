@@ -4,7 +4,7 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from rotating_maze.maze import generate_maze_instance
+from rotating_maze.maze import MazeState, generate_maze_instance
 
 # Test maze generation
 print("Testing maze generation...")
@@ -18,3 +18,120 @@ print(f"Max steps: {maze_data['max_steps']}")
 print(f"\nInitial view:\n{maze_data['initial_view']}")
 
 print("\n✅ Maze generation working!")
+
+# Test the row-streaming Eller's generator
+print("\nTesting Eller's generator...")
+eller_data = generate_maze_instance(size_range=(15, 15), variant="stationary", algorithm="eller")
+print(f"\nInitial view:\n{eller_data['initial_view']}")
+print(f"Optimal path length: {eller_data['optimal_path_length']}")
+
+# A perfect maze is a tree: open cells = open adjacencies + 1
+grid = eller_data["grid"]
+open_cells = sum(row.count(' ') for row in grid)
+adjacencies = sum(
+    1 for y in range(len(grid) - 1) for x in range(len(grid[0]) - 1)
+    if grid[y][x] == ' ' for nx, ny in ((x + 1, y), (x, y + 1)) if grid[ny][nx] == ' '
+)
+assert open_cells == adjacencies + 1
+
+print("\n✅ Eller's generator working!")
+
+# Maze views can be replaced by references and rendered back exactly
+from rotating_maze.slim import ViewCodec
+
+codec = ViewCodec(maze_data)
+probe = MazeState(maze_data["grid"], maze_data["start_pos"], maze_data["goal_pos"],
+                  maze_data["optimal_path_length"], maze_data["max_steps"])
+for orientation in range(8):
+    probe.orientation = orientation
+    probe.current_position = maze_data["goal_pos"] if orientation % 2 else maze_data["start_pos"]
+    text = f"Moved up.\nSteps: 1/9\n\n{probe.get_view()}"
+    slimmed = codec.encode(text)
+    assert "[[maze_view" in slimmed and codec.decode(slimmed) == text, orientation
+
+print("\n✅ View references round-trip!")
+
+# Bitboard engine agrees with the reference BFS and movement rules
+from rotating_maze.bitboard import BitGrid
+from rotating_maze.maze import shortest_path
+
+bits = BitGrid(eller_data["grid"])
+assert bits.distance(eller_data["start_pos"], eller_data["goal_pos"]) == \
+    len(shortest_path(grid, eller_data["start_pos"], eller_data["goal_pos"])) - 1
+assert bits.open_cells() == open_cells
+for y, row in enumerate(grid):
+    for x, cell in enumerate(row):
+        if cell == '#':
+            continue
+        for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+            inside = 0 <= x + dx < len(row) and 0 <= y + dy < len(grid)
+            assert bits.can_move((x, y), (dx, dy)) == (inside and grid[y + dy][x + dx] != '#')
+
+print("\n✅ Bitboard engine working!")
+
+# Windowed views are the full view cropped around the player
+windowed = MazeState(maze_data["grid"], maze_data["start_pos"], maze_data["goal_pos"],
+                     maze_data["optimal_path_length"], maze_data["max_steps"], view_radius=2)
+for orientation in range(8):
+    for state in (probe, windowed):
+        state.orientation = orientation
+        state.current_position = maze_data["start_pos"]
+    rows = probe.get_view().split("\n")
+    py = next(i for i, row in enumerate(rows) if "P" in row)
+    px = rows[py].index("P")
+    padded = ["#" * (len(rows[0]) + 4)] * 2
+    padded = padded + ["##" + row + "##" for row in rows] + padded
+    assert windowed.get_view() == "\n".join(row[px:px + 5] for row in padded[py:py + 5]), orientation
+    assert windowed.observation().startswith("Goal: ")
+
+# Large mazes generate (no recursion limit) and get a windowed observation
+large = generate_maze_instance(size_range=(101, 101), step_multiplier=2, transform_interval=7)
+assert large["view_radius"] is not None and large["max_steps"] == 2 * large["optimal_path_length"]
+assert large["initial_view"].startswith("Goal: ")
+
+print("\n✅ Windowed observations working!")
+
+# Windowed views round-trip through references to the states the sample visited
+steps = [{"x": maze_data["goal_pos"][0], "y": maze_data["goal_pos"][1], "orientation": 5}]
+windowed_codec = ViewCodec(dict(maze_data, view_radius=2), steps)
+for position, orientation in ((maze_data["start_pos"], 0), (maze_data["goal_pos"], 5)):
+    windowed.orientation = orientation
+    windowed.current_position = position
+    text = f"Moved up.\nSteps: 1/9\n\n{windowed.observation()}"
+    slimmed = windowed_codec.encode(text)
+    assert "[[maze_view" in slimmed and windowed_codec.decode(slimmed) == text, orientation
+
+print("\n✅ Windowed view references round-trip!")
+
+# The batched verifier accepts generated mazes and rejects corrupted ones
+import copy
+import numpy as np
+from rotating_maze.verify import grids_to_array, verify_batch, verify_generated
+
+report = verify_generated(20, size_range=(9, 15), workers=0)
+assert report == {"checked": 20, "failed": 0, "failures": []}, report
+
+grid = maze_data["grid"]
+# Knocking out a wall between two open cells closes a cycle
+cycle = copy.deepcopy(grid)
+wx, wy = next((x, y) for y in range(1, len(grid) - 1) for x in range(1, len(grid[0]) - 1)
+              if grid[y][x] == '#' and grid[y][x - 1] != '#' and grid[y][x + 1] != '#')
+cycle[wy][wx] = ' '
+# Walling in the goal makes it unreachable
+gx, gy = maze_data["goal_pos"]
+sealed = copy.deepcopy(grid)
+for nx, ny in ((gx - 1, gy), (gx + 1, gy), (gx, gy - 1), (gx, gy + 1)):
+    sealed[ny][nx] = '#'
+
+checks = verify_batch(
+    grids_to_array([grid, cycle, sealed, grid]),
+    np.array([maze_data["start_pos"]] * 4),
+    np.array([maze_data["goal_pos"]] * 4),
+    np.array([maze_data["optimal_path_length"]] * 3 + [maze_data["optimal_path_length"] + 2]),
+)
+assert checks["valid"].tolist() == [True, False, False, False]
+assert not checks["perfect"][1]
+assert not checks["reachable"][2] and checks["distance"][2] == -1
+assert checks["perfect"][3] and not checks["length_ok"][3]
+
+print("\n✅ Verifier rejects corrupted mazes!")
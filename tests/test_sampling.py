@@ -0,0 +1,154 @@
+"""Test difficulty features and stratified sampling."""
+
+import sys
+from collections import Counter
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rotating_maze.maze import compute_maze_features
+from rotating_maze.sampling import build_maze_index, stratified_sample
+
+# Hand-made maze: a corridor with one side branch
+grid = [list(row) for row in [
+    "#######",
+    "#     #",
+    "### # #",
+    "#   # #",
+    "#######",
+]]
+features = compute_maze_features(grid, (1, 1), (5, 3))
+print(f"Features: {features}")
+assert features["optimal_length"] == 6
+assert features["turns"] == 1
+assert features["decision_points"] == 1  # the junction at (3, 1)
+assert features["dead_ends"] == 3
+
+print("\n✅ Feature extraction working!")
+
+# Stratified sampling draws equal quotas from each stratum
+index = build_maze_index(40, size_range=(9, 13))
+selected = stratified_sample(index, 12, feature="optimal_length", num_strata=3)
+quotas = Counter(item["stratum"] for item in selected)
+print(f"Strata quotas: {dict(quotas)}")
+assert len(selected) == 12
+assert quotas == {0: 4, 1: 4, 2: 4}
+
+print("\n✅ Stratified sampling working!")
+
+# Stratum weights shift the dataset's difficulty mix
+from rotating_maze.task import create_dataset
+
+weighted = create_dataset(num_instances=8, seed=3, size_range=(9, 13),
+                          stratify_by="optimal_length", num_strata=2, stratum_weights=[1, 3])
+weighted_quotas = Counter(sample.metadata["stratum"] for sample in weighted)
+print(f"Weighted strata quotas: {dict(weighted_quotas)}")
+assert weighted_quotas == {0: 2, 1: 6}
+
+print("\n✅ Stratum weights working!")
+
+# Paired design: every maze is emitted once per variant
+paired = create_dataset(num_instances=4, variant="paired", seed=1)
+assert len(paired) == 8
+by_pair = {}
+for sample in paired:
+    by_pair.setdefault(sample.metadata["pair_id"], []).append(sample.metadata)
+for stationary, non_stationary in by_pair.values():
+    assert stationary["variant"] == "stationary" and non_stationary["variant"] == "non_stationary"
+    assert stationary["grid"] == non_stationary["grid"]
+    assert stationary["transform_schedule"] == [] and non_stationary["transform_schedule"]
+print(f"\nPaired samples: {[s.id for s in paired]}")
+print("\n✅ Paired design working!")
+
+# Sequential early stopping
+from rotating_maze.sequential import precision_reached, sample_ids, wilson_interval
+
+low, high = wilson_interval(10, 10)
+assert 0.6 < low < 1.0 and high == 1.0
+assert not precision_reached({"stationary": [2, 10]}, half_width=0.1, min_samples=5)
+assert precision_reached({"stationary": [0, 40]}, half_width=0.1, min_samples=20)
+assert sample_ids("paired", 0, 2) == ["maze_stationary_0", "maze_non_stationary_0",
+                                      "maze_stationary_1", "maze_non_stationary_1"]
+print(f"\nWilson interval for 10/10: ({low:.3f}, {high:.3f})")
+print("\n✅ Sequential stopping rule working!")
+
+# Errored samples (no scores) count as failures instead of crashing the tally
+from inspect_ai.log import EvalError, EvalSample
+from inspect_ai.scorer import Score
+from rotating_maze.sequential import sample_solved
+
+solved = EvalSample(id="a", epoch=1, input="", target="",
+                    scores={"maze_scorer": Score(value=1.0)})
+unsolved = EvalSample(id="b", epoch=1, input="", target="",
+                      scores={"maze_scorer": Score(value=0.0)})
+errored = EvalSample(id="c", epoch=1, input="", target="",
+                     error=EvalError(message="boom", traceback="", traceback_ansi=""))
+assert [sample_solved(s) for s in (solved, unsolved, errored)] == [True, False, False]
+print("\n✅ Errored samples count as failures!")
+
+# Size staircase settles around the threshold of a simulated model
+from rotating_maze.staircase import Staircase
+
+staircase = Staircase(start_size=15)
+for _ in range(20):
+    solved = 4 if staircase.size < 25 else 0
+    staircase.update(solved, 4)
+assert all(size % 2 == 1 for size, _, _ in staircase.history)
+assert 21 <= staircase.threshold() <= 27, staircase.threshold()
+print(f"\nStaircase threshold: {staircase.threshold():.1f} (reversals {staircase.reversals})")
+print("\n✅ Size staircase working!")
+
+# Shards of a seeded dataset are disjoint and together match the full dataset
+full = {s.id: s.metadata for s in create_dataset(num_instances=7, variant="paired", seed=2)}
+shards = [create_dataset(num_instances=7, variant="paired", seed=2, shard_index=k, num_shards=3)
+          for k in range(3)]
+shard_ids = [s.id for shard in shards for s in shard]
+assert len(shard_ids) == len(set(shard_ids)) == len(full)
+for shard in shards:
+    for sample in shard:
+        assert sample.metadata["grid"] == full[sample.id]["grid"]
+        assert sample.metadata["transform_schedule"] == full[sample.id]["transform_schedule"]
+try:
+    create_dataset(num_instances=7, num_shards=3)
+    raise AssertionError("Unseeded sharded dataset should be rejected")
+except ValueError:
+    pass
+print(f"\nShard sizes: {[len(shard) for shard in shards]}")
+print("\n✅ Dataset sharding working!")
+
+# A batch from the middle of a seeded dataset matches the full dataset
+batch = create_dataset(num_instances=7, variant="paired", seed=2, first_instance=5)
+assert [s.id for s in batch] == list(full)[10:]
+assert all(s.metadata["grid"] == full[s.id]["grid"] for s in batch)
+print("\n✅ Dataset batches working!")
+
+# Shard logs with several epochs are checked per (sample, epoch) and merged
+import tempfile
+from inspect_ai import eval
+from inspect_ai.log import read_eval_log
+import rotating_maze.oracle  # noqa: F401  (registers maze_oracle/oracle)
+from rotating_maze.shards import check_coverage, merge_shards
+from rotating_maze.task import rotating_maze
+
+with tempfile.TemporaryDirectory() as tmp:
+    shard_logs = [
+        eval(rotating_maze(variant="paired", num_instances=3, seed=5, size_range=(9, 9),
+                           shard_index=k, num_shards=2),
+             model="maze_oracle/oracle", epochs=2, log_dir=tmp, display="none")[0].location
+        for k in range(2)
+    ]
+    report, = check_coverage(shard_logs)
+    assert report["complete"] and report["epochs"] == 2, report
+    assert not report["duplicate_samples"] and not report["missing_samples"]
+
+    merged_file = str(Path(tmp) / "merged.eval")
+    assert merge_shards(shard_logs, merged_file) == {"shards": 2, "samples": 12}
+    merged = read_eval_log(merged_file)
+    assert merged.eval.task_args["num_shards"] == 1
+    assert merged.eval.dataset.sample_ids == sample_ids("paired", 0, 3)
+    # Epochs are reduced per sample before the metrics
+    assert merged.results.scores[0].metrics["pairs"].value == 3
+
+    partial, = check_coverage(shard_logs[:1])
+    assert not partial["complete"] and partial["missing_shards"] == [1]
+    assert ("maze_stationary_1", 2) in partial["missing_samples"]
+print("\n✅ Shard coverage check and merge working!")